@@ -10,6 +10,8 @@ from backend.entities.fluid.router import router as fluid_router
 from backend.entities.production.router import router as production_router
 from backend.entities.analytics.router import router as analytics_router
 from backend.entities.enums_info.router import router as enums_router
+from backend.entities.jobs.router import router as jobs_router
+from backend.entities.diagnostics.router import router as diagnostics_router
 
 # Создание главного роутера
 api_router = APIRouter()
@@ -26,3 +28,9 @@ api_router.include_router(analytics_router)
 
 # Подключение роутера для enum'ов
 api_router.include_router(enums_router)
+
+# Подключение роутера фоновых задач
+api_router.include_router(jobs_router)
+
+# Подключение роутера диагностики
+api_router.include_router(diagnostics_router)
@@ -0,0 +1,134 @@
+"""
+Кэш результатов с вытеснением по LRU/TTL и бюджету памяти
+"""
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+# Предикат инвалидации: принимает теги записи, возвращает True для удаления
+InvalidationPredicate = Callable[[Any], bool]
+
+
+class CacheBackend(ABC):
+    """
+    Интерфейс хранилища кэша
+
+    Каждая запись хранится с тегами - описанием данных, от которых она зависит.
+    Инвалидация выполняется предикатом по тегам, поэтому удаляются только
+    записи, затронутые изменением. Разделяемые реализации (например, поверх
+    Redis) должны сериализовать значения и теги самостоятельно.
+    """
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Получение значения (None - промах)"""
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any, tags: Any = None, size: int = 0) -> None:
+        """Сохранение значения с тегами и оценкой размера в байтах"""
+
+    @abstractmethod
+    def invalidate(self, predicate: InvalidationPredicate) -> int:
+        """Удаление записей, теги которых удовлетворяют предикату"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Удаление всех записей"""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Статистика работы кэша"""
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    Кэш в памяти процесса
+
+    Вытесняет записи по давности использования (LRU), по времени жизни (TTL),
+    по числу записей и по суммарной оценке размера. Рассчитан на работу внутри
+    одного event loop, поэтому не использует блокировки.
+    """
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 64 * 1024 * 1024, ttl_seconds: float = 300):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        # key -> (value, tags, size, expires_at)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _remove(self, key: Hashable) -> None:
+        """Удаление записи с учетом размера"""
+        _, _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, _, _, expires_at = entry
+        if expires_at < time.monotonic():
+            self._remove(key)
+            self.evictions += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, tags: Any = None, size: int = 0) -> None:
+        if size > self.max_bytes:
+            logger.debug(f"Cache entry of {size} bytes exceeds budget, not cached")
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (value, tags, size, time.monotonic() + self.ttl_seconds)
+        self._bytes += size
+
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def invalidate(self, predicate: InvalidationPredicate) -> int:
+        keys = [key for key, (_, tags, _, _) in self._entries.items() if predicate(tags)]
+        for key in keys:
+            self._remove(key)
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        requests = self.hits + self.misses
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / requests if requests else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
@@ -13,7 +13,7 @@ class Settings:
     # Основные настройки приложения
     APP_NAME: str = "Production Analysis API"
     APP_VERSION: str = "1.0.0"
-    DEBUG: bool = True
+    DEBUG: bool = os.getenv("DEBUG", "false").lower() == "true"
     
     # База данных
     DB_USERNAME: str = os.getenv("DB_USERNAME")
@@ -26,8 +26,71 @@ class Settings:
         f"postgresql+asyncpg://{DB_USERNAME}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
     )
     
+    # Реплика только для чтения (необязательно): GET-запросы списков и аналитики.
+    # Учетные данные и имя БД - как у основного сервера
+    DB_READ_HOST: str = os.getenv("DB_READ_HOST", "")
+    DB_READ_PORT: str = os.getenv("DB_READ_PORT", DB_PORT)
+    DATABASE_READ_URL: str = (
+        f"postgresql+asyncpg://{DB_USERNAME}:{DB_PASSWORD}@{DB_READ_HOST}:{DB_READ_PORT}/{DB_NAME}"
+        if DB_READ_HOST else ""
+    )
+    # Окно read-your-writes: после записи клиент читает с основного сервера (0 - выключено)
+    DB_READ_YOUR_WRITES_SECONDS: float = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))
+    
+    # Движок и пул соединений
+    DB_ECHO: bool = os.getenv("DB_ECHO", str(DEBUG)).lower() == "true"  # Логирование SQL запросов
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # секунды, -1 - без пересоздания
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_POOL_PREWARM: int = int(os.getenv("DB_POOL_PREWARM", str(DB_POOL_SIZE)))  # соединений при старте
+    # Кэш подготовленных выражений asyncpg на соединение (0 - для pgbouncer в режиме transaction)
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+    
+    # Создание недостающих индексов моделей при старте (на заполненных таблицах сборка
+    # задерживает старт - обычно выполняется скриптом scripts/ensure_indexes.py)
+    DB_ENSURE_INDEXES: bool = os.getenv("DB_ENSURE_INDEXES", "false").lower() == "true"
+    
+    # Секционирование таблицы добычи по дате: none | yearly | monthly
+    # (включается только для новой схемы, существующую таблицу нужно перенести)
+    PRODUCTION_PARTITIONING: str = os.getenv("PRODUCTION_PARTITIONING", "none")
+    PRODUCTION_PARTITIONS_AHEAD: int = int(os.getenv("PRODUCTION_PARTITIONS_AHEAD", "1"))
+    PRODUCTION_ARCHIVE_SCHEMA: str = os.getenv("PRODUCTION_ARCHIVE_SCHEMA", "archive")
+    
+    # Источники фронтенда для CORS через запятую. Запросы отправляются с cookie
+    # (привязка к основному серверу после записи), поэтому "*" недопустим
+    CORS_ORIGINS: list = [
+        origin.strip()
+        for origin in os.getenv("CORS_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000").split(",")
+        if origin.strip()
+    ]
+    
+    # Учет времени запросов: статистика по маршрутам и заголовок Server-Timing
+    REQUEST_TIMING_ENABLED: bool = os.getenv("REQUEST_TIMING_ENABLED", "true").lower() == "true"
+    SERVER_TIMING_HEADER: bool = os.getenv("SERVER_TIMING_HEADER", "true").lower() == "true"
+    
+    # Журнал медленных SQL-запросов (0 - выключен) и доля SELECT с захватом EXPLAIN ANALYZE
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "500"))
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", "0"))
+    
     # Логирование
-    LOG_LEVEL: str = "INFO"
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    # Уровни отдельных логгеров: "sqlalchemy.engine=WARNING,backend.entities.jobs=DEBUG"
+    LOG_LEVELS: str = os.getenv("LOG_LEVELS", "")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")  # json | text
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))  # при переполнении записи отбрасываются
+    LOG_MESSAGE_MAX_CHARS: int = int(os.getenv("LOG_MESSAGE_MAX_CHARS", "4000"))
+    LOG_PAYLOAD_MAX_CHARS: int = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "500"))
+    
+    # Сериализация ответов: модели - через model_dump_json, прочее - через orjson (если установлен)
+    FAST_JSON_RESPONSES: bool = os.getenv("FAST_JSON_RESPONSES", "true").lower() == "true"
+    
+    # Кэш результатов аналитики
+    ANALYTICS_CACHE_ENABLED: bool = os.getenv("ANALYTICS_CACHE_ENABLED", "true").lower() == "true"
+    ANALYTICS_CACHE_MAX_ENTRIES: int = int(os.getenv("ANALYTICS_CACHE_MAX_ENTRIES", "1000"))
+    ANALYTICS_CACHE_MAX_MB: int = int(os.getenv("ANALYTICS_CACHE_MAX_MB", "64"))
+    ANALYTICS_CACHE_TTL_SECONDS: float = float(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "300"))
 
     @classmethod
     def validate(cls):
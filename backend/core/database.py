@@ -1,19 +1,55 @@
 """
 Настройка базы данных SQLAlchemy
 """
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+import hashlib
+import re
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.schema import CreateIndex
 
 from .config import settings
 from .logging import get_logger
 from .base import Base
+from .partitioning import partition_managers
+from .metrics import metrics_registry
+from .pool import InstrumentedPool, pool_metrics
+from .slow_queries import slow_query_log
 
 logger = get_logger(__name__)
 
-# Создание асинхронного движка базы данных
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,  # Логирование SQL запросов в режиме отладки
-    future=True
+def _create_engine(url: str) -> AsyncEngine:
+    """Создание асинхронного движка с настройками пула из Settings"""
+    return create_async_engine(
+        url,
+        echo=settings.DB_ECHO,  # Логирование SQL запросов
+        future=True,
+        poolclass=InstrumentedPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    )
+
+
+# Создание асинхронного движка базы данных (основной сервер, чтение и запись)
+engine = _create_engine(settings.DATABASE_URL)
+
+# Движок реплики только для чтения; без реплики чтение идет на основной сервер
+read_engine = _create_engine(settings.DATABASE_READ_URL) if settings.DATABASE_READ_URL else engine
+
+# Планы медленных запросов снимаются на том же сервере, где выполнялся запрос
+slow_query_log.register_engine(engine)
+if read_engine is not engine:
+    slow_query_log.register_engine(read_engine)
+
+# Метрики пулов в /metrics
+metrics_registry.register_collector(
+    lambda: pool_metrics({"primary": engine, "replica": read_engine if has_replica() else None})
 )
 
 # Фабрика сессий
@@ -23,6 +59,109 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False
 )
 
+# Фабрика сессий для чтения
+ReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+) if read_engine is not engine else AsyncSessionLocal
+
+# Запрос клиента, недавно выполнившего запись, читает с основного сервера
+_primary_pinned: ContextVar[bool] = ContextVar("primary_pinned", default=False)
+
+# Время последней записи в этом процессе (time.monotonic)
+_last_write_at = float("-inf")
+
+
+def has_replica() -> bool:
+    """Настроена ли реплика для чтения"""
+    return read_engine is not engine
+
+
+def pin_primary(pinned: bool = True):
+    """Направление чтения текущего запроса на основной сервер (возвращает токен ContextVar)"""
+    return _primary_pinned.set(pinned)
+
+
+def unpin_primary(token) -> None:
+    """Отмена pin_primary"""
+    _primary_pinned.reset(token)
+
+
+def read_session_factory() -> async_sessionmaker:
+    """Фабрика сессий для чтения с учетом привязки запроса к основному серверу"""
+    if _primary_pinned.get():
+        return AsyncSessionLocal
+    return ReadSessionLocal
+
+
+# Счетчики ленивых сессий: выданные зависимостями и фактически открытые
+_session_counters = {"requested": 0, "opened": 0}
+
+
+class LazySession:
+    """
+    Сессия, создаваемая при первом обращении
+
+    Зависимость выдает эту обертку вместо AsyncSession: если обработчик
+    ответил, не обращаясь к базе (например, из кэша), сессия не создается
+    и соединение из пула не берется. Любое обращение к атрибутам сессии
+    создает ее через фабрику, выбранную при выдаче.
+    """
+
+    __slots__ = ("_factory", "_session")
+
+    def __init__(self, factory: async_sessionmaker):
+        self._factory = factory
+        self._session = None
+        _session_counters["requested"] += 1
+
+    @property
+    def started(self) -> bool:
+        """Создана ли сессия"""
+        return self._session is not None
+
+    def _get(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._factory()
+            _session_counters["opened"] += 1
+        return self._session
+
+    def __getattr__(self, name: str):
+        return getattr(self._get(), name)
+
+    async def rollback(self) -> None:
+        if self._session is not None:
+            await self._session.rollback()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+
+
+def session_stats() -> dict:
+    """Число выданных сессий, открытых из них и не понадобившихся"""
+    return {
+        **_session_counters,
+        "unused": _session_counters["requested"] - _session_counters["opened"]
+    }
+
+
+def mark_write() -> None:
+    """Отметка о записи (для оценки возможного отставания реплики)"""
+    global _last_write_at
+    _last_write_at = time.monotonic()
+
+
+def replica_may_lag() -> bool:
+    """
+    Могут ли данные реплики отставать от недавней записи этого процесса
+
+    True в течение окна read-your-writes после последней записи; в это время
+    результаты, прочитанные с реплики, не стоит сохранять в кэш.
+    """
+    return has_replica() and time.monotonic() - _last_write_at < settings.DB_READ_YOUR_WRITES_SECONDS
+
 
 async def init_db():
     """Инициализация базы данных - создание всех таблиц"""
@@ -39,16 +178,130 @@ async def init_db():
     try:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+        
+        # Секции текущего и следующих периодов для секционированных таблиц
+        for manager in partition_managers():
+            await manager.ensure_startup(engine)
+        
+        if settings.DB_ENSURE_INDEXES:
+            await ensure_indexes()
         logger.info("Database initialized successfully")
     except Exception as e:
         logger.error(f"Error creating database tables: {str(e)}")
         raise
 
 
-async def get_db() -> AsyncSession:
-    """Dependency для получения сессии базы данных"""
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+async def ensure_indexes():
+    """
+    Приведение индексов существующих таблиц к набору, описанному в моделях
+    
+    create_all создает индексы только вместе с новыми таблицами, поэтому
+    недостающие индексы создаются здесь без блокировки записи: CREATE INDEX
+    CONCURRENTLY, а для секционированных таблиц (где CONCURRENTLY не
+    поддерживается) - индекс ON ONLY на родителе, CONCURRENTLY на каждой
+    секции и ATTACH PARTITION. Невалидные индексы после прерванной сборки
+    пересоздаются (на секционированной таблице - достраиваются по секциям).
+    Индексы, которых нет в моделях, только выводятся в лог.
+    
+    Сборка на заполненных таблицах длительная, поэтому при старте приложения
+    выполняется только с DB_ENSURE_INDEXES=true; обычно - скриптом
+    scripts/ensure_indexes.py.
+    """
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        
+        for table in Base.metadata.sorted_tables:
+            relkind = (await conn.execute(
+                text("SELECT relkind::text FROM pg_class WHERE oid = to_regclass(:table)"),
+                {"table": table.name}
+            )).scalar()
+            if relkind is None:
+                continue
+            concurrently = relkind != "p"
+            
+            result = await conn.execute(
+                text(
+                    "SELECT c.relname, i.indisvalid FROM pg_index i "
+                    "JOIN pg_class c ON c.oid = i.indexrelid "
+                    "WHERE i.indrelid = to_regclass(:table) AND NOT i.indisprimary "
+                    "AND NOT EXISTS (SELECT 1 FROM pg_constraint k WHERE k.conindid = i.indexrelid)"
+                ),
+                {"table": table.name}
+            )
+            existing = {name: valid for name, valid in result}
+            
+            for index in sorted(table.indexes, key=lambda item: item.name):
+                valid = existing.pop(index.name, None)
+                if valid:
+                    continue
+                
+                statement = str(CreateIndex(index, if_not_exists=True).compile(dialect=conn.dialect))
+                if not concurrently:
+                    if valid is None:
+                        logger.info(f"Creating index {index.name} on {table.name} partitions")
+                    else:
+                        logger.warning(f"Completing invalid index {index.name} on {table.name} partitions")
+                    await _create_partitioned_index(conn, table.name, index.name, statement)
+                    continue
+                
+                if valid is False:
+                    logger.warning(f"Rebuilding invalid index {index.name}")
+                    await conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{index.name}"'))
+                logger.info(f"Creating index {index.name} on {table.name}")
+                await conn.execute(text(_concurrently(statement)))
+            
+            for name in existing:
+                logger.warning(f"Index {name} on {table.name} is not defined in models")
+
+
+def _concurrently(statement: str) -> str:
+    """CREATE INDEX ... -> CREATE INDEX CONCURRENTLY ..."""
+    return re.sub(r"^CREATE (UNIQUE )?INDEX", r"CREATE \1INDEX CONCURRENTLY", statement)
+
+
+def _partition_index_name(partition: str, index_name: str) -> str:
+    """Имя индекса секции в пределах 63 символов идентификатора PostgreSQL"""
+    name = f"{partition}_{index_name}"
+    if len(name) <= 63:
+        return name
+    return f"{name[:54]}_{hashlib.md5(name.encode()).hexdigest()[:8]}"
+
+
+async def _create_partitioned_index(conn, table: str, index_name: str, statement: str) -> None:
+    """
+    Индекс секционированной таблицы без блокировки записи на время сборки
+
+    Индекс на родителе создается ON ONLY (пустой и невалидный), индексы
+    секций строятся CONCURRENTLY и присоединяются к нему; после
+    присоединения всех секций индекс родителя становится валидным.
+    Уже присоединенные индексы секций пропускаются, поэтому прерванную
+    сборку можно повторить.
+    """
+    match = re.match(r"^CREATE (UNIQUE )?INDEX IF NOT EXISTS (\S+) ON (\S+)", statement)
+    if match is None:
+        raise ValueError(f"Unexpected index statement: {statement}")
+    unique, name, on = match.groups()
+    await conn.execute(text(f"{statement[:match.start(3)]}ONLY {statement[match.start(3):]}"))
+    
+    result = await conn.execute(
+        text(
+            "SELECT c.relname, EXISTS ("
+            "  SELECT 1 FROM pg_inherits ii JOIN pg_index x ON x.indexrelid = ii.inhrelid"
+            "  WHERE ii.inhparent = to_regclass(:index) AND x.indrelid = c.oid"
+            ") FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:table) ORDER BY c.relname"
+        ),
+        {"table": table, "index": index_name}
+    )
+    for partition, attached in result.all():
+        if attached:
+            continue
+        child = _partition_index_name(partition, index_name)
+        await conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{child}"'))
+        child_statement = (
+            f"CREATE {unique or ''}INDEX CONCURRENTLY \"{child}\" ON \"{partition}\""
+            f"{statement[match.end():]}"
+        )
+        logger.info(f"Creating index {child} on partition {partition}")
+        await conn.execute(text(child_statement))
+        await conn.execute(text(f'ALTER INDEX {name} ATTACH PARTITION "{child}"'))
@@ -25,6 +25,11 @@ class ValidationError(BaseAppException):
     pass
 
 
+class ValueOutOfRangeError(ValidationError):
+    """Ошибка - результат не помещается в столбец"""
+    pass
+
+
 class AlreadyExistsError(BaseAppException):
     """Ошибка - ресурс уже существует"""
     pass
@@ -60,6 +65,18 @@ def validation_exception(message: str, details: Optional[Dict[str, Any]] = None)
     )
 
 
+def unprocessable_exception(message: str, details: Optional[Dict[str, Any]] = None) -> HTTPException:
+    """Создает HTTP исключение 422"""
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail={
+            "error": "value_out_of_range",
+            "message": message,
+            "details": details or {}
+        }
+    )
+
+
 def conflict_exception(message: str, error_type: str = "already_exists", details: Optional[Dict[str, Any]] = None) -> HTTPException:
     """Создает HTTP исключение 409"""
     return HTTPException(
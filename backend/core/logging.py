@@ -1,33 +1,181 @@
 """
 Настройка логирования с использованием встроенного модуля logging
+
+Обработчик корневого логгера только кладет запись в очередь (QueueHandler);
+сообщение форматируется и выводится в stdout в отдельном потоке
+(QueueListener). Поэтому вызов логгера в обработчике запроса не ждет ни
+форматирования, ни записи в поток вывода. Используйте %-форматирование
+(logger.info("... %s", value)): подстановка аргументов тоже выполняется
+в потоке вывода и только для записей, прошедших фильтр по уровню.
 """
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
 import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
 
 from .config import settings
 
+# Поток вывода логов (запускается в setup_logging)
+_listener: Optional[logging.handlers.QueueListener] = None
+
+# Атрибуты LogRecord, которые не являются дополнительными полями (extra)
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+def _truncate(text: str, limit: int) -> str:
+    if limit <= 0 or len(text) <= limit:
+        return text
+    return f"{text[:limit]}... [truncated, {len(text)} chars]"
+
+
+class LogPayload:
+    """
+    Отложенное усеченное представление данных для логов
+
+    Строка строится в потоке вывода при форматировании записи и не длиннее
+    LOG_PAYLOAD_MAX_CHARS; от длинных списков выводятся число элементов
+    и первый элемент. Данные не должны изменяться после вызова логгера.
+    """
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value: Any, limit: Optional[int] = None):
+        self.value = value
+        self.limit = settings.LOG_PAYLOAD_MAX_CHARS if limit is None else limit
+
+    def __str__(self) -> str:
+        value = self.value
+        if isinstance(value, (list, tuple)) and len(value) > 1:
+            text = f"[{len(value)} items, first: {value[0]!r}]"
+        else:
+            text = repr(value)
+        return _truncate(text, self.limit)
+
+    __repr__ = __str__
+
+
+class TextFormatter(logging.Formatter):
+    """Текстовый формат с ограничением длины сообщения"""
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        record.message = _truncate(record.message, settings.LOG_MESSAGE_MAX_CHARS)
+        return super().formatMessage(record)
+
+
+class JSONFormatter(logging.Formatter):
+    """Одна JSON-строка на запись: время, уровень, логгер, сообщение, extra"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": _truncate(record.getMessage(), settings.LOG_MESSAGE_MAX_CHARS),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                data[key] = value
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            data["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Передача записей в поток вывода без форматирования и без ожидания
+
+    Стандартный QueueHandler.prepare форматирует сообщение в вызывающем
+    потоке; здесь запись передается как есть. При переполнении очереди
+    запись отбрасывается, число отброшенных записей хранится в dropped.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _parse_levels(value: str) -> Dict[str, int]:
+    """Уровни логгеров из строки вида "sqlalchemy.engine=WARNING,uvicorn.access=ERROR" """
+    levels = {}
+    for item in value.split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = logging.getLevelName(level.strip().upper())
+    return {name: level for name, level in levels.items() if isinstance(level, int)}
+
 
 def setup_logging():
     """Настройка логирования приложения"""
-    
+    global _listener
+    if _listener is not None:
+        return
+
     # Определяем уровень логирования
     log_level = getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO)
-    
+
     # Формат логов
-    log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    
+    if settings.LOG_FORMAT == "json":
+        formatter = JSONFormatter()
+    else:
+        formatter = TextFormatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    # Вывод в консоль - в отдельном потоке
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+    log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+
     # Настройка корневого логгера
-    logging.basicConfig(
-        level=log_level,
-        format=log_format,
-        handlers=[
-            logging.StreamHandler(sys.stdout),  # Вывод в консоль
-        ]
-    )
-    
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(NonBlockingQueueHandler(log_queue))
+    root.setLevel(log_level)
+
+    # Уровни отдельных логгеров
+    for name, level in _parse_levels(settings.LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener.start()
+    atexit.register(shutdown_logging)
+
     logging.info("Logging configured successfully")
 
 
+def shutdown_logging():
+    """
+    Вывод оставшихся записей и остановка потока вывода
+
+    Дальнейшие записи выводятся синхронно теми же обработчиками.
+    """
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, NonBlockingQueueHandler):
+            root.removeHandler(handler)
+    for handler in _listener.handlers:
+        root.addHandler(handler)
+    _listener = None
+
+
 def get_logger(name: str = None) -> logging.Logger:
     """Получить логгер для модуля"""
     return logging.getLogger(name or __name__)
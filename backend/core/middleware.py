@@ -0,0 +1,122 @@
+"""
+ASGI middleware приложения
+"""
+import math
+import time
+from http.cookies import SimpleCookie
+
+from .config import settings
+from .database import has_replica, mark_write, pin_primary, unpin_primary
+from .metrics import http_request_duration
+from .timing import finish_request, route_timings, start_request
+
+# Методы, изменяющие данные
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+PRIMARY_PIN_COOKIE = "db_primary_until"
+
+
+class ReadYourWritesMiddleware:
+    """
+    Чтение собственных записей при использовании реплики
+
+    После успешного изменяющего запроса клиенту выставляется cookie со
+    временем окончания окна DB_READ_YOUR_WRITES_SECONDS. Пока окно не
+    истекло, запросы этого клиента читают с основного сервера, а не с
+    реплики, которая может отставать.
+
+    Фронтенд на другом origin получает и отправляет cookie только с
+    withCredentials и при явном origin в CORS_ORIGINS.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not has_replica() or settings.DB_READ_YOUR_WRITES_SECONDS <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        now = time.time()
+        until = self._pinned_until(scope)
+        # Значение cookie задает клиент: учитывается только окно не длиннее настроенного
+        token = pin_primary(now < until <= now + settings.DB_READ_YOUR_WRITES_SECONDS)
+        try:
+            if scope["method"] in WRITE_METHODS:
+                await self.app(scope, receive, self._pinning_send(send))
+            else:
+                await self.app(scope, receive, send)
+        finally:
+            unpin_primary(token)
+
+    @staticmethod
+    def _pinned_until(scope) -> float:
+        """Время окончания окна из cookie запроса (0 - нет привязки)"""
+        for name, value in scope["headers"]:
+            if name == b"cookie":
+                morsel = SimpleCookie(value.decode("latin-1")).get(PRIMARY_PIN_COOKIE)
+                if morsel is not None:
+                    try:
+                        until = float(morsel.value)
+                    except ValueError:
+                        return 0.0
+                    return until if math.isfinite(until) else 0.0
+        return 0.0
+
+    @staticmethod
+    def _pinning_send(send):
+        """Обертка send, добавляющая cookie к успешному ответу на запись"""
+
+        async def wrapped(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                window = settings.DB_READ_YOUR_WRITES_SECONDS
+                cookie = (
+                    f"{PRIMARY_PIN_COOKIE}={time.time() + window:.3f}; "
+                    f"Max-Age={math.ceil(window)}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode("latin-1"))]}
+                mark_write()
+            await send(message)
+
+        return wrapped
+
+
+class TimingMiddleware:
+    """
+    Учет времени обработки запросов
+
+    Добавляет к ответу заголовок Server-Timing (общее время до отправки
+    заголовков, время и число SQL-запросов, полученные строки, сериализация)
+    и накапливает статистику по маршрутам (метод и шаблон пути) до
+    окончания отправки тела ответа.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.REQUEST_TIMING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        metrics, token = start_request(f"{scope['method']} {scope['path']}")
+        status = 500
+
+        async def timing_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.SERVER_TIMING_HEADER:
+                    header = (b"server-timing", metrics.server_timing().encode("latin-1"))
+                    message = {**message, "headers": [*message.get("headers", []), header]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timing_send)
+        finally:
+            finish_request(token)
+            # Запросы без маршрута (404) собираются под одним ключом
+            path = getattr(scope.get("route"), "path", None) or "<unmatched>"
+            elapsed = metrics.elapsed()
+            route_timings.record(f"{scope['method']} {path}", metrics, elapsed * 1000, status)
+            http_request_duration.labels(scope["method"], path, str(status)).observe(elapsed)
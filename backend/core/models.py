@@ -10,6 +10,7 @@ from backend.entities.development_object.model import DevelopmentObject
 from backend.entities.well.model import Well
 from backend.entities.fluid.model import Fluid
 from backend.entities.production.model import Production
+from backend.entities.analytics.model import ProductionMonthly
 
 # Список всех моделей для удобства
 __all__ = [
@@ -18,4 +19,5 @@ __all__ = [
     "Well", 
     "Fluid",
     "Production",
+    "ProductionMonthly",
 ]
@@ -0,0 +1,214 @@
+"""
+Декларативное секционирование таблиц по диапазонам дат (PostgreSQL RANGE)
+"""
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import Table, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .logging import get_logger
+from backend.shared.enums import PartitionIntervalEnum
+
+logger = get_logger(__name__)
+
+# Все менеджеры секций (обходятся в init_db при старте)
+_managers: List["RangePartitionManager"] = []
+
+
+def partition_managers() -> List["RangePartitionManager"]:
+    """Зарегистрированные менеджеры секций"""
+    return list(_managers)
+
+
+class RangePartitionManager:
+    """
+    Создание, перечисление и отсоединение секций таблицы по дате
+
+    Секция покрывает год или месяц: [начало периода, начало следующего).
+    Новая секция создается отдельной таблицей и присоединяется через
+    ATTACH PARTITION в собственной короткой транзакции: ATTACH берет на
+    родительской таблице только SHARE UPDATE EXCLUSIVE, поэтому не конфликтует
+    с открытыми транзакциями записи (в том числе с транзакцией, которая
+    запросила секцию) и не блокирует чтение. CREATE TABLE ... PARTITION OF
+    потребовал бы ACCESS EXCLUSIVE до конца транзакции.
+
+    Наличие секций проверяется по каталогу при каждой записи, а не по кэшу
+    процесса: секции могут удалять другие процессы (scripts/manage_partitions.py,
+    scripts/clear_database.py), а секции DEFAULT у таблицы нет.
+    """
+
+    def __init__(self, table: Table, column: str, interval: PartitionIntervalEnum, ahead: int = 1):
+        self.table = table
+        self.column = column
+        self.interval = PartitionIntervalEnum(interval)
+        self.ahead = ahead
+        _managers.append(self)
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval != PartitionIntervalEnum.NONE
+
+    @property
+    def parent(self) -> str:
+        return self.table.name
+
+    def period_start(self, value: date) -> date:
+        """Начало периода секции, содержащей дату"""
+        if self.interval == PartitionIntervalEnum.MONTHLY:
+            return date(value.year, value.month, 1)
+        return date(value.year, 1, 1)
+
+    def next_period_start(self, start: date) -> date:
+        """Начало следующего периода"""
+        if self.interval == PartitionIntervalEnum.MONTHLY:
+            return date(start.year + start.month // 12, start.month % 12 + 1, 1)
+        return date(start.year + 1, 1, 1)
+
+    def partition_name(self, start: date) -> str:
+        """Имя секции: production_y2021 или production_m202101"""
+        if self.interval == PartitionIntervalEnum.MONTHLY:
+            return f"{self.parent}_m{start:%Y%m}"
+        return f"{self.parent}_y{start:%Y}"
+
+    async def list_partitions(self, engine: AsyncEngine) -> List[Dict[str, Any]]:
+        """Присоединенные секции с границами и оценкой числа строк"""
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                text(
+                    "SELECT c.relname AS name, "
+                    "pg_get_expr(c.relpartbound, c.oid) AS bounds, "
+                    "c.reltuples::bigint AS rows_estimate "
+                    "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                    "WHERE i.inhparent = to_regclass(:parent) ORDER BY c.relname"
+                ),
+                {"parent": self.parent}
+            )
+            return [dict(row._mapping) for row in result]
+
+    async def _load(self, engine: AsyncEngine) -> Set[date]:
+        """Начала периодов существующих секций"""
+        known = set()
+        for partition in await self.list_partitions(engine):
+            start = self._parse_start(partition["name"])
+            if start is not None:
+                known.add(start)
+        return known
+
+    async def _existing(self, engine: AsyncEngine, starts: Set[date]) -> Set[date]:
+        """Начала периодов из starts, для которых секции уже присоединены"""
+        names = {self.partition_name(start): start for start in starts}
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                text(
+                    "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                    "WHERE i.inhparent = to_regclass(:parent) AND c.relname = ANY(:names)"
+                ),
+                {"parent": self.parent, "names": list(names)}
+            )
+            return {names[name] for name in result.scalars()}
+
+    def _parse_start(self, name: str) -> Optional[date]:
+        """Начало периода по имени секции (None - секция создана не менеджером)"""
+        suffix = name[len(self.parent) + 1:]
+        try:
+            if suffix.startswith("m") and len(suffix) == 7:
+                return date(int(suffix[1:5]), int(suffix[5:7]), 1)
+            if suffix.startswith("y") and len(suffix) == 5:
+                return date(int(suffix[1:5]), 1, 1)
+        except ValueError:
+            pass
+        return None
+
+    async def _create_partition(self, engine: AsyncEngine, start: date) -> None:
+        """Создание и присоединение секции за период"""
+        name = self.partition_name(start)
+        end = self.next_period_start(start)
+        async with engine.begin() as conn:
+            # Сериализация создания секций между процессами
+            await conn.execute(
+                text("SELECT pg_advisory_xact_lock(hashtext(:key))"),
+                {"key": f"partitions:{self.parent}"}
+            )
+            exists = await conn.execute(
+                text(
+                    "SELECT 1 FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                    "WHERE i.inhparent = to_regclass(:parent) AND c.relname = :name"
+                ),
+                {"parent": self.parent, "name": name}
+            )
+            if exists.scalar() is None:
+                bounds = f"\"{self.column}\" >= DATE '{start}' AND \"{self.column}\" < DATE '{end}'"
+                await conn.execute(text(
+                    f'CREATE TABLE "{name}" (LIKE "{self.parent}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+                ))
+                # CHECK с границами избавляет ATTACH от проверки строк
+                await conn.execute(text(f'ALTER TABLE "{name}" ADD CONSTRAINT "{name}_bounds" CHECK ({bounds})'))
+                await conn.execute(text(
+                    f'ALTER TABLE "{self.parent}" ATTACH PARTITION "{name}" '
+                    f"FOR VALUES FROM ('{start}') TO ('{end}')"
+                ))
+                await conn.execute(text(f'ALTER TABLE "{name}" DROP CONSTRAINT "{name}_bounds"'))
+                logger.info(f"Created partition {name} [{start}, {end})")
+
+    async def ensure_for_dates(self, engine: AsyncEngine, dates: Iterable[date]) -> int:
+        """Создание недостающих секций для дат записываемых строк"""
+        if not self.enabled:
+            return 0
+        starts = {self.period_start(value) for value in dates}
+        if not starts:
+            return 0
+        missing = sorted(starts - await self._existing(engine, starts))
+        for start in missing:
+            await self._create_partition(engine, start)
+        return len(missing)
+
+    async def ensure_range(self, engine: AsyncEngine, date_from: date, date_to: date) -> int:
+        """Создание секций, покрывающих период [date_from, date_to]"""
+        starts = []
+        start = self.period_start(date_from)
+        while start <= date_to:
+            starts.append(start)
+            start = self.next_period_start(start)
+        return await self.ensure_for_dates(engine, starts)
+
+    async def ensure_startup(self, engine: AsyncEngine) -> int:
+        """Секции текущего периода и ahead следующих (вызывается при старте)"""
+        if not self.enabled:
+            return 0
+        start = self.period_start(date.today())
+        end = start
+        for _ in range(self.ahead):
+            end = self.next_period_start(end)
+        return await self.ensure_range(engine, start, end)
+
+    async def detach_before(
+        self,
+        engine: AsyncEngine,
+        before: date,
+        archive_schema: Optional[str] = None,
+        drop: bool = False
+    ) -> List[str]:
+        """
+        Отсоединение секций, целиком лежащих раньше даты before
+
+        Отсоединенная таблица переносится в схему archive_schema (данные
+        остаются доступны для выгрузки) или удаляется при drop=True.
+        Помесячные агрегаты (production_monthly) не затрагиваются.
+        """
+        known = await self._load(engine)
+        detached = []
+        for start in sorted(known):
+            if self.next_period_start(start) > before:
+                continue
+            name = self.partition_name(start)
+            async with engine.begin() as conn:
+                await conn.execute(text(f'ALTER TABLE "{self.parent}" DETACH PARTITION "{name}"'))
+                if drop:
+                    await conn.execute(text(f'DROP TABLE "{name}"'))
+                elif archive_schema:
+                    await conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{archive_schema}"'))
+                    await conn.execute(text(f'ALTER TABLE "{name}" SET SCHEMA "{archive_schema}"'))
+            detached.append(name)
+            logger.info(f"Detached partition {name} ({'dropped' if drop else archive_schema or 'kept'})")
+        return detached
@@ -0,0 +1,140 @@
+"""
+Пул соединений с базой данных: учет ожидания, прогрев и статистика
+"""
+import asyncio
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Очередь соединений с учетом времени выдачи
+
+    Время выдачи соединения делится на ожидание свободного соединения
+    (пул и overflow исчерпаны) и установку нового соединения. Счетчики
+    живут в экземпляре пула и обнуляются при его пересоздании (dispose).
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._checkouts = 0
+        self._timeouts = 0
+        self._connects = 0
+        self._connect_seconds = 0.0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def _create_connection(self):
+        started = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            self._connects += 1
+            self._connect_seconds += time.perf_counter() - started
+
+    def _do_get(self):
+        started = time.perf_counter()
+        connect_seconds = self._connect_seconds
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self._timeouts += 1
+            raise
+        finally:
+            # Время установки нового соединения не считается ожиданием
+            wait = time.perf_counter() - started - (self._connect_seconds - connect_seconds)
+            self._checkouts += 1
+            self._wait_seconds += wait
+            self._max_wait_seconds = max(self._max_wait_seconds, wait)
+
+    def stats(self) -> Dict[str, Any]:
+        """Текущее состояние пула и накопленные счетчики"""
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "checkouts": self._checkouts,
+            "timeouts": self._timeouts,
+            "connects": self._connects,
+            "connect_ms_avg": round(self._connect_seconds / self._connects * 1000, 3) if self._connects else 0.0,
+            "wait_ms_total": round(self._wait_seconds * 1000, 3),
+            "wait_ms_avg": round(self._wait_seconds / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+            "wait_ms_max": round(self._max_wait_seconds * 1000, 3),
+        }
+
+
+def pool_stats(engine: AsyncEngine) -> Dict[str, Any]:
+    """Статистика пула движка (для пулов без учета - только status())"""
+    pool = engine.pool
+    if isinstance(pool, InstrumentedPool):
+        return pool.stats()
+    return {"status": pool.status()}
+
+
+def pool_metrics(engines: Dict[str, Optional[AsyncEngine]]) -> Iterable[tuple]:
+    """Метрики пулов для /metrics (метка engine - имя движка)"""
+    stats = {
+        name: engine.pool.stats()
+        for name, engine in engines.items()
+        if engine is not None and isinstance(engine.pool, InstrumentedPool)
+    }
+    gauges = (
+        ("db_pool_size", "size", "Configured pool size"),
+        ("db_pool_checked_out", "checked_out", "Connections currently checked out"),
+        ("db_pool_checked_in", "checked_in", "Idle connections in the pool"),
+        ("db_pool_overflow", "overflow", "Overflow connections currently open"),
+    )
+    for name, key, documentation in gauges:
+        yield name, "gauge", documentation, [({"engine": engine}, item[key]) for engine, item in stats.items()]
+    counters = (
+        ("db_pool_checkouts_total", "checkouts", "Connection checkouts"),
+        ("db_pool_timeouts_total", "timeouts", "Checkouts that timed out waiting for a connection"),
+        ("db_pool_connects_total", "connects", "New connections opened"),
+    )
+    for name, key, documentation in counters:
+        yield name, "counter", documentation, [({"engine": engine}, item[key]) for engine, item in stats.items()]
+    yield (
+        "db_pool_wait_seconds_total", "counter", "Time spent waiting for a free connection",
+        [({"engine": engine}, item["wait_ms_total"] / 1000) for engine, item in stats.items()]
+    )
+
+
+async def prewarm_pool(engine: AsyncEngine, connections: int) -> int:
+    """
+    Открытие соединений заранее, чтобы первые запросы не тратили время
+    на их установку
+
+    Соединения открываются одновременно и сразу возвращаются в пул, поэтому
+    их число ограничено постоянным размером пула (overflow-соединения были
+    бы закрыты при возврате). Ошибки не прерывают запуск приложения.
+    """
+    pool = engine.pool
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        connections = min(connections, pool.size())
+    if connections <= 0:
+        return 0
+
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(engine.connect().start() for _ in range(connections)),
+        return_exceptions=True
+    )
+    opened = [conn for conn in results if not isinstance(conn, BaseException)]
+    await asyncio.gather(*(conn.close() for conn in opened))
+
+    failed = len(results) - len(opened)
+    if failed:
+        error = next(result for result in results if isinstance(result, BaseException))
+        logger.warning(f"Pool prewarm: {failed} of {connections} connections failed: {error}")
+    logger.info(f"Pool prewarmed with {len(opened)} connections in {time.perf_counter() - started:.3f}s")
+    return len(opened)
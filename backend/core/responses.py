@@ -0,0 +1,130 @@
+"""
+Быстрая сериализация JSON-ответов
+
+Стандартный путь FastAPI для ответа-модели: model_dump, повторная валидация
+по response_model, приведение к JSON-совместимым типам и json.dumps.
+Здесь модель, уже проверенная в роутере, сериализуется один раз через
+model_dump_json (pydantic-core), а прочее содержимое - через orjson, если он
+установлен. Результат совпадает со стандартным путем: Decimal в моделях
+выводится строкой, в прочем содержимом - числом (как jsonable_encoder),
+даты - в ISO 8601, значения enum - как есть (UTF-8 без экранирования).
+"""
+import functools
+import json
+import time
+from decimal import Decimal
+from typing import Any, Callable, Optional
+
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.encoders import decimal_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.responses import Response
+
+from .logging import get_logger
+from .timing import record_serialization
+
+logger = get_logger(__name__)
+
+try:
+    import orjson
+except ImportError:  # orjson - необязательная зависимость
+    orjson = None
+
+# Глобальное включение быстрого пути (настраивается в main.py)
+_fast_responses_enabled = True
+
+
+def configure_responses(enabled: bool = True) -> None:
+    """Включение или отключение сериализации моделей в обход FastAPI"""
+    global _fast_responses_enabled
+    _fast_responses_enabled = enabled
+    logger.info(
+        f"Fast JSON responses: {'enabled' if enabled else 'disabled'}, "
+        f"encoder for plain content: {'orjson' if orjson else 'json'}"
+    )
+
+
+def _default(value: Any) -> Any:
+    """Сериализация типов, которые orjson не поддерживает"""
+    if isinstance(value, Decimal):
+        return decimal_encoder(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Сериализация содержимого ответа в JSON"""
+    if isinstance(content, BaseModel):
+        return content.model_dump_json().encode("utf-8")
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+        default=_default
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON-ответ, принимающий как Pydantic модели, так и обычные данные"""
+
+    def render(self, content: Any) -> bytes:
+        started = time.perf_counter()
+        body = dumps(content)
+        record_serialization(time.perf_counter() - started)
+        return body
+
+
+def _response_model_class(response_model: Any) -> Optional[type]:
+    """Класс модели ответа (для generic схем - исходный класс)"""
+    if not isinstance(response_model, type) or not issubclass(response_model, BaseModel):
+        return None
+    metadata = getattr(response_model, "__pydantic_generic_metadata__", None) or {}
+    return metadata.get("origin") or response_model
+
+
+class ModelResponseRoute(APIRoute):
+    """
+    Маршрут, отдающий модели ответа без повторной обработки FastAPI
+
+    Если обработчик вернул экземпляр response_model, он сериализуется сразу
+    в FastJSONResponse. Заголовки и статус, установленные через параметр
+    Response обработчика, переносятся в ответ. Остальные значения (словари,
+    None, готовые Response) обрабатываются стандартным путем.
+    """
+
+    def get_route_handler(self) -> Callable:
+        model_class = _response_model_class(self.response_model)
+        response_class = self.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+
+        if model_class is not None and issubclass(response_class, JSONResponse):
+            self.dependant.call = self._wrap_endpoint(self.dependant.call, model_class)
+        return super().get_route_handler()
+
+    def _wrap_endpoint(self, call: Callable, model_class: type) -> Callable:
+        """Обертка обработчика, превращающая модель в готовый ответ"""
+        status_code = self.status_code
+
+        @functools.wraps(call)
+        async def endpoint(**kwargs: Any) -> Any:
+            result = await call(**kwargs)
+            if not _fast_responses_enabled or not isinstance(result, model_class):
+                return result
+
+            response = FastJSONResponse(result, status_code=status_code or 200)
+            for value in kwargs.values():
+                if isinstance(value, Response):
+                    if value.status_code:
+                        response.status_code = value.status_code
+                    response.headers.raw.extend(value.headers.raw)
+            return response
+
+        return endpoint
@@ -0,0 +1,63 @@
+"""
+Объединение одинаковых одновременных вычислений (single-flight)
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class SingleFlight:
+    """
+    Выполняет не более одного вычисления на ключ в каждый момент времени
+
+    Первый вызов с ключом (лидер) запускает вычисление отдельной задачей,
+    последующие вызовы с тем же ключом до ее завершения ожидают ту же задачу
+    и получают тот же результат или то же исключение. Ожидание защищено
+    asyncio.shield: отмена одного из ожидающих запросов не прерывает
+    вычисление для остальных. Рассчитан на работу внутри одного event loop.
+    """
+
+    def __init__(self, name: str = "singleflight"):
+        self.name = name
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+
+        self.leaders = 0
+        self.coalesced = 0
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        """Удаление завершенной задачи из списка выполняющихся"""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Исключение уже передано ожидающим, помечаем его как полученное
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Выполнение fn или присоединение к уже выполняющемуся вызову
+
+        Возвращает результат и признак того, что вызов был объединен
+        с ранее начатым (True - результат получен от другого запроса).
+        """
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            logger.debug(f"{self.name}: joined in-flight call for {key}")
+            return await asyncio.shield(task), True
+
+        task = asyncio.ensure_future(fn())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        self.leaders += 1
+        return await asyncio.shield(task), False
+
+    def stats(self) -> Dict[str, Any]:
+        """Статистика объединения вызовов"""
+        return {
+            "in_flight": len(self._in_flight),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,245 @@
+"""
+Журнал медленных SQL-запросов с выборочным захватом планов выполнения
+"""
+import asyncio
+import random
+import re
+import sys
+import time
+from collections import OrderedDict
+from contextvars import Context, ContextVar
+from typing import Any, Dict, List, Optional
+
+import greenlet
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .config import settings
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+# Выражения, для которых захватывается план
+EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+# WITH ... INSERT/UPDATE/DELETE изменяет данные даже внутри EXPLAIN ANALYZE
+MODIFYING = re.compile(r"\b(INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+# Побочные эффекты, которые откат транзакции EXPLAIN ANALYZE не отменяет или
+# которые мешают приложению: расход последовательностей, уведомления,
+# рекомендательные блокировки, блокировки строк
+SIDE_EFFECTS = re.compile(
+    r"\b(nextval|setval|pg_notify|pg_(try_)?advisory_\w+)\s*\("
+    r"|\bFOR\s+(NO\s+KEY\s+)?UPDATE\b|\bFOR\s+(KEY\s+)?SHARE\b",
+    re.IGNORECASE
+)
+
+_PARAMETER = re.compile(
+    r"\$\d+(::\w+(\([\d, ]+\))?( WITH(OUT)? TIME ZONE| PRECISION| VARYING)?(\[\])?)?|%\(\w+\)s|\?|(?<!:):\w+"
+)
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(\s*,\s*\?)+\s*\)", re.IGNORECASE)
+_VALUES_ROWS = re.compile(r"(\((\s*\?\s*,)*\s*\?\s*\))(\s*,\s*\((\s*\?\s*,)*\s*\?\s*\))+")
+_SPACES = re.compile(r"\s+")
+
+# Выполняется ли в текущей задаче захват плана (его запросы не журналируются)
+_explaining: ContextVar[bool] = ContextVar("explaining", default=False)
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Нормализованный текст запроса: параметры и литералы заменены на ?,
+    развернутые списки IN свернуты в IN (?, ...), многострочный VALUES -
+    до первой строки
+    """
+    normalized = _PARAMETER.sub("?", statement)
+    normalized = _LITERAL.sub("?", normalized)
+    normalized = _IN_LIST.sub("IN (?, ...)", normalized)
+    normalized = _VALUES_ROWS.sub(r"\1, ...", normalized)
+    return _SPACES.sub(" ", normalized).strip()
+
+
+def explain_command(statement: str) -> Optional[str]:
+    """
+    Команда захвата плана: EXPLAIN ANALYZE выполняет запрос, поэтому для
+    выражений с изменением данных или побочными эффектами берется план
+    без выполнения. None - план не захватывается.
+
+    Пользовательские VOLATILE-функции по тексту не распознаются.
+    """
+    if not EXPLAINABLE.match(statement):
+        return None
+    if MODIFYING.search(statement) or SIDE_EFFECTS.search(statement):
+        return "EXPLAIN"
+    return "EXPLAIN (ANALYZE, BUFFERS)"
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    """Краткое описание параметров без значений: типы и их количество"""
+    if executemany:
+        rows = list(parameters or ())
+        return f"{len(rows)} rows × ({parameter_shape(rows[0]) if rows else ''})"
+    if isinstance(parameters, dict):
+        values = list(parameters.values())
+    else:
+        values = list(parameters or ())
+
+    groups: List[List[Any]] = []
+    for value in values:
+        name = type(value).__name__
+        if groups and groups[-1][0] == name:
+            groups[-1][1] += 1
+        else:
+            groups.append([name, 1])
+    return ", ".join(name if count == 1 else f"{name}×{count}" for name, count in groups)
+
+
+def calling_service() -> Optional[str]:
+    """
+    Метод сервиса, из которого выполняется запрос
+
+    Синхронный код SQLAlchemy выполняется в дочернем greenlet, поэтому после
+    его стека просмотр продолжается со стека родительского greenlet, где
+    ожидают вызывающие корутины. Возвращается самый внутренний метод
+    из модулей сервисов, с классом экземпляра.
+    """
+    frame = sys._getframe(1)
+    current = greenlet.getcurrent()
+    while True:
+        while frame is not None:
+            if frame.f_code.co_filename.endswith("service.py"):
+                owner = frame.f_locals.get("self")
+                if owner is not None:
+                    return f"{type(owner).__name__}.{frame.f_code.co_name}"
+                return frame.f_code.co_qualname
+            frame = frame.f_back
+        current = current.parent
+        if current is None:
+            return None
+        frame = current.gr_frame
+
+
+class SlowQueryLog:
+    """
+    Журнал медленных запросов
+
+    Каждое выражение дольше порога пишется в лог одной записью:
+    длительность, нормализованный SQL, описание параметров, запрос API
+    и метод сервиса. Статистика накапливается по нормализованному SQL.
+    Для доли SELECT-запросов (explain_sample_rate) в фоне выполняется
+    EXPLAIN (ANALYZE, BUFFERS) на отдельном соединении того же движка
+    (для запросов с побочными эффектами - EXPLAIN без выполнения);
+    план пишется в лог и сохраняется в статистике.
+    """
+
+    def __init__(self, threshold_ms: float, explain_sample_rate: float = 0.0, max_entries: int = 200):
+        self.threshold_ms = threshold_ms
+        self.explain_sample_rate = explain_sample_rate
+        self.max_entries = max_entries
+        self._engines: Dict[int, AsyncEngine] = {}
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._explain_tasks = set()
+
+    @property
+    def threshold_seconds(self) -> float:
+        return self.threshold_ms / 1000 if self.threshold_ms > 0 else float("inf")
+
+    def register_engine(self, engine: AsyncEngine) -> None:
+        """Движок, через который выполняется EXPLAIN для его запросов"""
+        self._engines[id(engine.sync_engine)] = engine
+
+    def record(
+        self,
+        conn,
+        statement: str,
+        parameters: Any,
+        executemany: bool,
+        elapsed: float,
+        request: Optional[str] = None
+    ) -> None:
+        """Учет выражения, выполнявшегося дольше порога"""
+        if _explaining.get():
+            return
+
+        normalized = normalize_sql(statement)
+        shape = parameter_shape(parameters, executemany)
+        service = calling_service()
+        elapsed_ms = elapsed * 1000
+        logger.warning(
+            f"Slow query {elapsed_ms:.1f} ms (request={request or '-'}, service={service or '-'}): "
+            f"{normalized} | params: {shape or '-'}"
+        )
+
+        entry = self._entries.get(normalized)
+        if entry is None:
+            if len(self._entries) >= self.max_entries:
+                self._entries.popitem(last=False)
+            entry = self._entries[normalized] = {
+                "sql": normalized, "count": 0, "total_ms": 0.0, "max_ms": 0.0, "plan": None
+            }
+        entry["count"] += 1
+        entry["total_ms"] += elapsed_ms
+        entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+        entry.update(last_request=request, last_service=service, last_params=shape)
+
+        if self.explain_sample_rate <= 0 or executemany:
+            return
+        command = explain_command(statement)
+        if command is not None and random.random() < self.explain_sample_rate:
+            self._schedule_explain(conn, command, statement, parameters, normalized)
+
+    def _schedule_explain(self, conn, command: str, statement: str, parameters: Any, normalized: str) -> None:
+        engine = self._engines.get(id(conn.engine))
+        if engine is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        # Пустой контекст: запросы захвата плана не учитываются в метриках исходного запроса
+        task = loop.create_task(
+            self._explain(engine, command, statement, parameters, normalized), context=Context()
+        )
+        self._explain_tasks.add(task)
+        task.add_done_callback(self._explain_tasks.discard)
+
+    async def _explain(
+        self, engine: AsyncEngine, command: str, statement: str, parameters: Any, normalized: str
+    ) -> None:
+        """Захват плана выполнения (с ANALYZE запрос выполняется повторно)"""
+        _explaining.set(True)
+        try:
+            # Транзакция соединения откатывается при закрытии
+            async with engine.connect() as conn:
+                timeout_ms = int(max(self.threshold_ms, 1) * 10)
+                await conn.execute(text(f"SET LOCAL statement_timeout = {timeout_ms}"))
+                result = await conn.exec_driver_sql(
+                    f"{command} {statement}", parameters or ()
+                )
+                plan = "\n".join(row[0] for row in result)
+        except Exception as e:
+            logger.warning(f"Slow query EXPLAIN failed: {e}")
+            return
+
+        entry = self._entries.get(normalized)
+        if entry is not None:
+            entry["plan"] = plan
+            entry["plan_analyzed"] = command != "EXPLAIN"
+            entry["plan_captured_at"] = time.time()
+        logger.warning(f"Slow query plan for {normalized}:\n{plan}")
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Медленные запросы, упорядоченные по суммарному времени"""
+        entries = sorted(self._entries.values(), key=lambda entry: entry["total_ms"], reverse=True)
+        return [
+            {**entry, "total_ms": round(entry["total_ms"], 3), "max_ms": round(entry["max_ms"], 3)}
+            for entry in entries
+        ]
+
+    def reset(self) -> None:
+        self._entries.clear()
+
+
+# Глобальный журнал медленных запросов
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    explain_sample_rate=settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+)
@@ -0,0 +1,171 @@
+"""
+Учет времени обработки запросов: общее время, SQL и сериализация
+
+Метрики текущего запроса хранятся в ContextVar и пополняются обработчиками
+событий SQLAlchemy (before/after_cursor_execute) и сериализатором ответов.
+Задачи, запущенные из запроса (asyncio копирует контекст), учитываются
+в метриках этого запроса.
+"""
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .metrics import db_query_duration
+from .slow_queries import slow_query_log
+
+# Типы SQL-выражений в метриках (остальные - OTHER)
+STATEMENT_TYPES = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "COPY"})
+
+
+class RequestMetrics:
+    """Метрики одного запроса"""
+
+    __slots__ = ("target", "started", "db_seconds", "statements", "rows", "serialize_seconds")
+
+    def __init__(self, target: Optional[str] = None):
+        self.target = target  # Метод и путь запроса
+        self.started = time.perf_counter()
+        self.db_seconds = 0.0
+        self.statements = 0
+        self.rows = 0
+        self.serialize_seconds = 0.0
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        """Значение заголовка Server-Timing"""
+        return (
+            f"app;dur={self.elapsed() * 1000:.1f}, "
+            f"db;dur={self.db_seconds * 1000:.1f};desc=\"{self.statements} queries, {self.rows} rows\", "
+            f"serialize;dur={self.serialize_seconds * 1000:.1f}"
+        )
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+def start_request(target: Optional[str] = None) -> tuple:
+    """Начало учета запроса: метрики и токен для finish_request"""
+    metrics = RequestMetrics(target)
+    return metrics, _current.set(metrics)
+
+
+def finish_request(token) -> None:
+    """Окончание учета запроса"""
+    _current.reset(token)
+
+
+def current_metrics() -> Optional[RequestMetrics]:
+    """Метрики текущего запроса (None вне запроса)"""
+    return _current.get()
+
+
+def record_serialization(seconds: float) -> None:
+    """Учет времени сериализации ответа"""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.serialize_seconds += seconds
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    keyword = statement.lstrip()[:7].split(None, 1)[0].upper() if statement.strip() else ""
+    db_query_duration.labels(keyword if keyword in STATEMENT_TYPES else "OTHER").observe(elapsed)
+
+    metrics = _current.get()
+    if elapsed >= slow_query_log.threshold_seconds:
+        slow_query_log.record(
+            conn, statement, parameters, executemany, elapsed,
+            request=metrics.target if metrics is not None else None
+        )
+    if metrics is None:
+        return
+    metrics.db_seconds += elapsed
+    metrics.statements += 1
+    # Для SELECT asyncpg возвращает в rowcount число полученных строк
+    if cursor.description is not None and cursor.rowcount > 0:
+        metrics.rows += cursor.rowcount
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    # after_cursor_execute не вызывается при ошибке выполнения
+    if context.connection is not None and context.cursor is not None:
+        stack = context.connection.info.get("query_started")
+        if stack:
+            stack.pop()
+
+
+class RouteStats:
+    """Накопленная статистика одного маршрута"""
+
+    __slots__ = ("count", "errors", "total_ms", "max_ms", "db_ms", "statements", "rows", "serialize_ms")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.db_ms = 0.0
+        self.statements = 0
+        self.rows = 0
+        self.serialize_ms = 0.0
+
+    def add(self, metrics: RequestMetrics, elapsed_ms: float, status: int) -> None:
+        self.count += 1
+        if status >= 500:
+            self.errors += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.db_ms += metrics.db_seconds * 1000
+        self.statements += metrics.statements
+        self.rows += metrics.rows
+        self.serialize_ms += metrics.serialize_seconds * 1000
+
+    def summary(self) -> Dict[str, Any]:
+        count = self.count or 1
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / count, 3),
+            "max_ms": round(self.max_ms, 3),
+            "avg_db_ms": round(self.db_ms / count, 3),
+            "avg_statements": round(self.statements / count, 2),
+            "avg_rows": round(self.rows / count, 1),
+            "avg_serialize_ms": round(self.serialize_ms / count, 3),
+        }
+
+
+class RouteTimings:
+    """Статистика по маршрутам (ключ - метод и шаблон пути)"""
+
+    def __init__(self):
+        self.routes: Dict[str, RouteStats] = {}
+
+    def record(self, route: str, metrics: RequestMetrics, elapsed_ms: float, status: int) -> None:
+        stats = self.routes.get(route)
+        if stats is None:
+            stats = self.routes[route] = RouteStats()
+        stats.add(metrics, elapsed_ms, status)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Маршруты, упорядоченные по суммарному времени"""
+        ordered = sorted(self.routes.items(), key=lambda item: item[1].total_ms, reverse=True)
+        return [{"route": route, **stats.summary()} for route, stats in ordered]
+
+    def reset(self) -> None:
+        self.routes.clear()
+
+
+# Глобальная статистика маршрутов
+route_timings = RouteTimings()
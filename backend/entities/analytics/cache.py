@@ -0,0 +1,225 @@
+"""
+Кэш результатов динамики добычи с инвалидацией по записям
+"""
+import logging
+from datetime import date
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+from backend.core.cache import CacheBackend, InMemoryCacheBackend
+from backend.core.config import settings
+from backend.core.database import mark_write
+from backend.shared.enums import SedimentComplexEnum, FluidTypeEnum, AggregationStepEnum
+
+logger = logging.getLogger(__name__)
+
+# След записи: (тип флюида, месторождение) -> (минимальная дата, максимальная дата)
+WriteFootprint = Dict[Tuple[FluidTypeEnum, int], Tuple[date, date]]
+
+
+class DynamicsParams(NamedTuple):
+    """Нормализованные параметры запроса динамики (ключ кэша и объединения запросов)"""
+    date_from: date
+    date_to: date
+    fluid_type: FluidTypeEnum
+    field_ids: Optional[Tuple[int, ...]]
+    sediment_complexes: Optional[Tuple[SedimentComplexEnum, ...]]
+    aggregation_step: AggregationStepEnum
+
+
+class DynamicsTags(NamedTuple):
+    """Данные, от которых зависит закэшированный результат"""
+    fluid_type: FluidTypeEnum
+    date_from: date
+    date_to: date
+    field_ids: Optional[FrozenSet[int]]  # None - все месторождения
+
+
+def normalize_params(
+    date_from: date,
+    date_to: date,
+    fluid_type: FluidTypeEnum,
+    field_ids: Optional[List[int]],
+    sediment_complexes: Optional[List[SedimentComplexEnum]],
+    aggregation_step: AggregationStepEnum
+) -> DynamicsParams:
+    """Приведение параметров к каноническому виду (порядок и повторы не важны)"""
+    return DynamicsParams(
+        date_from=date_from,
+        date_to=date_to,
+        fluid_type=FluidTypeEnum(fluid_type),
+        field_ids=tuple(sorted(set(field_ids))) if field_ids else None,
+        sediment_complexes=(
+            tuple(sorted(set(SedimentComplexEnum(item) for item in sediment_complexes), key=lambda item: item.value))
+            if sediment_complexes else None
+        ),
+        aggregation_step=AggregationStepEnum(aggregation_step)
+    )
+
+
+def build_write_footprint(records: Iterable[Dict[str, Any]]) -> WriteFootprint:
+    """Сводка записанных строк добычи для инвалидации кэша"""
+    footprint: WriteFootprint = {}
+    for record in records:
+        key = (FluidTypeEnum(record["fluid_type"]), record["field_id"])
+        record_date = record["date"]
+        bounds = footprint.get(key)
+        if bounds is None:
+            footprint[key] = (record_date, record_date)
+        else:
+            footprint[key] = (min(bounds[0], record_date), max(bounds[1], record_date))
+    return footprint
+
+
+def merge_footprints(target: WriteFootprint, other: WriteFootprint) -> WriteFootprint:
+    """Объединение следов записи (для загрузки несколькими пачками)"""
+    for key, (low, high) in other.items():
+        bounds = target.get(key)
+        target[key] = (low, high) if bounds is None else (min(bounds[0], low), max(bounds[1], high))
+    return target
+
+
+def estimate_result_size(fields_count: int, periods_count: int) -> int:
+    """Грубая оценка памяти, занимаемой результатом, в байтах"""
+    # ~32 байта на float в списке, строки периодов и объекты месторождений
+    return 2048 + (fields_count + 1) * periods_count * 32 + periods_count * 64 + fields_count * 512
+
+
+class DynamicsCache:
+    """
+    Кэш результатов get_production_dynamics
+
+    Запись инвалидируется, только если изменение добычи того же флюида
+    попадает в ее период и в ее набор месторождений. Фильтр по комплексам
+    отложений не учитывается при инвалидации (консервативно - запись
+    сбрасывается), чтобы не требовать запросов к БД при записи.
+
+    Счетчик поколений защищает от сохранения результата, посчитанного
+    до изменения, но сохраняемого после его инвалидации.
+    """
+
+    def __init__(self, backend: CacheBackend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self.generation = 0
+
+    def set_backend(self, backend: CacheBackend) -> None:
+        """Замена хранилища (например, на разделяемое между процессами)"""
+        self.backend = backend
+
+    def get(self, params: DynamicsParams) -> Optional[Any]:
+        """Поиск результата в кэше"""
+        if not self.enabled:
+            return None
+        return self.backend.get(params)
+
+    def set(self, params: DynamicsParams, value: Any, generation: int, size: int = 0) -> None:
+        """Сохранение результата, если с начала расчета не было инвалидаций"""
+        if not self.enabled or generation != self.generation:
+            return
+        tags = DynamicsTags(
+            fluid_type=params.fluid_type,
+            date_from=params.date_from,
+            date_to=params.date_to,
+            field_ids=frozenset(params.field_ids) if params.field_ids else None
+        )
+        self.backend.set(params, value, tags=tags, size=size)
+
+    def invalidate_footprint(self, footprint: WriteFootprint) -> int:
+        """Удаление записей, пересекающихся с изменением"""
+        if not footprint:
+            return 0
+        self.generation += 1
+        mark_write()
+
+        def affected(tags: DynamicsTags) -> bool:
+            for (fluid_type, field_id), (low, high) in footprint.items():
+                if (
+                    tags.fluid_type == fluid_type
+                    and low <= tags.date_to
+                    and high >= tags.date_from
+                    and (tags.field_ids is None or field_id in tags.field_ids)
+                ):
+                    return True
+            return False
+
+        removed = self.backend.invalidate(affected)
+        if removed:
+            logger.info(f"Analytics cache: invalidated {removed} entries")
+        return removed
+
+    def invalidate_records(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Инвалидация по списку записанных строк добычи"""
+        return self.invalidate_footprint(build_write_footprint(records))
+
+    def invalidate_all(self) -> None:
+        """Полный сброс кэша"""
+        self.generation += 1
+        mark_write()
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Статистика кэша"""
+        return {"enabled": self.enabled, "generation": self.generation, **self.backend.stats()}
+
+
+# Канал NOTIFY, по которому внешние процессы сбрасывают кэш работающего API
+CACHE_RESET_CHANNEL = "analytics_cache_reset"
+
+
+class CacheResetListener:
+    """
+    Сброс кэша по NOTIFY из других процессов
+
+    Скрипты, меняющие данные в обход API (clear_database.py), отправляют
+    NOTIFY в канал CACHE_RESET_CHANNEL в своей транзакции. Каждый процесс
+    API держит одно соединение с LISTEN и сбрасывает свой кэш целиком.
+    Уведомления, отправленные, пока соединение разорвано, теряются.
+    """
+
+    def __init__(self, cache: DynamicsCache, channel: str = CACHE_RESET_CHANNEL):
+        self.cache = cache
+        self.channel = channel
+        self._connection = None
+        self._driver_connection = None
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        logger.info(f"Analytics cache: reset requested by backend process {pid}")
+        self.cache.invalidate_all()
+
+    async def start(self, engine: Any) -> None:
+        """Подписка на канал через отдельное соединение пула"""
+        connection = await engine.connect()
+        driver_connection = (await connection.get_raw_connection()).driver_connection
+        if not hasattr(driver_connection, "add_listener"):
+            logger.warning("Analytics cache: database driver does not support LISTEN, external resets are ignored")
+            await connection.close()
+            return
+        await driver_connection.add_listener(self.channel, self._on_notify)
+        self._connection = connection
+        self._driver_connection = driver_connection
+        logger.info(f"Analytics cache: listening for resets on channel {self.channel}")
+
+    async def stop(self) -> None:
+        """Отписка и возврат соединения в пул"""
+        if self._connection is None:
+            return
+        try:
+            await self._driver_connection.remove_listener(self.channel, self._on_notify)
+        finally:
+            await self._connection.close()
+            self._connection = None
+            self._driver_connection = None
+
+
+# Глобальный экземпляр кэша
+dynamics_cache = DynamicsCache(
+    InMemoryCacheBackend(
+        max_entries=settings.ANALYTICS_CACHE_MAX_ENTRIES,
+        max_bytes=settings.ANALYTICS_CACHE_MAX_MB * 1024 * 1024,
+        ttl_seconds=settings.ANALYTICS_CACHE_TTL_SECONDS
+    ),
+    enabled=settings.ANALYTICS_CACHE_ENABLED
+)
+
+# Глобальный подписчик на внешние сбросы кэша
+dynamics_cache_reset_listener = CacheResetListener(dynamics_cache)
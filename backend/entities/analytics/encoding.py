@@ -0,0 +1,87 @@
+"""
+Бинарный колоночный формат ответа динамики добычи
+
+Формат (порядок байтов little-endian):
+
+    0   4 байта  сигнатура b"PDYN"
+    4   uint16   версия формата (1)
+    6   uint16   зарезервировано (0)
+    8   uint32   длина заголовка N в байтах
+    12  N байт   заголовок JSON (UTF-8), дополнен пробелами до кратности 8
+    ...          float64[fields × periods] - матрица добычи по строкам (месторождениям)
+    ...          float64[periods] - суммарная добыча по периодам
+
+Заголовок содержит metadata и reporting_dates в том же виде, что и JSON-ответ,
+а также fields - список {field_id, field_name} в порядке строк матрицы.
+Числовые данные выровнены по 8 байтам и читаются без копирования
+(numpy.frombuffer, Float64Array в браузере).
+"""
+import json
+import struct
+from typing import Any, Dict
+
+import numpy as np
+
+from backend.core.exceptions import ValidationError
+from backend.entities.analytics.schema import (
+    ProductionDynamicsResponseSchema,
+    FieldProductionData,
+    TotalProductionData
+)
+
+DYNAMICS_BINARY_MEDIA_TYPE = "application/vnd.production-dynamics.f64"
+
+MAGIC = b"PDYN"
+FORMAT_VERSION = 1
+PREFIX = struct.Struct("<4sHHI")
+FLOAT64 = np.dtype("<f8")
+
+
+def encode_dynamics(result: ProductionDynamicsResponseSchema) -> bytes:
+    """Кодирование ответа динамики в бинарный формат"""
+    periods_count = len(result.reporting_dates)
+    header: Dict[str, Any] = result.model_dump(mode="json", include={"metadata", "reporting_dates"})
+    header["fields"] = [
+        {"field_id": field.field_id, "field_name": field.field_name}
+        for field in result.fields
+    ]
+
+    header_bytes = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    header_bytes += b" " * (-(PREFIX.size + len(header_bytes)) % FLOAT64.itemsize)
+
+    matrix = np.array(
+        [field.production_by_period for field in result.fields], dtype=FLOAT64
+    ).reshape(len(result.fields), periods_count)
+    totals = np.array(result.total.production_by_period, dtype=FLOAT64)
+
+    return b"".join((
+        PREFIX.pack(MAGIC, FORMAT_VERSION, 0, len(header_bytes)),
+        header_bytes,
+        matrix.tobytes(),
+        totals.tobytes()
+    ))
+
+
+def decode_dynamics(payload: bytes) -> ProductionDynamicsResponseSchema:
+    """Декодирование бинарного формата (для клиентов на Python и тестов)"""
+    if len(payload) < PREFIX.size:
+        raise ValidationError("Payload is too short")
+    magic, version, _, header_length = PREFIX.unpack_from(payload)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValidationError(f"Unsupported dynamics payload (magic={magic!r}, version={version})")
+
+    header = json.loads(payload[PREFIX.size:PREFIX.size + header_length])
+    fields, periods_count = header.pop("fields"), len(header["reporting_dates"])
+    data = np.frombuffer(payload, dtype=FLOAT64, offset=PREFIX.size + header_length)
+    if len(data) != (len(fields) + 1) * periods_count:
+        raise ValidationError("Payload size does not match header")
+
+    matrix = data[:len(fields) * periods_count].reshape(len(fields), periods_count)
+    return ProductionDynamicsResponseSchema(
+        **header,
+        fields=[
+            FieldProductionData(**field, production_by_period=row)
+            for field, row in zip(fields, matrix.tolist())
+        ],
+        total=TotalProductionData(production_by_period=data[len(fields) * periods_count:].tolist())
+    )
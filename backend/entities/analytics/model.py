@@ -0,0 +1,58 @@
+"""
+SQLAlchemy модель помесячной агрегации добычи (rollup)
+"""
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import ForeignKey, Date, DateTime, Index, Integer, Numeric, Enum as SQLEnum, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.core.base import Base
+from backend.shared.enums import FluidTypeEnum
+
+
+class ProductionMonthly(Base):
+    """
+    Помесячная сумма добычи по месторождению, объекту разработки и флюиду
+
+    Поддерживается сервисом добычи при каждой записи и пересчитывается
+    командой scripts/rebuild_production_rollup.py
+    """
+
+    __tablename__ = "production_monthly"
+    __table_args__ = (
+        # Чтение целых месяцев в динамике добычи (index-only scan)
+        Index(
+            "ix_production_monthly_fluid_month_cover",
+            "fluid_type", "month",
+            postgresql_include=["field_id", "development_object_id", "amount"]
+        ),
+    )
+
+    # Ключ агрегации
+    field_id: Mapped[int] = mapped_column(
+        ForeignKey("fields.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    development_object_id: Mapped[int] = mapped_column(
+        ForeignKey("development_objects.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    fluid_type: Mapped[FluidTypeEnum] = mapped_column(SQLEnum(FluidTypeEnum), primary_key=True)
+    month: Mapped[date] = mapped_column(Date, primary_key=True)  # Первое число месяца
+
+    # Агрегаты
+    amount: Mapped[Decimal] = mapped_column(Numeric(precision=20, scale=3), nullable=False, default=0)
+    records_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<ProductionMonthly(field_id={self.field_id}, "
+            f"development_object_id={self.development_object_id}, "
+            f"fluid_type='{self.fluid_type}', month={self.month}, amount={self.amount})>"
+        )
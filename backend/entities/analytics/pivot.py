@@ -0,0 +1,96 @@
+"""
+Сведение результатов агрегации добычи в матрицу месторождение × период
+"""
+from operator import itemgetter
+from typing import Any, List, NamedTuple, Sequence
+
+import numpy as np
+
+from backend.shared.enums import AggregationStepEnum
+
+
+class ProductionPivot(NamedTuple):
+    """Матрица добычи и ее подписи"""
+    reporting_dates: List[str]
+    field_ids: List[int]
+    field_names: List[str]
+    matrix: np.ndarray  # float64, строки - месторождения, столбцы - периоды
+    totals: np.ndarray  # float64, сумма по месторождениям для каждого периода
+
+
+def format_period(year: int, sub_period: int, aggregation_step: AggregationStepEnum) -> str:
+    """Строковый ключ периода"""
+    if aggregation_step == AggregationStepEnum.MONTHLY:
+        return f"{year}-{sub_period:02d}"
+    if aggregation_step == AggregationStepEnum.QUARTERLY:
+        return f"{year}-Q{sub_period}"
+    return str(year)
+
+
+def pivot_production(rows: Sequence[Sequence[Any]], aggregation_step: AggregationStepEnum) -> ProductionPivot:
+    """
+    Построение матрицы добычи из строк запроса динамики
+
+    Строки имеют вид (field_id, field_name, year, total_amount[, month|quarter]),
+    пара (месторождение, период) встречается не более одного раза.
+    Месторождения идут в порядке первого появления, периоды отсортированы
+    по строковому ключу, отсутствующие значения равны 0.0. Итоги
+    накапливаются по месторождениям последовательно, в том же порядке,
+    поэтому совпадают с поэлементным суммированием до последнего бита.
+    """
+    if not rows:
+        empty = np.zeros((0, 0), dtype=np.float64)
+        return ProductionPivot([], [], [], empty, np.zeros(0, dtype=np.float64))
+
+    def column(index: int) -> np.ndarray:
+        # Поколоночное чтение без транспонирования всего результата
+        return np.fromiter(map(itemgetter(index), rows), dtype=np.float64, count=len(rows))
+
+    row_field_ids = column(0).astype(np.int64)
+    years = column(2).astype(np.int64)
+    amounts = column(3)
+
+    # Целочисленный код периода: год, год*100+месяц или год*10+квартал
+    if aggregation_step == AggregationStepEnum.MONTHLY:
+        multiplier = 100
+    elif aggregation_step == AggregationStepEnum.QUARTERLY:
+        multiplier = 10
+    else:
+        multiplier = 1
+    codes = years * multiplier
+    if multiplier > 1:
+        codes += column(4).astype(np.int64)
+
+    # Периоды: уникальные коды, упорядоченные по строковому ключу
+    unique_codes, period_index = np.unique(codes, return_inverse=True)
+    labels = [
+        format_period(int(code) // multiplier, int(code) % multiplier, aggregation_step)
+        for code in unique_codes
+    ]
+    label_order = sorted(range(len(labels)), key=labels.__getitem__)
+    label_rank = np.empty(len(labels), dtype=np.int64)
+    label_rank[label_order] = np.arange(len(labels))
+
+    # Месторождения: в порядке первого появления в результате запроса
+    unique_fields, first_seen, field_index = np.unique(
+        row_field_ids, return_index=True, return_inverse=True
+    )
+    field_order = np.argsort(first_seen, kind="stable")
+    field_rank = np.empty(len(unique_fields), dtype=np.int64)
+    field_rank[field_order] = np.arange(len(unique_fields))
+
+    matrix = np.zeros((len(unique_fields), len(labels)), dtype=np.float64)
+    matrix[field_rank[field_index], label_rank[period_index]] = amounts
+
+    # Последовательное сложение строк (без попарного суммирования)
+    totals = np.zeros(len(labels), dtype=np.float64)
+    for field_row in matrix:
+        totals += field_row
+
+    return ProductionPivot(
+        reporting_dates=[labels[i] for i in label_order],
+        field_ids=unique_fields[field_order].tolist(),
+        field_names=[rows[i][1] for i in first_seen[field_order].tolist()],
+        matrix=matrix,
+        totals=totals
+    )
@@ -0,0 +1,202 @@
+"""
+Сервис поддержки помесячной агрегации добычи (rollup)
+"""
+import logging
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import List, Dict, Any, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, func, and_, cast, tuple_, Date
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from backend.entities.analytics.model import ProductionMonthly
+from backend.entities.production.model import Production
+from backend.shared.enums import FluidTypeEnum
+
+logger = logging.getLogger(__name__)
+
+# Ключ агрегации: (field_id, development_object_id, fluid_type, month)
+RollupKey = Tuple[int, int, FluidTypeEnum, date]
+
+
+def month_start(value: date) -> date:
+    """Первое число месяца для даты"""
+    return value.replace(day=1)
+
+
+def next_month_start(value: date) -> date:
+    """Первое число следующего месяца"""
+    if value.month == 12:
+        return date(value.year + 1, 1, 1)
+    return date(value.year, value.month + 1, 1)
+
+
+class ProductionRollupService:
+    """Сервис для работы с помесячной агрегацией добычи"""
+
+    def __init__(self):
+        self.model = ProductionMonthly
+
+    @staticmethod
+    def _rollup_key(record: Dict[str, Any]) -> RollupKey:
+        """Ключ агрегации для записи добычи"""
+        return (
+            record["field_id"],
+            record["development_object_id"],
+            FluidTypeEnum(record["fluid_type"]),
+            month_start(record["date"])
+        )
+
+    def collect_deltas(
+        self,
+        added: List[Dict[str, Any]],
+        removed: List[Dict[str, Any]]
+    ) -> Dict[RollupKey, List]:
+        """Свертка изменений записей добычи в приращения по ключам агрегации"""
+        deltas: Dict[RollupKey, List] = defaultdict(lambda: [Decimal(0), 0])
+
+        for record in added:
+            delta = deltas[self._rollup_key(record)]
+            delta[0] += Decimal(str(record["amount"]))
+            delta[1] += 1
+
+        for record in removed:
+            delta = deltas[self._rollup_key(record)]
+            delta[0] -= Decimal(str(record["amount"]))
+            delta[1] -= 1
+
+        return {key: delta for key, delta in deltas.items() if delta[0] != 0 or delta[1] != 0}
+
+    async def apply_changes(
+        self,
+        db: AsyncSession,
+        added: List[Dict[str, Any]],
+        removed: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Применение изменений записей добычи к агрегатам
+
+        Выполняется в транзакции записи, до commit, поэтому агрегаты
+        фиксируются атомарно вместе с исходными данными.
+        """
+        await self.apply_deltas(db, self.collect_deltas(added, removed))
+
+    async def apply_deltas(
+        self,
+        db: AsyncSession,
+        deltas: Dict[RollupKey, List]
+    ) -> None:
+        """Применение приращений [сумма, число записей] по ключам агрегации"""
+        if not deltas:
+            return
+
+        rows = [
+            {
+                "field_id": key[0],
+                "development_object_id": key[1],
+                "fluid_type": key[2],
+                "month": key[3],
+                "amount": delta[0],
+                "records_count": delta[1]
+            }
+            for key, delta in deltas.items()
+        ]
+
+        stmt = pg_insert(self.model).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                self.model.field_id,
+                self.model.development_object_id,
+                self.model.fluid_type,
+                self.model.month
+            ],
+            set_={
+                "amount": self.model.amount + stmt.excluded.amount,
+                "records_count": self.model.records_count + stmt.excluded.records_count,
+                "updated_at": func.now()
+            }
+        )
+        await db.execute(stmt)
+
+        # Удаляем опустевшие агрегаты
+        if any(delta[1] < 0 for delta in deltas.values()):
+            await db.execute(
+                delete(self.model).where(
+                    and_(
+                        self.model.records_count <= 0,
+                        tuple_(
+                            self.model.field_id,
+                            self.model.development_object_id,
+                            self.model.fluid_type,
+                            self.model.month
+                        ).in_(list(deltas.keys()))
+                    )
+                )
+            )
+
+    async def rebuild(
+        self,
+        db: AsyncSession,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None
+    ) -> int:
+        """
+        Полный пересчет агрегатов из таблицы production (для бэкфиллов)
+
+        Границы периода округляются до целых месяцев. Возвращает число
+        созданных строк агрегации.
+        """
+        logger.info(f"Rebuilding production rollup: {date_from} - {date_to}")
+
+        month_column = cast(func.date_trunc("month", Production.date), Date)
+        conditions = []
+        rollup_conditions = []
+
+        if date_from:
+            conditions.append(Production.date >= month_start(date_from))
+            rollup_conditions.append(self.model.month >= month_start(date_from))
+        if date_to:
+            conditions.append(Production.date < next_month_start(date_to))
+            rollup_conditions.append(self.model.month < next_month_start(date_to))
+
+        await db.execute(delete(self.model).where(*rollup_conditions))
+
+        source = select(
+            Production.field_id,
+            Production.development_object_id,
+            Production.fluid_type,
+            month_column.label("month"),
+            func.sum(Production.amount),
+            func.count(Production.id)
+        ).where(
+            *conditions
+        ).group_by(
+            Production.field_id,
+            Production.development_object_id,
+            Production.fluid_type,
+            month_column
+        )
+
+        result = await db.execute(
+            pg_insert(self.model).from_select(
+                [
+                    self.model.field_id,
+                    self.model.development_object_id,
+                    self.model.fluid_type,
+                    self.model.month,
+                    self.model.amount,
+                    self.model.records_count
+                ],
+                source
+            )
+        )
+        await db.commit()
+
+        logger.info(f"Production rollup rebuilt: {result.rowcount} rows")
+        return result.rowcount
+
+
+# Глобальный экземпляр сервиса
+production_rollup_service = ProductionRollupService()
@@ -1,13 +1,18 @@
 """
 FastAPI роутер для аналитических операций
 """
-from typing import List, Optional
+import time
+from typing import Any, Dict, List, Optional
 from datetime import date
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Query, Request, Response, status
 
+from backend.core.responses import ModelResponseRoute
 from backend.core.logging import get_logger
-from backend.shared.dependencies import get_db
-from backend.entities.analytics.service import analytics_service
+from backend.core.timing import record_serialization
+from backend.entities.analytics.service import analytics_service, dynamics_flights
+from backend.entities.analytics.cache import dynamics_cache
+from backend.entities.analytics.encoding import DYNAMICS_BINARY_MEDIA_TYPE, encode_dynamics
+from backend.shared.content_negotiation import negotiate_media_type
 from backend.entities.analytics.schema import ProductionDynamicsResponseSchema
 from backend.shared.enums import SedimentComplexEnum, FluidTypeEnum, AggregationStepEnum
 from backend.core.exceptions import (
@@ -16,26 +21,36 @@ from backend.core.exceptions import (
     not_found_exception,
     internal_server_exception
 )
-from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = get_logger(__name__)
 
-router = APIRouter(prefix="/analytics", tags=["analytics"])
+router = APIRouter(prefix="/analytics", tags=["analytics"], route_class=ModelResponseRoute)
 
 
 @router.get(
     "/production/dynamics",
     response_model=ProductionDynamicsResponseSchema,
-    summary="Получение динамики добычи по выбранным параметрам"
+    summary="Получение динамики добычи по выбранным параметрам",
+    responses={
+        200: {
+            "content": {
+                DYNAMICS_BINARY_MEDIA_TYPE: {
+                    "schema": {"type": "string", "format": "binary"}
+                }
+            },
+            "description": "JSON по умолчанию или бинарный колоночный формат (Accept)"
+        }
+    }
 )
 async def get_production_dynamics(
+    request: Request,
+    response: Response,
     date_from: date = Query(..., description="Начальная дата (включительно)"),
     date_to: date = Query(..., description="Конечная дата (включительно)"),
     fluid_type: FluidTypeEnum = Query(FluidTypeEnum.GAS, description="Тип флюида"),
     field_ids: Optional[List[int]] = Query(None, description="Список ID месторождений"),
     sediment_complexes: Optional[List[SedimentComplexEnum]] = Query(None, description="Список комплексов отложений"),
-    aggregation_step: AggregationStepEnum = Query(AggregationStepEnum.YEARLY, description="Шаг агрегации"),
-    db: AsyncSession = Depends(get_db)
+    aggregation_step: AggregationStepEnum = Query(AggregationStepEnum.YEARLY, description="Шаг агрегации")
 ) -> ProductionDynamicsResponseSchema:
     """
     Получение динамики добычи по выбранным параметрам
@@ -49,6 +64,10 @@ async def get_production_dynamics(
     
     Возвращает данные для построения графиков с накоплением добычи
     по месторождениям для указанного флюида и комплексов.
+    
+    Формат выбирается по заголовку Accept: по умолчанию JSON, при
+    Accept: application/vnd.production-dynamics.f64 - бинарный колоночный
+    формат (заголовок JSON и матрица float64, см. analytics/encoding.py).
     """
     try:
         # Валидация параметров
@@ -57,9 +76,8 @@ async def get_production_dynamics(
         
         # Валидация enum'ов происходит автоматически через Pydantic
         
-        # Получение данных
-        result = await analytics_service.get_production_dynamics(
-            db=db,
+        # Получение данных (с использованием кэша результатов)
+        result, source = await analytics_service.get_production_dynamics_cached(
             date_from=date_from,
             date_to=date_to,
             fluid_type=fluid_type,
@@ -67,6 +85,22 @@ async def get_production_dynamics(
             sediment_complexes=sediment_complexes,
             aggregation_step=aggregation_step
         )
+        response.headers["X-Cache"] = source
+        response.headers["Vary"] = "Accept"
+        
+        media_type = negotiate_media_type(
+            request.headers.get("accept"),
+            ["application/json", DYNAMICS_BINARY_MEDIA_TYPE]
+        )
+        if media_type == DYNAMICS_BINARY_MEDIA_TYPE:
+            started = time.perf_counter()
+            content = encode_dynamics(result)
+            record_serialization(time.perf_counter() - started)
+            return Response(
+                content=content,
+                media_type=DYNAMICS_BINARY_MEDIA_TYPE,
+                headers=dict(response.headers)
+            )
         
         # Возвращаем результат даже если данных нет (пустой список)
         # Фронтенд сам обработает отсутствие данных
@@ -82,3 +116,16 @@ async def get_production_dynamics(
             raise validation_exception("Некорректный диапазон дат. Конечная дата должна быть больше или равна начальной.")
         logger.error(f"Error getting production dynamics: {str(e)}")
         raise internal_server_exception()
+
+
+@router.get(
+    "/cache/stats",
+    response_model=Dict[str, Any],
+    summary="Статистика кэша аналитики"
+)
+async def get_analytics_cache_stats() -> Dict[str, Any]:
+    """
+    Число записей, занятая память, попадания, промахи и инвалидации кэша,
+    а также число объединенных одновременных запросов (coalesced)
+    """
+    return {**dynamics_cache.stats(), "singleflight": dynamics_flights.stats()}
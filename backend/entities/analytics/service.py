@@ -2,14 +2,21 @@
 Сервис для аналитических операций
 """
 import logging
-from datetime import datetime, date
-from typing import List, Optional
+from datetime import datetime, date, timedelta
+from typing import List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, or_, cast, union_all, Date, Float, Integer
 
 from backend.entities.production.model import Production
 from backend.entities.field.model import Field
 from backend.entities.development_object.model import DevelopmentObject
+from backend.entities.analytics.model import ProductionMonthly
+from backend.entities.analytics.rollup_service import month_start, next_month_start
+from backend.entities.analytics.pivot import pivot_production
+from backend.entities.analytics.cache import dynamics_cache, normalize_params, estimate_result_size
+from backend.core.database import AsyncSessionLocal, read_engine, read_session_factory, replica_may_lag
+from backend.core.metrics import metrics_registry
+from backend.core.singleflight import SingleFlight
 from backend.entities.analytics.schema import (
     ProductionDynamicsResponseSchema,
     ProductionDynamicsMetadata,
@@ -22,6 +29,34 @@ from backend.shared.enums import SedimentComplexEnum, FluidTypeEnum, Aggregation
 
 logger = logging.getLogger(__name__)
 
+# Одновременные запросы динамики с одинаковыми параметрами выполняются один раз
+dynamics_flights = SingleFlight("analytics.dynamics")
+
+
+def _analytics_metrics():
+    """Метрики кэша динамики и объединения запросов для /metrics"""
+    stats = dynamics_cache.stats()
+    metrics = (
+        ("analytics_cache_hits_total", "counter", "Dynamics cache hits", "hits"),
+        ("analytics_cache_misses_total", "counter", "Dynamics cache misses", "misses"),
+        ("analytics_cache_evictions_total", "counter", "Dynamics cache evictions", "evictions"),
+        ("analytics_cache_invalidations_total", "counter", "Dynamics cache entries invalidated by writes", "invalidations"),
+        ("analytics_cache_hit_ratio", "gauge", "Dynamics cache hit ratio since start", "hit_ratio"),
+        ("analytics_cache_entries", "gauge", "Dynamics cache entries", "entries"),
+        ("analytics_cache_bytes", "gauge", "Estimated size of cached dynamics results", "bytes"),
+    )
+    for name, kind, documentation, key in metrics:
+        if key in stats:
+            yield name, kind, documentation, [({}, stats[key])]
+    yield (
+        "analytics_dynamics_coalesced_total", "counter",
+        "Dynamics requests served by a computation started for another request",
+        [({}, dynamics_flights.stats()["coalesced"])]
+    )
+
+
+metrics_registry.register_collector(_analytics_metrics)
+
 
 class AnalyticsService:
     """Сервис для аналитических операций"""
@@ -29,6 +64,134 @@ class AnalyticsService:
     def __init__(self):
         pass
     
+    def _build_monthly_source(
+        self,
+        date_from: date,
+        date_to: date,
+        fluid_type: FluidTypeEnum,
+        field_ids: Optional[List[int]],
+        sediment_complexes: Optional[List[SedimentComplexEnum]]
+    ):
+        """
+        Подзапрос помесячных сумм (field_id, month, amount) за период
+        
+        Месяцы, целиком попадающие в период, берутся из production_monthly.
+        Частично попадающие крайние месяцы досчитываются по таблице production,
+        поэтому результат совпадает с агрегацией по исходным данным.
+        """
+        full_from = date_from if date_from.day == 1 else next_month_start(date_from)
+        is_month_end = (date_to + timedelta(days=1)).day == 1
+        full_to = next_month_start(date_to) if is_month_end else month_start(date_to)
+        
+        sediment_subquery = None
+        if sediment_complexes:
+            # Подзапрос для фильтрации по комплексам отложений
+            # Преобразуем enum в строки для сравнения
+            sediment_values = [complex_enum.value for complex_enum in sediment_complexes]
+            sediment_subquery = select(DevelopmentObject.id).where(
+                DevelopmentObject.sediment_complex.in_(sediment_values)
+            )
+        
+        # Целые месяцы из агрегации
+        rollup_query = select(
+            ProductionMonthly.field_id,
+            ProductionMonthly.month,
+            ProductionMonthly.amount
+        ).where(
+            and_(
+                ProductionMonthly.month >= full_from,
+                ProductionMonthly.month < full_to,
+                ProductionMonthly.fluid_type == fluid_type.value
+            )
+        )
+        if field_ids:
+            rollup_query = rollup_query.where(ProductionMonthly.field_id.in_(field_ids))
+        if sediment_subquery is not None:
+            rollup_query = rollup_query.where(
+                ProductionMonthly.development_object_id.in_(sediment_subquery)
+            )
+        
+        # Неполные крайние месяцы из исходной таблицы
+        # (если целых месяцев нет, условие покрывает весь период)
+        raw_query = select(
+            Production.field_id,
+            cast(func.date_trunc('month', Production.date), Date).label("month"),
+            Production.amount
+        ).where(
+            and_(
+                Production.date >= date_from,
+                Production.date <= date_to,
+                Production.fluid_type == fluid_type.value,
+                or_(Production.date < full_from, Production.date >= full_to)
+            )
+        )
+        if field_ids:
+            raw_query = raw_query.where(Production.field_id.in_(field_ids))
+        if sediment_subquery is not None:
+            raw_query = raw_query.where(Production.development_object_id.in_(sediment_subquery))
+        
+        return union_all(rollup_query, raw_query).subquery("monthly_production")
+    
+    async def get_production_dynamics_cached(
+        self,
+        date_from: date,
+        date_to: date,
+        fluid_type: FluidTypeEnum = FluidTypeEnum.GAS,
+        field_ids: Optional[List[int]] = None,
+        sediment_complexes: Optional[List[SedimentComplexEnum]] = None,
+        aggregation_step: AggregationStepEnum = AggregationStepEnum.YEARLY
+    ) -> Tuple[ProductionDynamicsResponseSchema, str]:
+        """
+        Динамика добычи с использованием кэша результатов
+        
+        Одновременные промахи с одинаковыми нормализованными параметрами
+        объединяются: запрос к БД выполняет только первый из них.
+        Возвращает результат и источник: HIT (кэш), MISS (расчет)
+        или COALESCED (результат расчета, начатого другим запросом).
+        
+        Ключ объединения включает поколение кэша и выбранный сервер: запрос
+        после записи не присоединяется к расчету, начатому до нее, а запрос,
+        привязанный к основному серверу, - к чтению с реплики. Расчет
+        открывает собственную сессию: отмена или завершение запроса-лидера
+        не закрывает ее, пока результат ждут остальные.
+        """
+        params = normalize_params(
+            date_from, date_to, fluid_type, field_ids, sediment_complexes, aggregation_step
+        )
+        
+        cached = dynamics_cache.get(params)
+        if cached is not None:
+            return cached, "HIT"
+        
+        session_factory = read_session_factory()
+        generation = dynamics_cache.generation
+        
+        async def compute() -> ProductionDynamicsResponseSchema:
+            async with session_factory() as db:
+                # Реплика может еще не содержать недавнюю запись: такой результат не кэшируем
+                cacheable = not (db.bind is read_engine and replica_may_lag())
+                result = await self.get_production_dynamics(
+                    db=db,
+                    date_from=params.date_from,
+                    date_to=params.date_to,
+                    fluid_type=params.fluid_type,
+                    field_ids=list(params.field_ids) if params.field_ids else None,
+                    sediment_complexes=list(params.sediment_complexes) if params.sediment_complexes else None,
+                    aggregation_step=params.aggregation_step
+                )
+            if cacheable:
+                dynamics_cache.set(
+                    params,
+                    result,
+                    generation,
+                    size=estimate_result_size(len(result.fields), len(result.reporting_dates))
+                )
+            return result
+        
+        key = (params, generation, session_factory is AsyncSessionLocal)
+        result, coalesced = await dynamics_flights.do(key, compute)
+        return result, "COALESCED" if coalesced else "MISS"
+    
     async def get_production_dynamics(
         self,
         db: AsyncSession,
@@ -44,124 +207,74 @@ class AnalyticsService:
         logger.info(f"Getting production dynamics: {date_from} - {date_to}, fluid_type={fluid_type}")
         
         try:
-            # Базовый запрос
+            # Источник данных: целые месяцы читаем из помесячной агрегации,
+            # неполные месяцы на границах периода - из исходной таблицы
+            source = self._build_monthly_source(
+                date_from, date_to, fluid_type, field_ids, sediment_complexes
+            )
+            # Числа приводятся в SQL: драйвер возвращает int/float вместо Decimal,
+            # numeric -> float8 округляет так же, как float(Decimal)
+            period_year = cast(func.extract('year', source.c.month), Integer)
+            
             query = select(
-                Production.field_id,
+                source.c.field_id,
                 Field.name.label("field_name"),
-                func.extract('year', Production.date).label("year"),
-                func.sum(Production.amount).label("total_amount")
+                period_year.label("year"),
+                cast(func.sum(source.c.amount), Float).label("total_amount")
             ).select_from(
-                Production.__table__.join(Field.__table__)
-            ).where(
-                and_(
-                    Production.date >= date_from,
-                    Production.date <= date_to,
-                    Production.fluid_type == fluid_type.value
-                )
+                source.join(Field.__table__, Field.id == source.c.field_id)
             )
             
-            # Применение фильтров
-            if field_ids:
-                query = query.where(Production.field_id.in_(field_ids))
-            
-            if sediment_complexes:
-                # Подзапрос для фильтрации по комплексам отложений
-                # Преобразуем enum в строки для сравнения
-                sediment_values = [complex_enum.value for complex_enum in sediment_complexes]
-                subquery = select(DevelopmentObject.id).where(
-                    DevelopmentObject.sediment_complex.in_(sediment_values)
-                )
-                query = query.where(Production.development_object_id.in_(subquery))
-            
             # Группировка по полям и периодам
             if aggregation_step == AggregationStepEnum.YEARLY:
                 query = query.group_by(
-                    Production.field_id,
+                    source.c.field_id,
                     Field.name,
-                    func.extract('year', Production.date)
+                    period_year
                 )
             elif aggregation_step == AggregationStepEnum.MONTHLY:
+                period_month = cast(func.extract('month', source.c.month), Integer)
                 query = query.add_columns(
-                    func.extract('month', Production.date).label("month")
+                    period_month.label("month")
                 ).group_by(
-                    Production.field_id,
+                    source.c.field_id,
                     Field.name,
-                    func.extract('year', Production.date),
-                    func.extract('month', Production.date)
+                    period_year,
+                    period_month
                 )
             elif aggregation_step == AggregationStepEnum.QUARTERLY:
+                period_quarter = cast(func.extract('quarter', source.c.month), Integer)
                 query = query.add_columns(
-                    func.extract('quarter', Production.date).label("quarter")
+                    period_quarter.label("quarter")
                 ).group_by(
-                    Production.field_id,
+                    source.c.field_id,
                     Field.name,
-                    func.extract('year', Production.date),
-                    func.extract('quarter', Production.date)
+                    period_year,
+                    period_quarter
                 )
             
             # Выполнение запроса
             result = await db.execute(query)
             raw_data = result.all()
             
-            # Обработка данных
-            fields_data = {}
-            reporting_dates = set()
+            # Сведение в матрицу месторождение × период
+            pivot = pivot_production(raw_data, aggregation_step)
+            sorted_periods = pivot.reporting_dates
             
-            for row in raw_data:
-                field_id = row.field_id
-                field_name = row.field_name
-                year = int(row.year)
-                amount = float(row.total_amount)
-                
-                # Формирование ключа периода
-                if aggregation_step == AggregationStepEnum.YEARLY:
-                    period_key = str(year)
-                elif aggregation_step == AggregationStepEnum.MONTHLY:
-                    month = int(row.month)
-                    period_key = f"{year}-{month:02d}"
-                elif aggregation_step == AggregationStepEnum.QUARTERLY:
-                    quarter = int(row.quarter)
-                    period_key = f"{year}-Q{quarter}"
-                else:
-                    period_key = str(year)
-                
-                reporting_dates.add(period_key)
-                
-                if field_id not in fields_data:
-                    fields_data[field_id] = {
-                        "field_name": field_name,
-                        "periods": {}
-                    }
-                
-                fields_data[field_id]["periods"][period_key] = amount
-            
-            # Сортировка периодов
-            sorted_periods = sorted(list(reporting_dates))
-            
-            # Формирование финального ответа
-            fields_response = []
-            total_by_period = {}
-            
-            for field_id, field_info in fields_data.items():
-                production_by_period = []
-                
-                for period in sorted_periods:
-                    amount = field_info["periods"].get(period, 0.0)
-                    production_by_period.append(amount)
-                    
-                    # Суммирование для общих данных
-                    if period not in total_by_period:
-                        total_by_period[period] = 0.0
-                    total_by_period[period] += amount
-                
-                fields_response.append(FieldProductionData(
+            # Формирование финального ответа (данные уже проверены, без повторной валидации)
+            fields_response = [
+                FieldProductionData.model_construct(
                     field_id=field_id,
-                    field_name=field_info["field_name"],
+                    field_name=field_name,
                     production_by_period=production_by_period
-                ))
+                )
+                for field_id, field_name, production_by_period in zip(
+                    pivot.field_ids, pivot.field_names, pivot.matrix.tolist()
+                )
+            ]
             
             # Формирование общих данных
-            total_production = [total_by_period.get(period, 0.0) for period in sorted_periods]
+            total_production = pivot.totals.tolist()
             
             # Определение единицы измерения
             unit = UnitEnum.get_default_unit(fluid_type)
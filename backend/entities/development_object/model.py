@@ -15,7 +15,7 @@ class DevelopmentObject(BaseModel):
     
     # Основные поля
     name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
-    field_id: Mapped[int] = mapped_column(ForeignKey("fields.id"), nullable=False, index=True)
+    field_id: Mapped[int] = mapped_column(ForeignKey("fields.id", ondelete="CASCADE"), nullable=False, index=True)
     sediment_complex: Mapped[SedimentComplexEnum] = mapped_column(
         SQLEnum(SedimentComplexEnum), 
         nullable=False, 
@@ -30,11 +30,13 @@ class DevelopmentObject(BaseModel):
     fluids: Mapped[list["Fluid"]] = relationship(
         "Fluid", 
         back_populates="development_object",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
     production_records: Mapped[list["Production"]] = relationship(
         "Production", 
-        back_populates="development_object"
+        back_populates="development_object",
+        passive_deletes=True
     )
     
     def __repr__(self) -> str:
@@ -2,11 +2,12 @@
 FastAPI роутер для объектов разработки
 """
 import time
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, status
 
+from backend.core.responses import ModelResponseRoute
 from backend.core.logging import get_logger
-from backend.shared.dependencies import get_db
+from backend.shared.dependencies import get_db, get_read_db
 from backend.shared.base_schema import PaginatedResponse, BulkCreateResponse
 from backend.entities.development_object.service import development_object_service
 from backend.entities.development_object.schema import (
@@ -14,7 +15,7 @@ from backend.entities.development_object.schema import (
     DevelopmentObjectUpdateSchema,
     DevelopmentObjectResponseSchema
 )
-from backend.shared.enums import SedimentComplexEnum
+from backend.shared.enums import SedimentComplexEnum, PaginationModeEnum, CountModeEnum
 from backend.core.exceptions import (
     NotFoundError,
     ValidationError,
@@ -26,7 +27,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = get_logger(__name__)
 
-router = APIRouter(prefix="/development-objects", tags=["development-objects"])
+router = APIRouter(prefix="/development-objects", tags=["development-objects"], route_class=ModelResponseRoute)
 
 
 @router.post(
@@ -61,7 +62,10 @@ async def get_development_objects(
     name: str = None,
     limit: int = 100,
     offset: int = 0,
-    db: AsyncSession = Depends(get_db)
+    pagination: PaginationModeEnum = PaginationModeEnum.OFFSET,
+    cursor: Optional[str] = None,
+    count: CountModeEnum = CountModeEnum.EXACT,
+    db: AsyncSession = Depends(get_read_db)
 ) -> PaginatedResponse[DevelopmentObjectResponseSchema]:
     """Получение списка объектов разработки с фильтрацией и пагинацией"""
     try:
@@ -73,19 +77,26 @@ async def get_development_objects(
         if name:
             filters["name"] = name
         
-        objects, total = await development_object_service.get_multi(
+        page = await development_object_service.get_page(
             db, 
             limit=limit, 
             offset=offset, 
-            filters=filters
+            filters=filters,
+            cursor=cursor,
+            keyset=pagination == PaginationModeEnum.CURSOR,
+            count_mode=count
         )
         
         return PaginatedResponse(
-            data=[DevelopmentObjectResponseSchema.model_validate(obj) for obj in objects],
-            total=total,
+            data=[DevelopmentObjectResponseSchema.model_validate(obj) for obj in page.items],
+            total=page.total,
             limit=limit,
-            offset=offset
+            offset=offset,
+            has_more=page.has_more,
+            next_cursor=page.next_cursor
         )
+    except ValidationError as e:
+        raise validation_exception(str(e), e.details)
     except Exception as e:
         logger.error(f"Error getting development objects: {str(e)}")
         raise internal_server_exception()
@@ -98,7 +109,7 @@ async def get_development_objects(
 )
 async def get_development_object(
     obj_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> DevelopmentObjectResponseSchema:
     """Получение объекта разработки по ID"""
     try:
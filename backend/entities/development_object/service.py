@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.shared.base_service import BaseService
 from backend.entities.development_object.model import DevelopmentObject
+from backend.entities.production.cascade import cascade_delete_service
 from backend.shared.enums import SedimentComplexEnum
 
 logger = logging.getLogger(__name__)
@@ -18,6 +19,15 @@ class DevelopmentObjectService(BaseService[DevelopmentObject]):
     def __init__(self):
         super().__init__(DevelopmentObject)
     
+    async def delete(
+        self,
+        db: AsyncSession,
+        id: int
+    ) -> bool:
+        """Удаление объекта разработки с флюидами и добычей без загрузки зависимых строк в сессию"""
+        await cascade_delete_service.delete(db, self.model, id)
+        return True
+    
     async def get_by_field_id(
         self,
         db: AsyncSession,
@@ -0,0 +1,82 @@
+"""
+FastAPI роутер диагностики: состояние пула соединений, время обработки запросов,
+медленные SQL-запросы
+"""
+from typing import Any, Dict, List
+from fastapi import APIRouter, status
+
+from backend.core.database import engine, read_engine, has_replica, session_stats
+from backend.core.pool import pool_stats
+from backend.core.responses import ModelResponseRoute
+from backend.core.slow_queries import slow_query_log
+from backend.core.timing import route_timings
+
+router = APIRouter(prefix="/diagnostics", tags=["diagnostics"], route_class=ModelResponseRoute)
+
+
+@router.get(
+    "/pool",
+    response_model=Dict[str, Any],
+    summary="Статистика пула соединений с базой данных"
+)
+async def get_pool_stats() -> Dict[str, Any]:
+    """
+    Размер пула, выданные и свободные соединения, overflow, число выдач,
+    таймаутов и новых соединений, а также время ожидания свободного соединения
+    (для основного сервера и реплики, если она настроена). В sessions - число
+    сессий, выданных зависимостями, и сколько из них не понадобилось (ответ
+    без обращения к базе, например из кэша)
+    """
+    return {
+        "primary": pool_stats(engine),
+        "replica": pool_stats(read_engine) if has_replica() else None,
+        "sessions": session_stats()
+    }
+
+
+@router.get(
+    "/timing",
+    response_model=List[Dict[str, Any]],
+    summary="Время обработки запросов по маршрутам"
+)
+async def get_route_timings() -> List[Dict[str, Any]]:
+    """
+    Для каждого маршрута: число запросов и ошибок 5xx, среднее и максимальное
+    время, среднее время в БД, число SQL-запросов и строк, время сериализации.
+    Маршруты упорядочены по суммарному времени
+    """
+    return route_timings.summary()
+
+
+@router.delete(
+    "/timing",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Сброс статистики времени обработки запросов"
+)
+async def reset_route_timings() -> None:
+    """Сброс накопленной статистики по маршрутам"""
+    route_timings.reset()
+
+
+@router.get(
+    "/slow-queries",
+    response_model=List[Dict[str, Any]],
+    summary="Медленные SQL-запросы"
+)
+async def get_slow_queries() -> List[Dict[str, Any]]:
+    """
+    Запросы дольше SLOW_QUERY_THRESHOLD_MS, сгруппированные по нормализованному
+    SQL: число, суммарное и максимальное время, последние запрос API, метод
+    сервиса и параметры, а также план выполнения, если он был захвачен
+    """
+    return slow_query_log.summary()
+
+
+@router.delete(
+    "/slow-queries",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Сброс статистики медленных запросов"
+)
+async def reset_slow_queries() -> None:
+    """Сброс накопленной статистики медленных запросов"""
+    slow_query_log.reset()
@@ -4,9 +4,10 @@ FastAPI роутер для получения информации о дост
 from typing import List, Dict
 from fastapi import APIRouter
 
+from backend.core.responses import ModelResponseRoute
 from backend.shared.enums import SedimentComplexEnum, FluidTypeEnum, AggregationStepEnum, UnitEnum
 
-router = APIRouter(prefix="/enums", tags=["enums"])
+router = APIRouter(prefix="/enums", tags=["enums"], route_class=ModelResponseRoute)
 
 
 @router.get(
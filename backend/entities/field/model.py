@@ -17,19 +17,24 @@ class Field(BaseModel):
     operator: Mapped[str] = mapped_column(String(255), nullable=False)
     
     # Связи с другими сущностями
+    # Зависимые строки удаляются set-based и каскадом в БД (ON DELETE CASCADE),
+    # passive_deletes не дает ORM загружать их при удалении месторождения
     development_objects: Mapped[list["DevelopmentObject"]] = relationship(
         "DevelopmentObject", 
         back_populates="field",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
     wells: Mapped[list["Well"]] = relationship(
         "Well", 
         back_populates="field",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
     production_records: Mapped[list["Production"]] = relationship(
         "Production", 
-        back_populates="field"
+        back_populates="field",
+        passive_deletes=True
     )
 
     def __repr__(self) -> str:
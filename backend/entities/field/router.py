@@ -2,15 +2,21 @@
 FastAPI роутер для месторождений
 """
 import time
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.core.responses import FastJSONResponse, ModelResponseRoute
 from backend.core.logging import get_logger
-from backend.shared.dependencies import get_db
+from backend.shared.dependencies import get_db, get_read_db
 from backend.shared.base_schema import PaginatedResponse, BulkCreateResponse
+from backend.shared.enums import PaginationModeEnum, CountModeEnum
 from backend.entities.field.service import field_service
+from backend.entities.field.model import Field
+from backend.entities.jobs.schema import JobSchema
+from backend.entities.jobs.service import job_service
+from backend.entities.production.cascade import cascade_delete_service
 from backend.entities.field.schema import (
     FieldCreateSchema,
     FieldUpdateSchema,
@@ -28,7 +34,7 @@ from backend.core.exceptions import (
 
 logger = get_logger(__name__)
 
-router = APIRouter(prefix="/fields", tags=["fields"])
+router = APIRouter(prefix="/fields", tags=["fields"], route_class=ModelResponseRoute)
 
 
 @router.post(
@@ -64,7 +70,10 @@ async def get_fields(
     name: str = None,
     limit: int = 100,
     offset: int = 0,
-    db: AsyncSession = Depends(get_db)
+    pagination: PaginationModeEnum = PaginationModeEnum.OFFSET,
+    cursor: Optional[str] = None,
+    count: CountModeEnum = CountModeEnum.EXACT,
+    db: AsyncSession = Depends(get_read_db)
 ) -> PaginatedResponse[FieldResponseSchema]:
     """Получение списка месторождений с фильтрацией и пагинацией"""
     try:
@@ -74,19 +83,26 @@ async def get_fields(
         if name:
             filters["name"] = name
         
-        fields, total = await field_service.get_multi(
+        page = await field_service.get_page(
             db, 
             limit=limit, 
             offset=offset, 
-            filters=filters
+            filters=filters,
+            cursor=cursor,
+            keyset=pagination == PaginationModeEnum.CURSOR,
+            count_mode=count
         )
         
         return PaginatedResponse(
-            data=[FieldResponseSchema.model_validate(field) for field in fields],
-            total=total,
+            data=[FieldResponseSchema.model_validate(field) for field in page.items],
+            total=page.total,
             limit=limit,
-            offset=offset
+            offset=offset,
+            has_more=page.has_more,
+            next_cursor=page.next_cursor
         )
+    except ValidationError as e:
+        raise validation_exception(str(e), e.details)
     except Exception as e:
         logger.error(f"Error getting fields: {str(e)}")
         raise internal_server_exception()
@@ -99,7 +115,7 @@ async def get_fields(
 )
 async def get_field(
     field_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> FieldResponseSchema:
     """Получение месторождения по ID"""
     try:
@@ -145,14 +161,34 @@ async def update_field(
 @router.delete(
     "/{field_id}",
     status_code=status.HTTP_204_NO_CONTENT,
+    responses={status.HTTP_202_ACCEPTED: {"model": JobSchema, "description": "Удаление запущено в фоне"}},
     summary="Удалить месторождение"
 )
 async def delete_field(
     field_id: int,
+    background_tasks: BackgroundTasks,
+    background: bool = Query(False, description="Удалить в фоне пачками с прогрессом по /jobs/{job_id}"),
+    batch_size: int = Query(50000, ge=1, le=1000000, description="Записей добычи в пачке фонового удаления"),
+    job_id: Optional[str] = Query(None, description="ID задачи фонового удаления"),
     db: AsyncSession = Depends(get_db)
 ):
-    """Удаление месторождения"""
+    """
+    Удаление месторождения вместе с объектами разработки, скважинами,
+    флюидами и записями добычи
+    
+    Зависимые строки удаляются командами DELETE без загрузки в память.
+    Для крупных месторождений background=true возвращает 202 с задачей:
+    записи добычи удаляются пачками по batch_size в отдельных транзакциях.
+    """
     try:
+        if background:
+            await field_service.get_by_id_or_404(db, field_id)
+            # Соединение запроса возвращается в пул до запуска задачи
+            await db.close()
+            job = job_service.create("field_delete", job_id=job_id)
+            job_service.update(job, field_id=field_id)
+            background_tasks.add_task(cascade_delete_service.run_job, Field, field_id, job, batch_size)
+            return FastJSONResponse(job, status_code=status.HTTP_202_ACCEPTED)
         await field_service.delete(db, field_id)
     except NotFoundError:
         raise not_found_exception("Field not found")
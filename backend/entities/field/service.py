@@ -8,6 +8,7 @@ from sqlalchemy import select
 
 from backend.shared.base_service import BaseService
 from backend.entities.field.model import Field
+from backend.entities.production.cascade import cascade_delete_service
 from backend.core.exceptions import AlreadyExistsError
 from backend.core.logging import get_logger
 
@@ -20,6 +21,15 @@ class FieldService(BaseService[Field]):
     def __init__(self):
         super().__init__(Field)
     
+    async def delete(
+        self,
+        db: AsyncSession,
+        id: int
+    ) -> bool:
+        """Удаление месторождения со скважинами, объектами разработки и добычей без загрузки зависимых строк в сессию"""
+        await cascade_delete_service.delete(db, self.model, id)
+        return True
+    
     async def create(
         self,
         db: AsyncSession,
@@ -20,7 +20,7 @@ class Fluid(BaseModel):
         index=True
     )
     development_object_id: Mapped[int] = mapped_column(
-        ForeignKey("development_objects.id"), 
+        ForeignKey("development_objects.id", ondelete="CASCADE"), 
         nullable=False, 
         index=True
     )
@@ -33,7 +33,8 @@ class Fluid(BaseModel):
     production_records: Mapped[list["Production"]] = relationship(
         "Production", 
         back_populates="fluid",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
     
     def __repr__(self) -> str:
@@ -2,11 +2,12 @@
 FastAPI роутер для флюидов
 """
 import time
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, status
 
+from backend.core.responses import ModelResponseRoute
 from backend.core.logging import get_logger
-from backend.shared.dependencies import get_db
+from backend.shared.dependencies import get_db, get_read_db
 from backend.shared.base_schema import PaginatedResponse, BulkCreateResponse
 from backend.entities.fluid.service import fluid_service
 from backend.entities.fluid.schema import (
@@ -14,7 +15,7 @@ from backend.entities.fluid.schema import (
     FluidUpdateSchema,
     FluidResponseSchema
 )
-from backend.shared.enums import FluidTypeEnum
+from backend.shared.enums import FluidTypeEnum, PaginationModeEnum, CountModeEnum
 from backend.core.exceptions import (
     NotFoundError,
     ValidationError,
@@ -26,7 +27,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = get_logger(__name__)
 
-router = APIRouter(prefix="/fluids", tags=["fluids"])
+router = APIRouter(prefix="/fluids", tags=["fluids"], route_class=ModelResponseRoute)
 
 
 @router.post(
@@ -60,7 +61,10 @@ async def get_fluids(
     development_object_id: int = None,
     limit: int = 100,
     offset: int = 0,
-    db: AsyncSession = Depends(get_db)
+    pagination: PaginationModeEnum = PaginationModeEnum.OFFSET,
+    cursor: Optional[str] = None,
+    count: CountModeEnum = CountModeEnum.EXACT,
+    db: AsyncSession = Depends(get_read_db)
 ) -> PaginatedResponse[FluidResponseSchema]:
     """Получение списка флюидов с фильтрацией и пагинацией"""
     try:
@@ -70,19 +74,26 @@ async def get_fluids(
         if development_object_id:
             filters["development_object_id"] = development_object_id
         
-        fluids, total = await fluid_service.get_multi(
+        page = await fluid_service.get_page(
             db, 
             limit=limit, 
             offset=offset, 
-            filters=filters
+            filters=filters,
+            cursor=cursor,
+            keyset=pagination == PaginationModeEnum.CURSOR,
+            count_mode=count
         )
         
         return PaginatedResponse(
-            data=[FluidResponseSchema.model_validate(fluid) for fluid in fluids],
-            total=total,
+            data=[FluidResponseSchema.model_validate(fluid) for fluid in page.items],
+            total=page.total,
             limit=limit,
-            offset=offset
+            offset=offset,
+            has_more=page.has_more,
+            next_cursor=page.next_cursor
         )
+    except ValidationError as e:
+        raise validation_exception(str(e), e.details)
     except Exception as e:
         logger.error(f"Error getting fluids: {str(e)}")
         raise internal_server_exception()
@@ -95,7 +106,7 @@ async def get_fluids(
 )
 async def get_fluid(
     fluid_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> FluidResponseSchema:
     """Получение флюида по ID"""
     try:
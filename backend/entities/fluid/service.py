@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.shared.base_service import BaseService
 from backend.entities.fluid.model import Fluid
+from backend.entities.production.cascade import cascade_delete_service
 from backend.shared.enums import FluidTypeEnum
 
 logger = logging.getLogger(__name__)
@@ -18,6 +19,15 @@ class FluidService(BaseService[Fluid]):
     def __init__(self):
         super().__init__(Fluid)
     
+    async def delete(
+        self,
+        db: AsyncSession,
+        id: int
+    ) -> bool:
+        """Удаление флюида с записями добычи без загрузки зависимых строк в сессию"""
+        await cascade_delete_service.delete(db, self.model, id)
+        return True
+    
     async def get_by_development_object_id(
         self,
         db: AsyncSession,
@@ -0,0 +1,24 @@
+"""
+FastAPI роутер для получения состояния фоновых задач
+"""
+from fastapi import APIRouter
+
+from backend.core.responses import ModelResponseRoute
+from backend.entities.jobs.service import job_service
+from backend.entities.jobs.schema import JobSchema
+from backend.core.exceptions import not_found_exception
+
+router = APIRouter(prefix="/jobs", tags=["jobs"], route_class=ModelResponseRoute)
+
+
+@router.get(
+    "/{job_id}",
+    response_model=JobSchema,
+    summary="Получить состояние задачи"
+)
+async def get_job(job_id: str) -> JobSchema:
+    """Получение прогресса длительной операции по ID задачи"""
+    job = job_service.get(job_id)
+    if not job:
+        raise not_found_exception("Job not found")
+    return job
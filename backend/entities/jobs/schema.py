@@ -0,0 +1,21 @@
+"""
+Pydantic схемы для фоновых задач
+"""
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from backend.shared.base_schema import BaseSchema
+from backend.shared.enums import JobStatusEnum
+
+
+class JobSchema(BaseSchema):
+    """Состояние фоновой задачи"""
+    id: str
+    kind: str
+    status: JobStatusEnum = JobStatusEnum.RUNNING
+    processed: int = 0
+    total: Optional[int] = None
+    details: Dict[str, Any] = {}
+    error: Optional[str] = None
+    started_at: datetime
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,69 @@
+"""
+Сервис учета прогресса длительных операций (загрузки, удаления)
+"""
+import logging
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Optional
+
+from backend.entities.jobs.schema import JobSchema
+from backend.shared.enums import JobStatusEnum
+
+logger = logging.getLogger(__name__)
+
+
+class JobService:
+    """
+    Реестр задач в памяти процесса
+
+    Хранит ограниченное число последних задач; самые старые вытесняются.
+    """
+
+    def __init__(self, max_jobs: int = 1000):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, JobSchema]" = OrderedDict()
+
+    def create(
+        self,
+        kind: str,
+        job_id: Optional[str] = None,
+        total: Optional[int] = None
+    ) -> JobSchema:
+        """Регистрация новой задачи"""
+        job = JobSchema(
+            id=job_id or uuid.uuid4().hex,
+            kind=kind,
+            total=total,
+            started_at=datetime.now()
+        )
+        self._jobs[job.id] = job
+        self._jobs.move_to_end(job.id)
+
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+
+        logger.info(f"Job {job.id} started: {kind}")
+        return job
+
+    def get(self, job_id: str) -> Optional[JobSchema]:
+        """Получение задачи по ID"""
+        return self._jobs.get(job_id)
+
+    def update(self, job: JobSchema, processed: Optional[int] = None, **details: Any) -> None:
+        """Обновление прогресса задачи"""
+        if processed is not None:
+            job.processed = processed
+        if details:
+            job.details = {**job.details, **details}
+
+    def finish(self, job: JobSchema, error: Optional[str] = None) -> None:
+        """Завершение задачи (успешное или с ошибкой)"""
+        job.status = JobStatusEnum.FAILED if error else JobStatusEnum.COMPLETED
+        job.error = error
+        job.finished_at = datetime.now()
+        logger.info(f"Job {job.id} finished with status {job.status.value}")
+
+
+# Глобальный экземпляр сервиса
+job_service = JobService()
@@ -0,0 +1,134 @@
+"""
+Каскадное удаление месторождений, объектов разработки, скважин и флюидов
+
+Зависимые строки удаляются set-based - командами DELETE по внешнему ключу,
+без загрузки скважин, флюидов и записей добычи в сессию ORM. Явное удаление
+работает и на схемах, созданных до появления ON DELETE CASCADE во внешних
+ключах; помесячные агрегаты корректируются приращениями удаленных записей.
+"""
+import logging
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.database import AsyncSessionLocal, mark_write
+from backend.core.exceptions import NotFoundError
+from backend.entities.analytics.cache import dynamics_cache
+from backend.entities.analytics.model import ProductionMonthly
+from backend.entities.development_object.model import DevelopmentObject
+from backend.entities.field.model import Field
+from backend.entities.fluid.model import Fluid
+from backend.entities.jobs.schema import JobSchema
+from backend.entities.jobs.service import job_service
+from backend.entities.production.model import Production
+from backend.entities.production.service import production_service
+from backend.entities.well.model import Well
+
+logger = logging.getLogger(__name__)
+
+
+class CascadeDeleteService:
+    """Удаление сущности вместе с зависимыми данными без загрузки их в сессию"""
+
+    @staticmethod
+    def _plan(model: type, id: int) -> Tuple[List[Any], List[Any]]:
+        """
+        Условие отбора записей добычи сущности и команды удаления прочих
+        зависимых строк (в порядке выполнения, сама сущность - последней)
+        """
+        if model is Field:
+            return [Production.field_id == id], [
+                delete(Fluid).where(
+                    Fluid.development_object_id.in_(
+                        select(DevelopmentObject.id).where(DevelopmentObject.field_id == id)
+                    )
+                ),
+                delete(Well).where(Well.field_id == id),
+                delete(ProductionMonthly).where(ProductionMonthly.field_id == id),
+                delete(DevelopmentObject).where(DevelopmentObject.field_id == id),
+                delete(Field).where(Field.id == id),
+            ]
+        if model is DevelopmentObject:
+            return [Production.development_object_id == id], [
+                delete(Fluid).where(Fluid.development_object_id == id),
+                delete(ProductionMonthly).where(ProductionMonthly.development_object_id == id),
+                delete(DevelopmentObject).where(DevelopmentObject.id == id),
+            ]
+        if model is Well:
+            return [Production.well_id == id], [delete(Well).where(Well.id == id)]
+        if model is Fluid:
+            return [Production.fluid_id == id], [delete(Fluid).where(Fluid.id == id)]
+        raise ValueError(f"Cascade delete is not supported for {model.__name__}")
+
+    async def count_production(self, db: AsyncSession, model: type, id: int) -> int:
+        """Число записей добычи, которые будут удалены вместе с сущностью"""
+        conditions, _ = self._plan(model, id)
+        return await db.scalar(select(func.count()).select_from(Production).where(*conditions))
+
+    async def delete(
+        self,
+        db: AsyncSession,
+        model: type,
+        id: int,
+        batch_size: Optional[int] = None,
+        job: Optional[JobSchema] = None
+    ) -> int:
+        """
+        Удаление сущности с записями добычи и зависимыми строками
+
+        Без batch_size все выполняется в одной транзакции. С batch_size
+        записи добычи удаляются пачками, каждая в своей транзакции (короткие
+        блокировки, прогресс в job); сущность и прочие зависимые строки
+        удаляются последней транзакцией. Возвращает число удаленных записей добычи.
+        """
+        logger.info(f"Cascade deleting {model.__name__} with id: {id}")
+
+        exists = await db.scalar(select(model.id).where(model.id == id))
+        if exists is None:
+            raise NotFoundError(f"{model.__name__} with id {id} not found")
+
+        conditions, statements = self._plan(model, id)
+        deleted = 0
+        try:
+            if batch_size:
+                while True:
+                    count, bounds = await production_service.delete_where(db, conditions, limit=batch_size)
+                    await db.commit()
+                    dynamics_cache.invalidate_records(bounds)
+                    deleted += count
+                    if job is not None:
+                        job_service.update(job, processed=deleted)
+                    if count < batch_size:
+                        break
+                bounds = []
+            else:
+                deleted, bounds = await production_service.delete_where(db, conditions)
+
+            for statement in statements:
+                await db.execute(statement)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+        dynamics_cache.invalidate_records(bounds)
+        mark_write()
+
+        logger.info(f"{model.__name__} {id} deleted with {deleted} production records")
+        return deleted
+
+    async def run_job(self, model: type, id: int, job: JobSchema, batch_size: int) -> None:
+        """Фоновое удаление пачками в собственной сессии с учетом прогресса в job"""
+        try:
+            async with AsyncSessionLocal() as db:
+                job.total = await self.count_production(db, model, id)
+                await self.delete(db, model, id, batch_size=batch_size, job=job)
+            job_service.finish(job)
+        except Exception as e:
+            logger.error(f"Delete job {job.id} for {model.__name__} {id} failed: {str(e)}")
+            job_service.finish(job, error=str(e))
+
+
+# Глобальный экземпляр сервиса
+cascade_delete_service = CascadeDeleteService()
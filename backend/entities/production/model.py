@@ -3,34 +3,60 @@ SQLAlchemy модель для сущности Добыча (Production)
 """
 from datetime import date
 from decimal import Decimal
-from sqlalchemy import String, ForeignKey, Date, Numeric, Enum as SQLEnum
+from sqlalchemy import String, ForeignKey, Date, Index, Numeric, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from backend.core.config import settings
+from backend.core.partitioning import RangePartitionManager
 from backend.shared.base_model import BaseModel
-from backend.shared.enums import FluidTypeEnum, UnitEnum
+from backend.shared.enums import FluidTypeEnum, UnitEnum, PartitionIntervalEnum
+
+# Секционирование по дате: первичный ключ секционированной таблицы
+# обязан включать ключ секционирования, поэтому он становится (id, date)
+PARTITIONED = PartitionIntervalEnum(settings.PRODUCTION_PARTITIONING) != PartitionIntervalEnum.NONE
 
 
 class Production(BaseModel):
     """Модель записи добычи"""
     
     __tablename__ = "production"
+    __table_args__ = (
+        # Keyset-пагинация и фильтр по периоду в списках: (date, id)
+        Index("ix_production_date_id", "date", "id"),
+        # Динамика добычи и пересчет агрегатов: фильтр fluid_type + диапазон дат,
+        # группировка по field_id; INCLUDE позволяет обойтись index-only scan
+        # (development_object_id - для фильтра по комплексам отложений)
+        Index(
+            "ix_production_fluid_type_date_field",
+            "fluid_type", "date", "field_id",
+            postgresql_include=["amount", "development_object_id"]
+        ),
+        # Компактный индекс по дате для истории, записываемой в хронологическом порядке
+        Index("ix_production_date_brin", "date", postgresql_using="brin"),
+        {"postgresql_partition_by": "RANGE (date)"} if PARTITIONED else {},
+    )
+    # ORM идентифицирует записи только по id и при составном ключе таблицы
+    __mapper_args__ = {"primary_key": ["id"]} if PARTITIONED else {}
+    
+    id: Mapped[int] = mapped_column(primary_key=True, index=True, autoincrement=True)
     
     # Основные поля
-    well_id: Mapped[int] = mapped_column(ForeignKey("wells.id"), nullable=False, index=True)
-    fluid_id: Mapped[int] = mapped_column(ForeignKey("fluids.id"), nullable=False, index=True)
-    date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    well_id: Mapped[int] = mapped_column(ForeignKey("wells.id", ondelete="CASCADE"), nullable=False, index=True)
+    fluid_id: Mapped[int] = mapped_column(ForeignKey("fluids.id", ondelete="CASCADE"), nullable=False, index=True)
+    date: Mapped[date] = mapped_column(Date, nullable=False, primary_key=PARTITIONED)
     amount: Mapped[Decimal] = mapped_column(Numeric(precision=15, scale=3), nullable=False)
     unit: Mapped[UnitEnum] = mapped_column(SQLEnum(UnitEnum), nullable=False)
+    # Отдельные индексы по date и fluid_type не нужны: обе колонки ведущие
+    # в составных индексах выше
     fluid_type: Mapped[FluidTypeEnum] = mapped_column(
         SQLEnum(FluidTypeEnum), 
-        nullable=False, 
-        index=True
+        nullable=False
     )
     
     # Денормализованные поля для ускорения агрегации
-    field_id: Mapped[int] = mapped_column(ForeignKey("fields.id"), nullable=False, index=True)
+    field_id: Mapped[int] = mapped_column(ForeignKey("fields.id", ondelete="CASCADE"), nullable=False, index=True)
     development_object_id: Mapped[int] = mapped_column(
-        ForeignKey("development_objects.id"), 
+        ForeignKey("development_objects.id", ondelete="CASCADE"), 
         nullable=False, 
         index=True
     )
@@ -46,3 +72,12 @@ class Production(BaseModel):
     
     def __repr__(self) -> str:
         return f"<Production(id={self.id}, well_id={self.well_id}, date={self.date}, amount={self.amount})>"
+
+
+# Секции таблицы добычи (создаются при старте и перед записью в новый период)
+production_partitions = RangePartitionManager(
+    Production.__table__,
+    "date",
+    settings.PRODUCTION_PARTITIONING,
+    ahead=settings.PRODUCTION_PARTITIONS_AHEAD
+)
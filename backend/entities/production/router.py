@@ -2,32 +2,69 @@
 FastAPI роутер для записей добычи
 """
 import time
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import date
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, Request, status, Query
 
+from backend.core.responses import ModelResponseRoute
 from backend.core.logging import get_logger
-from backend.shared.dependencies import get_db
+from backend.shared.dependencies import get_db, get_read_db
 from backend.shared.base_schema import PaginatedResponse, BulkCreateResponse
 from backend.entities.production.service import production_service
+from backend.entities.production.upload import ProductionUploader
 from backend.entities.production.schema import (
     ProductionCreateSchema,
     ProductionUpdateSchema,
-    ProductionResponseSchema
+    ProductionBulkUpdateSchema,
+    ProductionBulkWriteResponseSchema,
+    ProductionResponseSchema,
+    ProductionUploadResponseSchema
 )
-from backend.shared.enums import FluidTypeEnum, UnitEnum
+from backend.entities.jobs.service import job_service
+from backend.shared.enums import FluidTypeEnum, BulkInsertMethodEnum, UploadFormatEnum, PaginationModeEnum, CountModeEnum
 from backend.core.exceptions import (
     NotFoundError,
     ValidationError,
+    ValueOutOfRangeError,
     not_found_exception,
     validation_exception,
+    unprocessable_exception,
     internal_server_exception
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = get_logger(__name__)
 
-router = APIRouter(prefix="/production", tags=["production"])
+router = APIRouter(prefix="/production", tags=["production"], route_class=ModelResponseRoute)
+
+
+def production_filters(
+    well_id: Optional[int] = Query(None),
+    fluid_id: Optional[int] = Query(None),
+    field_id: Optional[int] = Query(None),
+    development_object_id: Optional[int] = Query(None),
+    fluid_type: Optional[FluidTypeEnum] = Query(None),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None)
+) -> Dict[str, Any]:
+    """Фильтры записей добычи: общие для списка и массовых изменений"""
+    filters = {}
+    if well_id:
+        filters["well_id"] = well_id
+    if fluid_id:
+        filters["fluid_id"] = fluid_id
+    if field_id:
+        filters["field_id"] = field_id
+    if development_object_id:
+        filters["development_object_id"] = development_object_id
+    if fluid_type:
+        filters["fluid_type"] = fluid_type
+    # Диапазон дат (включительно) обрабатывается сервисом
+    if date_from:
+        filters["date_from"] = date_from
+    if date_to:
+        filters["date_to"] = date_to
+    return filters
 
 
 @router.post(
@@ -43,11 +80,7 @@ async def create_production_record(
     """Создание новой записи добычи"""
     try:
         # Автоматически определяем единицу измерения если не указана
-        data_dict = production_data.model_dump()
-        if 'unit' not in data_dict or data_dict['unit'] is None:
-            fluid_type = data_dict.get('fluid_type')
-            if fluid_type:
-                data_dict['unit'] = UnitEnum.get_default_unit(fluid_type)
+        data_dict = production_service.prepare_record(production_data.model_dump())
         
         production = await production_service.create(db, data_dict)
         return ProductionResponseSchema.model_validate(production)
@@ -64,56 +97,110 @@ async def create_production_record(
     summary="Получить список записей добычи"
 )
 async def get_production_records(
-    well_id: Optional[int] = Query(None),
-    fluid_id: Optional[int] = Query(None),
-    field_id: Optional[int] = Query(None),
-    development_object_id: Optional[int] = Query(None),
-    fluid_type: Optional[FluidTypeEnum] = Query(None),
-    date_from: Optional[date] = Query(None),
-    date_to: Optional[date] = Query(None),
+    filters: Dict[str, Any] = Depends(production_filters),
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
-    db: AsyncSession = Depends(get_db)
+    pagination: PaginationModeEnum = Query(
+        PaginationModeEnum.OFFSET,
+        description="Режим пагинации: offset (OFFSET/LIMIT) или cursor (по ключу date, id)"
+    ),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из next_cursor"),
+    count: CountModeEnum = Query(
+        CountModeEnum.EXACT,
+        description="Подсчет total: exact (точно), estimate (оценка планировщика) или none (без подсчета)"
+    ),
+    db: AsyncSession = Depends(get_read_db)
 ) -> PaginatedResponse[ProductionResponseSchema]:
     """Получение списка записей добычи с фильтрацией и пагинацией"""
     try:
-        # Если указан диапазон дат, используем специальный метод
-        if date_from and date_to:
-            records, total = await production_service.get_by_date_range(
-                db, date_from, date_to, limit, offset
-            )
-        else:
-            # Обычная фильтрация
-            filters = {}
-            if well_id:
-                filters["well_id"] = well_id
-            if fluid_id:
-                filters["fluid_id"] = fluid_id
-            if field_id:
-                filters["field_id"] = field_id
-            if development_object_id:
-                filters["development_object_id"] = development_object_id
-            if fluid_type:
-                filters["fluid_type"] = fluid_type
-            
-            records, total = await production_service.get_multi(
-                db, 
-                limit=limit, 
-                offset=offset, 
-                filters=filters
-            )
+        page = await production_service.get_page(
+            db, 
+            limit=limit, 
+            offset=offset, 
+            filters=filters,
+            cursor=cursor,
+            keyset=pagination == PaginationModeEnum.CURSOR,
+            count_mode=count
+        )
         
         return PaginatedResponse(
-            data=[ProductionResponseSchema.model_validate(record) for record in records],
-            total=total,
+            data=[ProductionResponseSchema.model_validate(record) for record in page.items],
+            total=page.total,
             limit=limit,
-            offset=offset
+            offset=offset,
+            has_more=page.has_more,
+            next_cursor=page.next_cursor
         )
+    except ValidationError as e:
+        raise validation_exception(str(e), e.details)
     except Exception as e:
         logger.error(f"Error getting production records: {str(e)}")
         raise internal_server_exception()
 
 
+@router.patch(
+    "/",
+    response_model=ProductionBulkWriteResponseSchema,
+    summary="Массово исправить записи добычи по фильтрам"
+)
+async def bulk_update_production_records(
+    update_data: ProductionBulkUpdateSchema,
+    filters: Dict[str, Any] = Depends(production_filters),
+    db: AsyncSession = Depends(get_db)
+) -> ProductionBulkWriteResponseSchema:
+    """
+    Исправление всех записей, отобранных фильтрами списка, одним UPDATE
+    
+    amount задает новое значение, amount_factor (больше нуля) умножает
+    текущее (например, пересчет после поверки счетчика); множитель, с которым
+    значения не помещаются в столбец, отклоняется с 422. Единица измерения
+    не меняется. Помесячные агрегаты и кэш аналитики обновляются в той же
+    операции. Без фильтров запрос отклоняется.
+    """
+    start_time = time.time()
+    
+    try:
+        updated = await production_service.bulk_update(
+            db, filters, update_data.model_dump(exclude_unset=True)
+        )
+        return ProductionBulkWriteResponseSchema(
+            affected=updated,
+            processing_time_ms=int((time.time() - start_time) * 1000)
+        )
+    except ValueOutOfRangeError as e:
+        raise unprocessable_exception(e.message, e.details)
+    except ValidationError as e:
+        raise validation_exception(str(e))
+    except Exception as e:
+        logger.error(f"Error in bulk update of production records: {str(e)}")
+        raise internal_server_exception()
+
+
+@router.delete(
+    "/",
+    response_model=ProductionBulkWriteResponseSchema,
+    summary="Массово удалить записи добычи по фильтрам"
+)
+async def bulk_delete_production_records(
+    filters: Dict[str, Any] = Depends(production_filters),
+    db: AsyncSession = Depends(get_db)
+) -> ProductionBulkWriteResponseSchema:
+    """Удаление всех записей, отобранных фильтрами списка, одним DELETE (без фильтров отклоняется)"""
+    start_time = time.time()
+    
+    try:
+        deleted = await production_service.bulk_delete(db, filters)
+        return ProductionBulkWriteResponseSchema(
+            affected=deleted,
+            processing_time_ms=int((time.time() - start_time) * 1000)
+        )
+    except ValidationError as e:
+        raise validation_exception(str(e))
+    except Exception as e:
+        logger.error(f"Error in bulk delete of production records: {str(e)}")
+        raise internal_server_exception()
+
+
 @router.get(
     "/{record_id}",
     response_model=ProductionResponseSchema,
@@ -121,7 +208,7 @@ async def get_production_records(
 )
 async def get_production_record(
     record_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> ProductionResponseSchema:
     """Получение записи добычи по ID"""
     try:
@@ -188,30 +275,30 @@ async def delete_production_record(
 )
 async def bulk_create_production_records(
     records_data: List[ProductionCreateSchema],
+    method: BulkInsertMethodEnum = Query(
+        BulkInsertMethodEnum.INSERT,
+        description="Способ вставки: orm, insert (INSERT ... RETURNING) или copy (бинарный COPY)"
+    ),
     db: AsyncSession = Depends(get_db)
 ) -> BulkCreateResponse:
     """Массовое создание записей добычи - все или никакие"""
     start_time = time.time()
     
     try:
-        records_data_dict = []
-        for record in records_data:
-            data_dict = record.model_dump()
-            # Автоматически определяем единицу измерения если не указана
-            if 'unit' not in data_dict or data_dict['unit'] is None:
-                fluid_type = data_dict.get('fluid_type')
-                if fluid_type:
-                    data_dict['unit'] = UnitEnum.get_default_unit(fluid_type)
-            records_data_dict.append(data_dict)
-            
-        created_records = await production_service.bulk_create(db, records_data_dict)
+        # Автоматически определяем единицу измерения если не указана
+        records_data_dict = [
+            production_service.prepare_record(record.model_dump())
+            for record in records_data
+        ]
+        
+        created_ids = await production_service.bulk_insert(db, records_data_dict, method=method)
         
         processing_time = int((time.time() - start_time) * 1000)
         
         return BulkCreateResponse(
-            created=len(created_records),
+            created=len(created_ids),
             total=len(records_data),
-            ids=[record.id for record in created_records],
+            ids=created_ids,
             processing_time_ms=processing_time
         )
         
@@ -221,3 +308,87 @@ async def bulk_create_production_records(
     except Exception as e:
         logger.error(f"Error in bulk create production records: {str(e)}")
         raise internal_server_exception()
+
+
+# Соответствие Content-Type формату загружаемого файла
+UPLOAD_CONTENT_TYPES = {
+    "text/csv": UploadFormatEnum.CSV,
+    "application/csv": UploadFormatEnum.CSV,
+    "application/x-ndjson": UploadFormatEnum.NDJSON,
+    "application/ndjson": UploadFormatEnum.NDJSON,
+    "application/jsonl": UploadFormatEnum.NDJSON,
+}
+
+
+@router.post(
+    "/upload",
+    response_model=ProductionUploadResponseSchema,
+    status_code=status.HTTP_201_CREATED,
+    summary="Потоковая загрузка истории добычи из CSV или NDJSON"
+)
+async def upload_production_records(
+    request: Request,
+    upload_format: Optional[UploadFormatEnum] = Query(
+        None,
+        alias="format",
+        description="Формат файла; по умолчанию определяется по Content-Type"
+    ),
+    chunk_size: int = Query(5000, ge=1, le=100000, description="Размер пачки записи"),
+    strict: bool = Query(False, description="Отменить всю загрузку при первой ошибке"),
+    method: BulkInsertMethodEnum = Query(BulkInsertMethodEnum.INSERT, description="Способ вставки пачек"),
+    max_rejects: int = Query(1000, ge=0, le=100000, description="Сколько отклоненных строк вернуть в ответе"),
+    job_id: Optional[str] = Query(None, description="ID задачи для отслеживания прогресса через /jobs/{job_id}"),
+    db: AsyncSession = Depends(get_db)
+) -> ProductionUploadResponseSchema:
+    """
+    Потоковая загрузка записей добычи
+    
+    Тело запроса - файл CSV (с заголовком из полей записи добычи) или NDJSON
+    (по одному JSON-объекту на строку). Файл читается потоком и записывается
+    пачками по chunk_size строк, поэтому память не зависит от размера файла.
+    Ошибочные строки пропускаются и перечисляются в ответе; в строгом режиме
+    первая ошибка отменяет загрузку целиком. Прогресс доступен по /jobs/{job_id}.
+    """
+    start_time = time.time()
+    
+    if upload_format is None:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+        upload_format = UPLOAD_CONTENT_TYPES.get(content_type)
+        if upload_format is None:
+            raise validation_exception(
+                "Unsupported upload format",
+                {"content_type": content_type, "supported": UploadFormatEnum.get_values()}
+            )
+    
+    job = job_service.create("production_upload", job_id=job_id)
+    uploader = ProductionUploader(
+        db,
+        job,
+        chunk_size=chunk_size,
+        strict=strict,
+        method=method,
+        max_rejects=max_rejects
+    )
+    
+    try:
+        await uploader.run(request.stream(), upload_format)
+        job_service.finish(job)
+        
+        return ProductionUploadResponseSchema(
+            job_id=job.id,
+            total_rows=uploader.total_rows,
+            inserted=uploader.inserted,
+            rejected=uploader.rejected,
+            chunks=uploader.chunks,
+            rejects=uploader.rejects,
+            processing_time_ms=int((time.time() - start_time) * 1000)
+        )
+    
+    except ValidationError as e:
+        job_service.finish(job, error=str(e))
+        logger.warning(f"Production upload {job.id} rejected: {str(e)}")
+        raise validation_exception(str(e), e.details)
+    except Exception as e:
+        job_service.finish(job, error=str(e))
+        logger.error(f"Error in production upload {job.id}: {str(e)}")
+        raise internal_server_exception()
@@ -3,8 +3,9 @@ Pydantic схемы для сущности Добыча (Production)
 """
 from datetime import date
 from decimal import Decimal
-from typing import Optional
-from backend.shared.base_schema import BaseCreateSchema, BaseUpdateSchema, BaseResponseSchema
+from typing import List, Optional
+from pydantic import ConfigDict, Field
+from backend.shared.base_schema import BaseSchema, BaseCreateSchema, BaseUpdateSchema, BaseResponseSchema
 from backend.shared.enums import FluidTypeEnum, UnitEnum
 
 
@@ -26,6 +27,27 @@ class ProductionUpdateSchema(BaseUpdateSchema):
     unit: Optional[UnitEnum] = None
 
 
+class ProductionBulkUpdateSchema(BaseUpdateSchema):
+    """
+    Схема массового исправления записей добычи, отобранных фильтрами
+
+    Единица измерения не меняется: она определяется типом флюида, а смена
+    без пересчета amount только переименовала бы значения. Лишние поля
+    (в том числе unit) отклоняются.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    amount: Optional[Decimal] = None  # Новое значение для всех записей
+    # Множитель текущего значения (взаимоисключающий с amount)
+    amount_factor: Optional[Decimal] = Field(None, gt=0)
+
+
+class ProductionBulkWriteResponseSchema(BaseSchema):
+    """Схема ответа на массовое исправление или удаление записей добычи"""
+    affected: int
+    processing_time_ms: Optional[int] = None
+
+
 class ProductionResponseSchema(BaseResponseSchema):
     """Схема для ответа с данными записи добычи"""
     well_id: int
@@ -36,3 +58,21 @@ class ProductionResponseSchema(BaseResponseSchema):
     fluid_type: FluidTypeEnum
     field_id: int
     development_object_id: int
+
+
+# Схемы для потоковой загрузки
+class UploadRejectSchema(BaseSchema):
+    """Отклоненная строка загружаемого файла"""
+    row: int
+    error: str
+
+
+class ProductionUploadResponseSchema(BaseSchema):
+    """Схема ответа на потоковую загрузку записей добычи"""
+    job_id: str
+    total_rows: int
+    inserted: int
+    rejected: int
+    chunks: int
+    rejects: List[UploadRejectSchema]
+    processing_time_ms: Optional[int] = None
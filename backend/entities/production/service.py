@@ -2,58 +2,409 @@
 Сервис для работы с записями добычи
 """
 import logging
-from typing import Optional, List, Dict, Any
+import time
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
+from sqlalchemy import Date, cast, delete, func, insert, select, text, tuple_, update
+from sqlalchemy.exc import DataError
 
+from backend.core.database import mark_write
+from backend.core.exceptions import ValidationError, ValueOutOfRangeError
+from backend.core.logging import LogPayload
+from backend.core.metrics import metrics_registry
 from backend.shared.base_service import BaseService
-from backend.entities.production.model import Production
-from backend.shared.enums import FluidTypeEnum, UnitEnum
+from backend.entities.production.model import Production, production_partitions
+from backend.entities.analytics.rollup_service import production_rollup_service
+from backend.entities.analytics.cache import dynamics_cache
+from backend.shared.enums import FluidTypeEnum, UnitEnum, BulkInsertMethodEnum, CountModeEnum
 
 logger = logging.getLogger(__name__)
 
+# Метрики массовой загрузки (скорость - rate() от счетчика строк)
+ingested_rows = metrics_registry.counter(
+    "production_ingested_rows_total",
+    "Production rows written by bulk insert",
+    ("method",)
+)
+ingest_batch_duration = metrics_registry.histogram(
+    "production_ingest_batch_duration_seconds",
+    "Bulk insert batch latency, including rollup maintenance",
+    ("method",),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+)
+
 
 class ProductionService(BaseService[Production]):
     """Сервис для работы с записями добычи"""
     
+    # Колонки, передаваемые при массовой вставке (остальные заполняет БД)
+    INSERT_COLUMNS = (
+        "well_id",
+        "fluid_id",
+        "date",
+        "amount",
+        "unit",
+        "fluid_type",
+        "field_id",
+        "development_object_id",
+    )
+    
+    # Keyset-пагинация в хронологическом порядке (индекс ix_production_date_id)
+    cursor_columns = ("date", "id")
+    
     def __init__(self):
         super().__init__(Production)
     
-    async def get_by_date_range(
+    def _build_conditions(self, filters: Optional[Dict[str, Any]]) -> List[Any]:
+        """Условия WHERE с поддержкой диапазона дат (date_from, date_to включительно)"""
+        filters = dict(filters or {})
+        date_from = filters.pop("date_from", None)
+        date_to = filters.pop("date_to", None)
+        
+        conditions = super()._build_conditions(filters)
+        if date_from is not None:
+            conditions.append(self.model.date >= date_from)
+        if date_to is not None:
+            conditions.append(self.model.date <= date_to)
+        return conditions
+    
+    @staticmethod
+    def prepare_record(data_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """Подготовка записи к вставке: единица измерения по типу флюида"""
+        if data_dict.get('unit') is None:
+            fluid_type = data_dict.get('fluid_type')
+            if fluid_type:
+                data_dict['unit'] = UnitEnum.get_default_unit(fluid_type)
+        return data_dict
+    
+    async def _before_commit(
         self,
         db: AsyncSession,
-        date_from: date,
-        date_to: date,
-        limit: int = 100,
-        offset: int = 0
-    ) -> tuple[List[Production], int]:
-        """Получение записей добычи за период"""
-        query = select(self.model).where(
-            and_(
-                self.model.date >= date_from,
-                self.model.date <= date_to
-            )
+        added: List[Dict[str, Any]],
+        removed: List[Dict[str, Any]]
+    ) -> None:
+        """Поддержка помесячной агрегации в той же транзакции"""
+        # Секция для новой даты должна существовать до сброса изменений в БД
+        await production_partitions.ensure_for_dates(db.bind, (record["date"] for record in added))
+        await production_rollup_service.apply_changes(db, added, removed)
+    
+    async def _after_commit(
+        self,
+        added: List[Dict[str, Any]],
+        removed: List[Dict[str, Any]]
+    ) -> None:
+        """Сброс закэшированной аналитики, затронутой изменением"""
+        dynamics_cache.invalidate_records([*added, *removed])
+    
+    async def bulk_insert(
+        self,
+        db: AsyncSession,
+        records: List[Dict[str, Any]],
+        method: BulkInsertMethodEnum = BulkInsertMethodEnum.INSERT,
+        commit: bool = True
+    ) -> List[int]:
+        """
+        Высокопроизводительная массовая вставка записей добычи - все или никакие
+        
+        В отличие от bulk_create не создает ORM-объекты и возвращает только ID
+        в порядке входных записей. При commit=False транзакция остается открытой
+        (для загрузки несколькими пачками в одной транзакции); в этом случае
+        вызывающий код сбрасывает кэш аналитики после своего commit.
+        """
+        logger.info(f"Bulk inserting {len(records)} production records, method={method.value}")
+        
+        if not records:
+            return []
+        
+        started = time.perf_counter()
+        try:
+            await production_partitions.ensure_for_dates(db.bind, (record["date"] for record in records))
+            
+            if method == BulkInsertMethodEnum.COPY:
+                ids = await self._copy_records(db, records)
+            elif method == BulkInsertMethodEnum.INSERT:
+                # insertmanyvalues: несколько многострочных INSERT ... RETURNING
+                result = await db.execute(
+                    insert(self.model).returning(self.model.id, sort_by_parameter_order=True),
+                    [{column: record[column] for column in self.INSERT_COLUMNS} for record in records]
+                )
+                ids = list(result.scalars().all())
+            else:
+                objects = [self.model(**record) for record in records]
+                db.add_all(objects)
+                await db.flush()
+                ids = [obj.id for obj in objects]
+            
+            await self._before_commit(db, records, [])
+            if commit:
+                await db.commit()
+                await self._after_commit(records, [])
+            
+            ingested_rows.labels(method.value).inc(len(ids))
+            ingest_batch_duration.labels(method.value).observe(time.perf_counter() - started)
+            logger.info(f"Bulk insert successful: created {len(ids)} production records")
+            return ids
+        
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Bulk insert failed for production records: {str(e)}")
+            raise
+    
+    async def _copy_records(
+        self,
+        db: AsyncSession,
+        records: List[Dict[str, Any]]
+    ) -> List[int]:
+        """
+        Вставка через бинарный COPY asyncpg
+        
+        COPY не умеет возвращать значения, поэтому ID заранее выделяются
+        из последовательности одним запросом и передаются явно.
+        """
+        table_name = self.model.__tablename__
+        
+        result = await db.execute(
+            text(
+                "SELECT nextval(pg_get_serial_sequence(:table_name, 'id')) "
+                "FROM generate_series(1, :count)"
+            ),
+            {"table_name": table_name, "count": len(records)}
         )
+        ids = list(result.scalars().all())
         
-        count_query = select(func.count(self.model.id)).where(
-            and_(
-                self.model.date >= date_from,
-                self.model.date <= date_to
+        # Enum-колонки хранятся в БД по именам элементов
+        rows = [
+            (
+                record_id,
+                record["well_id"],
+                record["fluid_id"],
+                record["date"],
+                record["amount"],
+                UnitEnum(record["unit"]).name,
+                FluidTypeEnum(record["fluid_type"]).name,
+                record["field_id"],
+                record["development_object_id"],
             )
+            for record_id, record in zip(ids, records)
+        ]
+        
+        # COPY выполняется на соединении сессии - в той же транзакции
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            table_name,
+            records=rows,
+            columns=["id", *self.INSERT_COLUMNS]
+        )
+        
+        return ids
+    
+    async def delete_where(
+        self,
+        db: AsyncSession,
+        conditions: List[Any],
+        limit: Optional[int] = None
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Удаление записей добычи по условиям одним DELETE без загрузки в сессию
+        
+        Удаленные строки возвращаются через RETURNING в CTE и сворачиваются
+        по ключам агрегации прямо в запросе; приращения применяются к
+        помесячным агрегатам в той же транзакции. limit ограничивает число
+        удаляемых строк (удаление пачками). Commit выполняет вызывающий код.
+        
+        Возвращает число удаленных строк и границы дат по (флюид,
+        месторождение) для сброса кэша аналитики после commit.
+        """
+        stmt = delete(self.model)
+        if limit is None:
+            stmt = stmt.where(*conditions)
+        else:
+            # Ключ (id, date) совпадает с первичным ключом секционированной таблицы
+            batch = select(self.model.id, self.model.date).where(*conditions).limit(limit)
+            stmt = stmt.where(tuple_(self.model.id, self.model.date).in_(batch))
+        
+        removed = stmt.returning(
+            self.model.field_id,
+            self.model.development_object_id,
+            self.model.fluid_type,
+            self.model.date,
+            self.model.amount
+        ).cte("removed")
+        return await self._apply_returned(db, removed, -removed.c.amount, -1)
+    
+    async def _apply_returned(
+        self,
+        db: AsyncSession,
+        changed: Any,
+        amount_delta: Any,
+        count_delta: int
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Выполнение DELETE/UPDATE ... RETURNING (CTE changed) со сверткой
+        измененных строк по ключам агрегации и применением приращений
+        
+        amount_delta - выражение изменения суммы для строки, count_delta -
+        изменение числа записей на строку. Возвращает число затронутых строк
+        и границы дат изменившихся агрегатов для сброса кэша аналитики.
+        """
+        month = cast(func.date_trunc("month", changed.c.date), Date)
+        keys = (changed.c.field_id, changed.c.development_object_id, changed.c.fluid_type, month)
+        result = await db.execute(
+            select(
+                *keys,
+                func.sum(amount_delta),
+                func.count(),
+                func.min(changed.c.date),
+                func.max(changed.c.date)
+            ).group_by(*keys)
         )
         
-        # Пагинация
-        query = query.offset(offset).limit(limit)
+        deltas = {}
+        bounds = []
+        affected = 0
+        for field_id, development_object_id, fluid_type, month_value, amount, count, low, high in result:
+            affected += count
+            if amount == 0 and count_delta == 0:
+                continue
+            deltas[(field_id, development_object_id, FluidTypeEnum(fluid_type), month_value)] = [amount, count * count_delta]
+            bounds.append({"fluid_type": fluid_type, "field_id": field_id, "date": low})
+            bounds.append({"fluid_type": fluid_type, "field_id": field_id, "date": high})
+        
+        await production_rollup_service.apply_deltas(db, deltas)
+        return affected, bounds
+    
+    def _require_conditions(self, filters: Optional[Dict[str, Any]]) -> List[Any]:
+        """Условия массового изменения: без фильтров затронулась бы вся таблица"""
+        conditions = self._build_conditions(filters)
+        if not conditions:
+            raise ValidationError("At least one filter is required for bulk changes")
+        return conditions
+    
+    async def bulk_update(
+        self,
+        db: AsyncSession,
+        filters: Dict[str, Any],
+        update_data: Dict[str, Any]
+    ) -> int:
+        """
+        Массовое исправление записей, отобранных фильтрами списка, одним UPDATE
+        
+        amount задает новое значение, amount_factor умножает текущее
+        (пересчет после поверки счетчика). Множитель, с которым значение
+        не помещается в Numeric столбца, отклоняется (ValueOutOfRangeError)
+        до изменения. Прежние значения читаются в том же запросе (UPDATE ...
+        FROM с блокировкой строк), поэтому агрегаты корректируются точной
+        разницей. Возвращает число измененных записей.
+        """
+        logger.info("Bulk updating production records, filters: %s, data: %s", filters, LogPayload(update_data))
+        
+        conditions = self._require_conditions(filters)
+        amount = update_data.get("amount")
+        amount_factor = update_data.get("amount_factor")
+        if amount is not None and amount_factor is not None:
+            raise ValidationError("amount and amount_factor are mutually exclusive")
+        
+        if amount is None and amount_factor is None:
+            raise ValidationError("No data provided for update")
+        if amount_factor is not None:
+            if amount_factor <= 0:
+                raise ValidationError("amount_factor must be positive")
+            await self._check_amount_factor(db, conditions, amount_factor)
+            values = {"amount": self.model.amount * amount_factor}
+        else:
+            values = {"amount": amount}
+        
+        previous = select(
+            self.model.id, self.model.date, self.model.amount
+        ).where(*conditions).with_for_update().subquery("previous")
+        changed = update(self.model).where(
+            self.model.id == previous.c.id,
+            self.model.date == previous.c.date
+        ).values(values).returning(
+            self.model.field_id,
+            self.model.development_object_id,
+            self.model.fluid_type,
+            self.model.date,
+            self.model.amount,
+            previous.c.amount.label("previous_amount")
+        ).cte("changed")
+        
+        try:
+            updated, bounds = await self._apply_returned(
+                db, changed, changed.c.amount - changed.c.previous_amount, 0
+            )
+            await db.commit()
+        except DataError as e:
+            await db.rollback()
+            # Переполнение Numeric: слишком большое amount или значения выросли после проверки множителя
+            raise ValueOutOfRangeError(f"Updated amount is out of range: {e.orig}")
+        except Exception:
+            await db.rollback()
+            raise
         
-        # Выполнение запросов
-        result = await db.execute(query)
-        items = result.scalars().all()
+        dynamics_cache.invalidate_records(bounds)
+        mark_write()
+        logger.info(f"Bulk update successful: updated {updated} production records")
+        return updated
+    
+    async def _check_amount_factor(
+        self,
+        db: AsyncSession,
+        conditions: List[Any],
+        amount_factor: Decimal
+    ) -> None:
+        """Проверка, что умноженные значения помещаются в Numeric(precision, scale) столбца amount"""
+        column_type = self.model.__table__.c.amount.type
+        limit = Decimal(10) ** (column_type.precision - column_type.scale)
+        largest = await db.scalar(select(func.max(func.abs(self.model.amount))).where(*conditions))
+        if largest is None:
+            return
+        # PostgreSQL округляет до scale знаков половиной от нуля
+        result = (largest * amount_factor).quantize(Decimal(1).scaleb(-column_type.scale), ROUND_HALF_UP)
+        if result >= limit:
+            raise ValueOutOfRangeError(
+                f"amount_factor {amount_factor} makes amount {result} exceed the column limit {limit}",
+                details={"max_amount": str(largest), "limit": str(limit)}
+            )
+    
+    async def bulk_delete(
+        self,
+        db: AsyncSession,
+        filters: Dict[str, Any]
+    ) -> int:
+        """Удаление записей, отобранных фильтрами списка, одним DELETE"""
+        logger.info(f"Bulk deleting production records, filters: {filters}")
         
-        count_result = await db.execute(count_query)
-        total = count_result.scalar()
+        conditions = self._require_conditions(filters)
+        try:
+            deleted, bounds = await self.delete_where(db, conditions)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
         
-        return list(items), total
+        dynamics_cache.invalidate_records(bounds)
+        mark_write()
+        logger.info(f"Bulk delete successful: deleted {deleted} production records")
+        return deleted
+    
+    async def get_by_date_range(
+        self,
+        db: AsyncSession,
+        date_from: date,
+        date_to: date,
+        limit: int = 100,
+        offset: int = 0,
+        count_mode: CountModeEnum = CountModeEnum.EXACT
+    ) -> tuple[List[Production], Optional[int]]:
+        """Получение записей добычи за период"""
+        filters = {"date_from": date_from, "date_to": date_to}
+        return await self.get_multi(
+            db, limit=limit, offset=offset, filters=filters, count_mode=count_mode
+        )
     
     async def get_by_well_id(
         self,
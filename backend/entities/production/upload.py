@@ -0,0 +1,301 @@
+"""
+Потоковая загрузка истории добычи из CSV и NDJSON файлов
+"""
+import csv
+import json
+import logging
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.exceptions import ValidationError
+from backend.entities.analytics.cache import dynamics_cache, build_write_footprint, merge_footprints
+from backend.entities.jobs.schema import JobSchema
+from backend.entities.jobs.service import job_service
+from backend.entities.production.schema import ProductionCreateSchema, UploadRejectSchema
+from backend.entities.production.service import production_service
+from backend.shared.enums import BulkInsertMethodEnum, UploadFormatEnum
+
+logger = logging.getLogger(__name__)
+
+# Максимальная длина строки файла в байтах - защита от неограниченного роста буфера
+MAX_LINE_BYTES = 64 * 1024
+
+
+def _check_line_size(size: int) -> None:
+    if size > MAX_LINE_BYTES:
+        raise ValidationError(f"Line exceeds {MAX_LINE_BYTES} bytes")
+
+
+async def iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Построчное чтение потока байтов в UTF-8 (с BOM или без)
+
+    Поток делится на строки до декодирования: байт перевода строки не
+    встречается внутри многобайтовых символов UTF-8, а длина строки
+    ограничивается в байтах.
+    """
+    buffer = b""
+    encoding = "utf-8-sig"  # BOM возможен только в начале потока
+
+    async for chunk in stream:
+        buffer += chunk
+        lines = buffer.split(b"\n")
+        buffer = lines.pop()
+        _check_line_size(len(buffer))
+        for line in lines:
+            _check_line_size(len(line))
+            yield line.decode(encoding).rstrip("\r")
+            encoding = "utf-8"
+
+    if buffer.strip():
+        yield buffer.decode(encoding).rstrip("\r")
+
+
+class _LineFeed:
+    """
+    Источник строк для csv.reader, пополняемый по мере чтения потока
+
+    Один csv.reader читает все строки файла, поэтому поле в кавычках может
+    содержать перевод строки. Запись передается читателю только целиком
+    (после закрытия всех кавычек), и он никогда не упирается в пустую очередь.
+    """
+
+    def __init__(self):
+        self.lines: Deque[str] = deque()
+        self.quotes = 0
+        self.size = 0  # Байт в незавершенной многострочной записи
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+    def push(self, line: str) -> bool:
+        """Добавление строки; True - запись завершена и ее можно разобрать"""
+        if self.lines:
+            # Запись продолжается: ограничивается ее общий размер в байтах
+            if len(self.lines) == 1:
+                self.size = len(self.lines[0].encode("utf-8"))
+            self.size += len(line.encode("utf-8")) + 1
+            _check_line_size(self.size)
+        self.lines.append(line + "\n")
+        # Экранированная кавычка ("") не меняет четность
+        self.quotes += line.count('"')
+        if self.quotes % 2:
+            return False
+        self.quotes = 0
+        return True
+
+
+async def iter_raw_rows(
+    stream: AsyncIterator[bytes],
+    upload_format: UploadFormatEnum
+) -> AsyncIterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Разбор потока в сырые записи
+
+    Возвращает кортежи (номер строки данных, запись, ошибка разбора).
+    Нумерация строк данных начинается с 1 и не учитывает заголовок CSV;
+    запись CSV с переводами строк в кавычках считается одной строкой данных.
+    """
+    header: Optional[List[str]] = None
+    row_number = 0
+    feed = _LineFeed()
+    reader = csv.reader(feed)
+
+    async for line in iter_lines(stream):
+        if not feed.lines and not line.strip():
+            continue
+
+        if upload_format == UploadFormatEnum.CSV:
+            if not feed.push(line):
+                continue
+            values = next(reader)
+
+            if header is None:
+                header = [column.strip() for column in values]
+                continue
+
+            row_number += 1
+            if len(values) != len(header):
+                yield row_number, None, f"Expected {len(header)} columns, got {len(values)}"
+                continue
+            # Пустые ячейки CSV трактуются как отсутствующие значения
+            yield row_number, {
+                column: (value if value != "" else None)
+                for column, value in zip(header, values)
+            }, None
+        else:
+            row_number += 1
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row_number, None, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield row_number, None, "Row must be a JSON object"
+                continue
+            yield row_number, record, None
+
+    if feed.lines:
+        yield row_number + 1, None, "Unterminated quoted field"
+
+
+def _is_row_error(error: Exception) -> bool:
+    """Вызвана ли ошибка записи данными строк (SQLSTATE классов 22 и 23)"""
+    if isinstance(error, (IntegrityError, DataError)):
+        return True
+    # COPY выполняется драйвером напрямую: исключения asyncpg не обернуты
+    return str(getattr(error, "sqlstate", "") or "")[:2] in ("22", "23")
+
+
+def _format_validation_error(error: PydanticValidationError) -> str:
+    """Краткое описание ошибок валидации строки"""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+        for item in error.errors()
+    )
+
+
+class ProductionUploader:
+    """
+    Загрузка записей добычи пачками фиксированного размера
+
+    В памяти одновременно находится не более одной пачки записей и
+    ограниченный список отклоненных строк. В обычном режиме каждая пачка
+    фиксируется отдельно, а ошибочные строки пропускаются. В строгом режиме
+    весь файл загружается в одной транзакции и первая ошибка отменяет загрузку.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        job: JobSchema,
+        chunk_size: int = 5000,
+        strict: bool = False,
+        method: BulkInsertMethodEnum = BulkInsertMethodEnum.INSERT,
+        max_rejects: int = 1000
+    ):
+        self.db = db
+        self.job = job
+        self.chunk_size = chunk_size
+        self.strict = strict
+        self.method = method
+        self.max_rejects = max_rejects
+
+        self.total_rows = 0
+        self.inserted = 0
+        self.rejected = 0
+        self.chunks = 0
+        self.rejects: List[UploadRejectSchema] = []
+        # След записи строгого режима - кэш сбрасывается после общего commit
+        self.footprint = {}
+
+    def _reject(self, row: int, error: str) -> None:
+        """Учет отклоненной строки"""
+        if self.strict:
+            raise ValidationError(
+                f"Error at row {row}: {error}",
+                {"row": row, "error": error}
+            )
+        self.rejected += 1
+        if len(self.rejects) < self.max_rejects:
+            self.rejects.append(UploadRejectSchema(row=row, error=error))
+
+    async def _insert(self, chunk: List[Tuple[int, Dict[str, Any]]]) -> None:
+        """
+        Запись части пачки; при ошибке данных - поиск ошибочных строк
+
+        В обычном режиме пачка, отклоненная БД из-за данных (например,
+        несуществующий well_id), делится пополам и записывается по частям,
+        пока ошибочные строки не останутся по одной: отклоняются только
+        они. Прочие ошибки (например, потеря соединения) отклоняют всю часть.
+        """
+        records = [record for _, record in chunk]
+        try:
+            await production_service.bulk_insert(
+                self.db, records, method=self.method, commit=not self.strict
+            )
+        except Exception as e:
+            if self.strict:
+                raise ValidationError(
+                    f"Error in rows {chunk[0][0]}-{chunk[-1][0]}: {str(e)}",
+                    {"rows": [chunk[0][0], chunk[-1][0]]}
+                )
+            if len(chunk) > 1 and _is_row_error(e):
+                middle = len(chunk) // 2
+                await self._insert(chunk[:middle])
+                await self._insert(chunk[middle:])
+                return
+            for row, _ in chunk:
+                self._reject(row, f"Insert failed: {str(e)}")
+            return
+
+        self.inserted += len(records)
+        if self.strict:
+            merge_footprints(self.footprint, build_write_footprint(records))
+
+    async def _flush(self, chunk: List[Tuple[int, Dict[str, Any]]]) -> None:
+        """Запись пачки записей одним массовым INSERT/COPY"""
+        if not chunk:
+            return
+
+        await self._insert(chunk)
+
+        self.chunks += 1
+        job_service.update(
+            self.job,
+            processed=self.total_rows,
+            inserted=self.inserted,
+            rejected=self.rejected,
+            chunks=self.chunks
+        )
+        logger.info(
+            f"Upload {self.job.id}: chunk {self.chunks} done, "
+            f"rows={self.total_rows}, inserted={self.inserted}, rejected={self.rejected}"
+        )
+
+    async def run(self, stream: AsyncIterator[bytes], upload_format: UploadFormatEnum) -> None:
+        """Чтение, валидация и запись потока"""
+        try:
+            await self._consume(stream, upload_format)
+        except Exception:
+            # В строгом режиме отменяем все ранее записанные пачки
+            await self.db.rollback()
+            raise
+
+    async def _consume(self, stream: AsyncIterator[bytes], upload_format: UploadFormatEnum) -> None:
+        """Основной цикл загрузки"""
+        chunk: List[Tuple[int, Dict[str, Any]]] = []
+
+        async for row, raw_record, parse_error in iter_raw_rows(stream, upload_format):
+            self.total_rows = row
+
+            if parse_error:
+                self._reject(row, parse_error)
+                continue
+
+            try:
+                record = ProductionCreateSchema.model_validate(raw_record).model_dump()
+            except PydanticValidationError as e:
+                self._reject(row, _format_validation_error(e))
+                continue
+
+            chunk.append((row, production_service.prepare_record(record)))
+
+            if len(chunk) >= self.chunk_size:
+                await self._flush(chunk)
+                chunk = []
+
+        await self._flush(chunk)
+
+        if self.strict:
+            await self.db.commit()
+            dynamics_cache.invalidate_footprint(self.footprint)
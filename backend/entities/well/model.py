@@ -15,7 +15,7 @@ class Well(BaseModel):
     
     # Основные поля
     name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
-    field_id: Mapped[int] = mapped_column(ForeignKey("fields.id"), nullable=False, index=True)
+    field_id: Mapped[int] = mapped_column(ForeignKey("fields.id", ondelete="CASCADE"), nullable=False, index=True)
     fluid_type: Mapped[FluidTypeEnum] = mapped_column(
         SQLEnum(FluidTypeEnum), 
         nullable=False, 
@@ -30,7 +30,8 @@ class Well(BaseModel):
     production_records: Mapped[list["Production"]] = relationship(
         "Production", 
         back_populates="well",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
     
     def __repr__(self) -> str:
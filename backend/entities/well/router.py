@@ -2,11 +2,12 @@
 FastAPI роутер для скважин
 """
 import time
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, status
 
+from backend.core.responses import ModelResponseRoute
 from backend.core.logging import get_logger
-from backend.shared.dependencies import get_db
+from backend.shared.dependencies import get_db, get_read_db
 from backend.shared.base_schema import PaginatedResponse, BulkCreateResponse
 from backend.entities.well.service import well_service
 from backend.entities.well.schema import (
@@ -14,7 +15,7 @@ from backend.entities.well.schema import (
     WellUpdateSchema,
     WellResponseSchema
 )
-from backend.shared.enums import FluidTypeEnum
+from backend.shared.enums import FluidTypeEnum, PaginationModeEnum, CountModeEnum
 from backend.core.exceptions import (
     NotFoundError,
     ValidationError,
@@ -26,7 +27,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = get_logger(__name__)
 
-router = APIRouter(prefix="/wells", tags=["wells"])
+router = APIRouter(prefix="/wells", tags=["wells"], route_class=ModelResponseRoute)
 
 
 @router.post(
@@ -61,7 +62,10 @@ async def get_wells(
     name: str = None,
     limit: int = 100,
     offset: int = 0,
-    db: AsyncSession = Depends(get_db)
+    pagination: PaginationModeEnum = PaginationModeEnum.OFFSET,
+    cursor: Optional[str] = None,
+    count: CountModeEnum = CountModeEnum.EXACT,
+    db: AsyncSession = Depends(get_read_db)
 ) -> PaginatedResponse[WellResponseSchema]:
     """Получение списка скважин с фильтрацией и пагинацией"""
     try:
@@ -73,19 +77,26 @@ async def get_wells(
         if name:
             filters["name"] = name
         
-        wells, total = await well_service.get_multi(
+        page = await well_service.get_page(
             db, 
             limit=limit, 
             offset=offset, 
-            filters=filters
+            filters=filters,
+            cursor=cursor,
+            keyset=pagination == PaginationModeEnum.CURSOR,
+            count_mode=count
         )
         
         return PaginatedResponse(
-            data=[WellResponseSchema.model_validate(well) for well in wells],
-            total=total,
+            data=[WellResponseSchema.model_validate(well) for well in page.items],
+            total=page.total,
             limit=limit,
-            offset=offset
+            offset=offset,
+            has_more=page.has_more,
+            next_cursor=page.next_cursor
         )
+    except ValidationError as e:
+        raise validation_exception(str(e), e.details)
     except Exception as e:
         logger.error(f"Error getting wells: {str(e)}")
         raise internal_server_exception()
@@ -98,7 +109,7 @@ async def get_wells(
 )
 async def get_well(
     well_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> WellResponseSchema:
     """Получение скважины по ID"""
     try:
@@ -45,9 +45,11 @@ T = TypeVar('T')
 class PaginatedResponse(BaseSchema, Generic[T]):
     """Схема для пагинированных ответов"""
     data: List[T]
-    total: int
+    total: Optional[int]  # None при count=none, оценка при count=estimate
     limit: int
     offset: int
+    has_more: Optional[bool] = None  # Есть ли записи после текущей страницы
+    next_cursor: Optional[str] = None  # Курсор следующей страницы (режим cursor)
 
 
 class BulkCreateResponse(BaseSchema):
@@ -1,15 +1,18 @@
 """
 Базовые классы для сервисов
 """
-from typing import Generic, TypeVar, Type, List, Optional, Dict, Any
+import json
+from typing import Generic, TypeVar, Type, List, Optional, Dict, Any, NamedTuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, inspect, text, tuple_
 from sqlalchemy.orm import selectinload
 
 from backend.core.exceptions import NotFoundError, ValidationError
-from backend.core.logging import get_logger
+from backend.core.logging import LogPayload, get_logger
 from backend.shared.base_model import BaseModel
+from backend.shared.enums import CountModeEnum
+from backend.shared.pagination import encode_cursor, decode_cursor
 
 logger = get_logger(__name__)
 
@@ -17,12 +20,58 @@ logger = get_logger(__name__)
 ModelType = TypeVar("ModelType", bound=BaseModel)
 
 
+class Page(NamedTuple):
+    """Страница списка записей"""
+    items: List[Any]
+    total: Optional[int]
+    has_more: bool = False
+    next_cursor: Optional[str] = None
+
+
 class BaseService(Generic[ModelType]):
     """Базовый сервис для CRUD операций"""
     
+    # Колонки ключа keyset-пагинации (уникальная комбинация, покрытая индексом)
+    cursor_columns: tuple[str, ...] = ("id",)
+    
     def __init__(self, model: Type[ModelType]):
         self.model = model
     
+    def _snapshot(self, db_obj: ModelType) -> Dict[str, Any]:
+        """Снимок значений колонок объекта"""
+        return {
+            attr.key: getattr(db_obj, attr.key)
+            for attr in inspect(db_obj).mapper.column_attrs
+        }
+    
+    async def _before_commit(
+        self,
+        db: AsyncSession,
+        added: List[Dict[str, Any]],
+        removed: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Хук, вызываемый внутри транзакции записи перед commit
+        
+        added - данные добавленных строк, removed - снимки удаленных строк.
+        Обновление передается как пара: старый снимок в removed, новый в added.
+        Переопределяется в наследниках для поддержки производных данных.
+        """
+        pass
+    
+    async def _after_commit(
+        self,
+        added: List[Dict[str, Any]],
+        removed: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Хук, вызываемый после успешного commit записи
+        
+        Аргументы те же, что у _before_commit. Используется для действий,
+        которые нельзя выполнять до фиксации (например, сброс кэшей).
+        """
+        pass
+    
     async def create(
         self,
         db: AsyncSession,
@@ -30,11 +79,13 @@ class BaseService(Generic[ModelType]):
         **kwargs
     ) -> ModelType:
         """Создание новой записи"""
-        logger.info(f"Creating new record for {self.model.__name__} with data: {obj_data}")
+        logger.info("Creating new record for %s with data: %s", self.model.__name__, LogPayload(obj_data))
         
         db_obj = self.model(**obj_data)
         db.add(db_obj)
+        await self._before_commit(db, [obj_data], [])
         await db.commit()
+        await self._after_commit([obj_data], [])
         await db.refresh(db_obj)
         
         logger.info(f"Record created successfully for {self.model.__name__} with id: {db_obj.id}")
@@ -70,46 +121,140 @@ class BaseService(Generic[ModelType]):
             raise NotFoundError(f"{self.model.__name__} with id {id} not found")
         return obj
     
+    def _build_conditions(self, filters: Optional[Dict[str, Any]]) -> List[Any]:
+        """Условия WHERE по словарю фильтров (списки - через IN)"""
+        conditions = []
+        if filters:
+            for field, value in filters.items():
+                if hasattr(self.model, field) and value is not None:
+                    attr = getattr(self.model, field)
+                    if isinstance(value, list):
+                        conditions.append(attr.in_(value))
+                    else:
+                        conditions.append(attr == value)
+        return conditions
+    
     async def get_multi(
         self,
         db: AsyncSession,
         limit: int = 100,
         offset: int = 0,
         filters: Optional[Dict[str, Any]] = None,
-        load_relationships: Optional[List[str]] = None
-    ) -> tuple[List[ModelType], int]:
+        load_relationships: Optional[List[str]] = None,
+        count_mode: CountModeEnum = CountModeEnum.EXACT
+    ) -> tuple[List[ModelType], Optional[int]]:
         """Получение списка записей с пагинацией"""
-        query = select(self.model)
-        count_query = select(func.count(self.model.id))
+        page = await self.get_page(
+            db,
+            limit=limit,
+            offset=offset,
+            filters=filters,
+            load_relationships=load_relationships,
+            count_mode=count_mode
+        )
+        return page.items, page.total
+    
+    async def get_page(
+        self,
+        db: AsyncSession,
+        limit: int = 100,
+        offset: int = 0,
+        filters: Optional[Dict[str, Any]] = None,
+        load_relationships: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+        keyset: bool = False,
+        count_mode: CountModeEnum = CountModeEnum.EXACT
+    ) -> Page:
+        """
+        Получение страницы записей
         
-        # Применение фильтров
-        if filters:
-            for field, value in filters.items():
-                if hasattr(self.model, field) and value is not None:
-                    attr = getattr(self.model, field)
-                    if isinstance(value, list):
-                        query = query.where(attr.in_(value))
-                        count_query = count_query.where(attr.in_(value))
-                    else:
-                        query = query.where(attr == value)
-                        count_query = count_query.where(attr == value)
+        В режиме keyset (или при переданном cursor) записи упорядочиваются по
+        cursor_columns, а страница выбирается условием "ключ > ключа курсора"
+        по индексу вместо OFFSET. В ответе возвращается курсор следующей
+        страницы; None означает, что страница последняя.
+        
+        Выбирается limit + 1 запись, чтобы определить has_more без подсчета.
+        Общее число записей считается точно (exact), оценивается по
+        статистике планировщика (estimate) или не считается вовсе (none).
+        """
+        conditions = self._build_conditions(filters)
+        query = select(self.model).where(*conditions)
         
         # Загрузка связанных данных если указано
         if load_relationships:
             for rel in load_relationships:
                 query = query.options(selectinload(getattr(self.model, rel)))
         
-        # Пагинация
-        query = query.offset(offset).limit(limit)
+        keyset = keyset or cursor is not None
+        if keyset:
+            columns = [getattr(self.model, name) for name in self.cursor_columns]
+            if cursor:
+                values = decode_cursor(cursor, [column.type.python_type for column in columns])
+                if len(columns) == 1:
+                    query = query.where(columns[0] > values[0])
+                else:
+                    query = query.where(tuple_(*columns) > tuple_(*values))
+            query = query.order_by(*columns).limit(limit + 1)
+        else:
+            # Пагинация
+            query = query.offset(offset).limit(limit + 1)
         
         # Выполнение запросов
         result = await db.execute(query)
-        items = result.scalars().all()
+        items = list(result.scalars().all())
+        
+        has_more = len(items) > limit
+        items = items[:limit]
         
-        count_result = await db.execute(count_query)
-        total = count_result.scalar()
+        if count_mode == CountModeEnum.EXACT:
+            count_result = await db.execute(
+                select(func.count(self.model.id)).where(*conditions)
+            )
+            total = count_result.scalar()
+        elif count_mode == CountModeEnum.ESTIMATE:
+            total = await self._estimate_count(db, conditions)
+        else:
+            total = None
         
-        return list(items), total
+        next_cursor = None
+        if keyset and has_more:
+            next_cursor = encode_cursor([getattr(items[-1], name) for name in self.cursor_columns])
+        
+        return Page(items=items, total=total, has_more=has_more, next_cursor=next_cursor)
+    
+    async def _estimate_count(self, db: AsyncSession, conditions: List[Any]) -> int:
+        """
+        Приблизительное число записей без полного подсчета
+        
+        Без фильтров используется статистика таблицы (pg_class.reltuples),
+        для секционированной таблицы - сумма по секциям; с фильтрами -
+        оценка числа строк из плана запроса (EXPLAIN).
+        """
+        if not conditions:
+            result = await db.execute(
+                text(
+                    "SELECT CASE WHEN c.relkind = 'p' THEN ("
+                    "  SELECT CASE WHEN bool_or(p.reltuples < 0) THEN -1 "
+                    "  ELSE coalesce(sum(p.reltuples), 0) END::bigint "
+                    "  FROM pg_inherits i JOIN pg_class p ON p.oid = i.inhrelid "
+                    "  WHERE i.inhparent = c.oid"
+                    ") ELSE c.reltuples::bigint END "
+                    "FROM pg_class c WHERE c.oid = to_regclass(:table_name)"
+                ),
+                {"table_name": self.model.__tablename__}
+            )
+            estimate = result.scalar()
+            # reltuples = -1, пока таблица (или одна из секций) не анализировалась
+            if estimate is not None and estimate >= 0:
+                return estimate
+        
+        query = select(self.model.id).where(*conditions)
+        compiled = query.compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True})
+        result = await db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
     
     async def update(
         self,
@@ -118,15 +263,19 @@ class BaseService(Generic[ModelType]):
         update_data: Dict[str, Any]
     ) -> ModelType:
         """Обновление записи"""
-        logger.info(f"Updating record for {self.model.__name__} with id: {id}, data: {update_data}")
+        logger.info("Updating record for %s with id: %s, data: %s", self.model.__name__, id, LogPayload(update_data))
         
         db_obj = await self.get_by_id_or_404(db, id)
+        previous = self._snapshot(db_obj)
         
         for field, value in update_data.items():
             if hasattr(db_obj, field):
                 setattr(db_obj, field, value)
         
+        current = self._snapshot(db_obj)
+        await self._before_commit(db, [current], [previous])
         await db.commit()
+        await self._after_commit([current], [previous])
         await db.refresh(db_obj)
         
         logger.info(f"Record updated successfully for {self.model.__name__} with id: {id}")
@@ -142,9 +291,12 @@ class BaseService(Generic[ModelType]):
         logger.info(f"Deleting record for {self.model.__name__} with id: {id}")
         
         db_obj = await self.get_by_id_or_404(db, id)
+        removed = self._snapshot(db_obj)
         
         await db.delete(db_obj)
+        await self._before_commit(db, [], [removed])
         await db.commit()
+        await self._after_commit([], [removed])
         
         logger.info(f"Record deleted successfully for {self.model.__name__} with id: {id}")
         
@@ -155,7 +307,12 @@ class BaseService(Generic[ModelType]):
         db: AsyncSession,
         objects_data: List[Dict[str, Any]]
     ) -> List[ModelType]:
-        """Массовое создание записей - все или никакие (транзакционно)"""
+        """
+        Массовое создание записей - все или никакие (транзакционно)
+        
+        У возвращаемых объектов заполнены ID и переданные поля; серверные
+        значения по умолчанию (created_at, updated_at) не загружаются.
+        """
         logger.info(f"Bulk creating {len(objects_data)} records for {self.model.__name__}")
         
         created_objects = []
@@ -175,11 +332,12 @@ class BaseService(Generic[ModelType]):
                     raise ValidationError(error_msg, {"row": i + 1, "data": obj_data})
             
             # Если все объекты созданы успешно, коммитим
+            # ID присваиваются при flush (INSERT ... RETURNING пакетами),
+            # поэтому отдельный refresh каждого объекта не нужен
+            await db.flush()
+            await self._before_commit(db, objects_data, [])
             await db.commit()
-            
-            # Обновляем объекты для получения ID
-            for obj in created_objects:
-                await db.refresh(obj)
+            await self._after_commit(objects_data, [])
             
             logger.info(f"Bulk create successful for {self.model.__name__}: created {len(created_objects)} records")
             return created_objects
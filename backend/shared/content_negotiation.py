@@ -0,0 +1,61 @@
+"""
+Выбор формата ответа по заголовку Accept
+"""
+from typing import List, Optional, Sequence, Tuple
+
+
+def _parse_accept(accept: str) -> List[Tuple[str, float]]:
+    """Разбор заголовка Accept в список (тип, вес)"""
+    media_ranges = []
+    for item in accept.split(","):
+        parts = [part.strip() for part in item.split(";")]
+        if not parts[0]:
+            continue
+        quality = 1.0
+        for parameter in parts[1:]:
+            name, _, value = parameter.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        media_ranges.append((parts[0].lower(), quality))
+    return media_ranges
+
+
+def _quality(media_type: str, media_ranges: List[Tuple[str, float]]) -> float:
+    """Вес типа с учетом наиболее точного подходящего диапазона"""
+    main_type = media_type.split("/")[0]
+    best_specificity, best_quality = -1, 0.0
+    for media_range, quality in media_ranges:
+        if media_range == media_type:
+            specificity = 2
+        elif media_range == f"{main_type}/*":
+            specificity = 1
+        elif media_range == "*/*":
+            specificity = 0
+        else:
+            continue
+        if specificity > best_specificity:
+            best_specificity, best_quality = specificity, quality
+    return best_quality
+
+
+def negotiate_media_type(accept: Optional[str], offered: Sequence[str]) -> str:
+    """
+    Выбор формата ответа
+
+    offered - поддерживаемые типы в порядке предпочтения сервера, первый
+    используется по умолчанию: при отсутствии Accept, при равных весах
+    и если клиент не принимает ни один из предложенных типов.
+    """
+    if not accept:
+        return offered[0]
+
+    media_ranges = _parse_accept(accept)
+    best_type, best_quality = offered[0], 0.0
+    for media_type in offered:
+        quality = _quality(media_type, media_ranges)
+        if quality > best_quality:
+            best_type, best_quality = media_type, quality
+    return best_type
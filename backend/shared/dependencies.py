@@ -5,16 +5,39 @@ from typing import AsyncGenerator
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.core.database import AsyncSessionLocal
+from backend.core.database import AsyncSessionLocal, LazySession, read_session_factory
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency для получения сессии базы данных"""
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        except Exception:
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
+    """
+    Dependency для получения сессии базы данных
+
+    Сессия ленивая (LazySession): создается и берет соединение из пула
+    только при первом обращении.
+    """
+    session = LazySession(AsyncSessionLocal)
+    try:
+        yield session
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency для получения сессии только для чтения
+
+    Сессия открывается на реплике, если она настроена и клиент не привязан
+    к основному серверу после недавней записи (read-your-writes),
+    иначе - на основном сервере. Как и в get_db, сессия ленивая.
+    """
+    session = LazySession(read_session_factory())
+    try:
+        yield session
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
@@ -67,3 +67,79 @@ class AggregationStepEnum(str, Enum):
     def get_values(cls):
         """Получить все возможные значения"""
         return [item.value for item in cls]
+
+
+class BulkInsertMethodEnum(str, Enum):
+    """Перечисление способов массовой вставки записей"""
+    
+    ORM = "orm"  # Через объекты ORM (единица работы SQLAlchemy)
+    INSERT = "insert"  # Пакетный INSERT ... RETURNING id
+    COPY = "copy"  # Бинарный COPY asyncpg с заранее выделенными id
+    
+    @classmethod
+    def get_values(cls):
+        """Получить все возможные значения"""
+        return [item.value for item in cls]
+
+
+class JobStatusEnum(str, Enum):
+    """Перечисление статусов фоновых задач"""
+    
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    
+    @classmethod
+    def get_values(cls):
+        """Получить все возможные значения"""
+        return [item.value for item in cls]
+
+
+class UploadFormatEnum(str, Enum):
+    """Перечисление форматов загружаемых файлов"""
+    
+    CSV = "csv"
+    NDJSON = "ndjson"
+    
+    @classmethod
+    def get_values(cls):
+        """Получить все возможные значения"""
+        return [item.value for item in cls]
+
+
+class PaginationModeEnum(str, Enum):
+    """Перечисление режимов пагинации списков"""
+    
+    OFFSET = "offset"  # OFFSET/LIMIT
+    CURSOR = "cursor"  # Keyset-пагинация по курсору
+    
+    @classmethod
+    def get_values(cls):
+        """Получить все возможные значения"""
+        return [item.value for item in cls]
+
+
+class CountModeEnum(str, Enum):
+    """Перечисление режимов подсчета общего числа записей в списках"""
+    
+    EXACT = "exact"  # SELECT count(*) с теми же фильтрами
+    ESTIMATE = "estimate"  # Оценка планировщика / статистика таблицы
+    NONE = "none"  # Без подсчета (только has_more)
+    
+    @classmethod
+    def get_values(cls):
+        """Получить все возможные значения"""
+        return [item.value for item in cls]
+
+
+class PartitionIntervalEnum(str, Enum):
+    """Перечисление интервалов секционирования таблиц по дате"""
+    
+    NONE = "none"  # Без секционирования
+    YEARLY = "yearly"  # Секция на каждый год
+    MONTHLY = "monthly"  # Секция на каждый месяц
+    
+    @classmethod
+    def get_values(cls):
+        """Получить все возможные значения"""
+        return [item.value for item in cls]
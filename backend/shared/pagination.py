@@ -0,0 +1,43 @@
+"""
+Курсоры для keyset-пагинации
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Sequence
+
+from backend.core.exceptions import ValidationError
+
+
+def _encode_value(value: Any) -> Any:
+    """Приведение значения ключа к JSON-совместимому виду"""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(value: Any, python_type: type) -> Any:
+    """Восстановление значения ключа по типу колонки"""
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Кодирование значений ключа сортировки последней записи в непрозрачный курсор"""
+    payload = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, python_types: Sequence[type]) -> List[Any]:
+    """Декодирование курсора в значения ключа сортировки"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(python_types):
+            raise ValueError("cursor shape mismatch")
+        return [_decode_value(value, python_type) for value, python_type in zip(values, python_types)]
+    except (ValueError, TypeError) as e:
+        raise ValidationError("Invalid cursor", {"cursor": cursor, "reason": str(e)})
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк горячих путей API в процессе: ASGI-приложение вызывается через
+httpx без сети и сервера, запросы идут в базу из настроек приложения
+(DATABASE_URL / DB_*)
+
+Сценарии:
+- динамика добычи по каждому шагу агрегации, с фильтром по комплексам
+  отложений и без него (без кэша и из кэша);
+- страницы списка добычи с разными смещениями;
+- массовая вставка 1k/10k/100k записей (/production/bulk, способы orm, insert
+  и copy) и скважин (/wells/bulk - общий BaseService.bulk_create сущностей);
+- одиночные операции CRUD месторождений и записей добычи.
+
+Записывающие сценарии создают временное месторождение со скважиной и флюидом
+и удаляют его вместе с записями добычи и агрегатами в конце запуска.
+Сценарии чтения имеют смысл на заполненной базе (scripts/populate_database.py).
+Используйте отдельную базу: запуск изменяет данные.
+
+    python benchmarks/bench_api.py
+    python benchmarks/bench_api.py --only dynamics --concurrency 1 8 --iterations 100
+    python benchmarks/bench_api.py --bulk-sizes 1000 10000 --compare benchmarks/results/baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import os
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import text
+
+from main import app
+from backend.core.database import engine, init_db
+from backend.entities.analytics.cache import dynamics_cache
+from backend.shared.enums import AggregationStepEnum, FluidTypeEnum, SedimentComplexEnum
+
+from benchmarks.harness import compare_results, environment, print_header, run_case, save_results
+
+
+def parse_args():
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Бенчмарк API в процессе")
+    parser.add_argument("--iterations", type=int, default=50, help="Вызовов на сценарий чтения и CRUD")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8], help="Уровни параллельности для чтения")
+    parser.add_argument("--date-from", type=date.fromisoformat, default=date(2015, 1, 1))
+    parser.add_argument("--date-to", type=date.fromisoformat, default=date(2024, 12, 31))
+    parser.add_argument("--offsets", type=int, nargs="+", default=[0, 1000, 10000, 100000])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--bulk-sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--bulk-methods", nargs="+", default=["orm", "insert", "copy"], choices=["orm", "insert", "copy"])
+    parser.add_argument("--bulk-repeat", type=int, default=3, help="Повторов каждой массовой вставки")
+    parser.add_argument("--only", nargs="+", default=None, help="Только сценарии, имя которых содержит подстроку")
+    parser.add_argument(
+        "--output",
+        default=os.path.join("benchmarks", "results", f"api-{datetime.now():%Y%m%d-%H%M%S}.json")
+    )
+    parser.add_argument("--compare", default=None, help="JSON предыдущего запуска для сравнения")
+    return parser.parse_args()
+
+
+def check(response: httpx.Response) -> httpx.Response:
+    if response.status_code >= 400:
+        raise RuntimeError(f"{response.request.method} {response.request.url.path}: {response.status_code} {response.text[:200]}")
+    return response
+
+
+async def create_fixture(client: httpx.AsyncClient) -> Dict[str, Any]:
+    """Временное месторождение с объектом разработки, скважиной и флюидом"""
+    suffix = uuid.uuid4().hex[:8]
+    field = check(await client.post("/fields/", json={"name": f"bench-{suffix}", "operator": "bench"})).json()
+    development_object = check(await client.post("/development-objects/", json={
+        "name": f"bench-{suffix}", "field_id": field["id"], "sediment_complex": SedimentComplexEnum.SENOMAN.value
+    })).json()
+    well = check(await client.post("/wells/", json={
+        "name": f"bench-{suffix}", "field_id": field["id"], "fluid_type": FluidTypeEnum.GAS.value
+    })).json()
+    fluid = check(await client.post("/fluids/", json={
+        "fluid_type": FluidTypeEnum.GAS.value, "development_object_id": development_object["id"]
+    })).json()
+    return {
+        "field_id": field["id"],
+        "development_object_id": development_object["id"],
+        "well_id": well["id"],
+        "fluid_id": fluid["id"],
+    }
+
+
+async def clear_fixture_production(fixture: Dict[str, Any]) -> None:
+    """Удаление записей добычи и агрегатов временного месторождения"""
+    async with engine.begin() as conn:
+        await conn.execute(text("DELETE FROM production WHERE field_id = :id"), {"id": fixture["field_id"]})
+        await conn.execute(text("DELETE FROM production_monthly WHERE field_id = :id"), {"id": fixture["field_id"]})
+    dynamics_cache.invalidate_all()
+
+
+async def clear_fixture_wells(fixture: Dict[str, Any]) -> None:
+    """Удаление скважин временного месторождения, кроме скважины фикстуры"""
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("DELETE FROM wells WHERE field_id = :field_id AND id <> :well_id"),
+            {"field_id": fixture["field_id"], "well_id": fixture["well_id"]}
+        )
+
+
+async def drop_fixture(fixture: Dict[str, Any]) -> None:
+    await clear_fixture_production(fixture)
+    async with engine.begin() as conn:
+        await conn.execute(text("DELETE FROM fluids WHERE development_object_id = :id"), {"id": fixture["development_object_id"]})
+        await conn.execute(text("DELETE FROM wells WHERE field_id = :id"), {"id": fixture["field_id"]})
+        await conn.execute(text("DELETE FROM development_objects WHERE field_id = :id"), {"id": fixture["field_id"]})
+        await conn.execute(text("DELETE FROM fields WHERE id = :id"), {"id": fixture["field_id"]})
+
+
+def production_records(fixture: Dict[str, Any], count: int, start: date) -> List[Dict[str, Any]]:
+    """Записи добычи временной скважины с датами в пределах десяти лет"""
+    return [
+        {
+            "well_id": fixture["well_id"],
+            "fluid_id": fixture["fluid_id"],
+            "date": (start + timedelta(days=i % 3650)).isoformat(),
+            "amount": f"{1000 + i % 997}.125",
+            "fluid_type": FluidTypeEnum.GAS.value,
+            "field_id": fixture["field_id"],
+            "development_object_id": fixture["development_object_id"],
+        }
+        for i in range(count)
+    ]
+
+
+def read_cases(client: httpx.AsyncClient, args) -> List[tuple]:
+    """Сценарии чтения: (имя, вызов, действие перед вызовом)"""
+    cases = []
+    for step in AggregationStepEnum:
+        for sediment in (None, [SedimentComplexEnum.SENOMAN.value, SedimentComplexEnum.TURON.value]):
+            params = {
+                "date_from": args.date_from.isoformat(),
+                "date_to": args.date_to.isoformat(),
+                "fluid_type": FluidTypeEnum.GAS.value,
+                "aggregation_step": step.value,
+            }
+            if sediment:
+                params["sediment_complexes"] = sediment
+
+            async def dynamics(params=params):
+                check(await client.get("/analytics/production/dynamics", params=params))
+
+            name = f"dynamics {step.name.lower()}{' +sediment' if sediment else ''}"
+            cases.append((f"{name} (no cache)", dynamics, dynamics_cache.invalidate_all))
+            cases.append((f"{name} (cache hit)", dynamics, None))
+
+    for offset in args.offsets:
+        async def page(offset=offset):
+            check(await client.get("/production/", params={"limit": args.page_size, "offset": offset}))
+
+        cases.append((f"production page offset={offset}", page, None))
+    return cases
+
+
+async def crud_cases(client: httpx.AsyncClient, fixture: Dict[str, Any], args, selected) -> List[Dict[str, Any]]:
+    """Одиночные операции: создание, чтение, изменение и удаление"""
+    results = []
+    for entity, path, payload, update in (
+        ("field", "/fields/", lambda i: {"name": f"bench-crud-{i}", "operator": "bench"}, {"operator": "bench-updated"}),
+        ("production", "/production/", lambda i: production_records(fixture, 1, date(2020, 1, 1) + timedelta(days=i))[0], {"amount": "1.5"}),
+    ):
+        names = [f"{entity} {operation}" for operation in ("create", "get", "update", "delete")]
+        if not any(selected(name) for name in names):
+            continue
+        ids: List[int] = []
+        counter = iter(range(1_000_000))
+
+        async def create(path=path, payload=payload):
+            ids.append(check(await client.post(path, json=payload(next(counter)))).json()["id"])
+
+        async def get(path=path):
+            check(await client.get(f"{path}{ids[next(counter) % len(ids)]}"))
+
+        async def patch(path=path, update=update):
+            check(await client.patch(f"{path}{ids[next(counter) % len(ids)]}", json=update))
+
+        async def remove(path=path):
+            check(await client.delete(f"{path}{ids.pop()}"))
+
+        for operation, call in (("create", create), ("get", get), ("update", patch), ("delete", remove)):
+            name = f"{entity} {operation}"
+            if operation == "create" or selected(name):
+                results.append(await run_case(name, call, args.iterations))
+        # Удаление могло быть отфильтровано - оставшиеся записи удаляются вне замера
+        while ids:
+            await remove()
+    return [result for result in results if selected(result["name"])]
+
+
+async def bulk_cases(client: httpx.AsyncClient, fixture: Dict[str, Any], args, selected) -> List[Dict[str, Any]]:
+    """Массовая вставка записей добычи разными способами и скважин через BaseService.bulk_create"""
+    results = []
+    for size in args.bulk_sizes:
+        # Тело запроса сериализуется один раз: замеряется только сервер
+        body = json.dumps(production_records(fixture, size, args.date_from)).encode()
+        for method in args.bulk_methods:
+            name = f"production bulk {method} {size}"
+            if not selected(name):
+                continue
+
+            async def bulk(method=method):
+                check(await client.post(
+                    "/production/bulk", params={"method": method}, content=body,
+                    headers={"Content-Type": "application/json"}
+                ))
+
+            results.append(await run_case(name, bulk, args.bulk_repeat, rows=size))
+            await clear_fixture_production(fixture)
+
+        name = f"wells bulk {size}"
+        if not selected(name):
+            continue
+        wells_body = json.dumps([
+            {"name": f"bench-bulk-{i}", "field_id": fixture["field_id"], "fluid_type": FluidTypeEnum.GAS.value}
+            for i in range(size)
+        ]).encode()
+
+        async def bulk_wells(wells_body=wells_body):
+            check(await client.post(
+                "/wells/bulk", content=wells_body, headers={"Content-Type": "application/json"}
+            ))
+
+        results.append(await run_case(name, bulk_wells, args.bulk_repeat, rows=size))
+        await clear_fixture_wells(fixture)
+    return results
+
+
+async def main():
+    args = parse_args()
+
+    def selected(name: str) -> bool:
+        return not args.only or any(pattern in name for pattern in args.only)
+
+    await init_db()
+    results: List[Dict[str, Any]] = []
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench/api/v1", timeout=None) as client:
+            fixture = await create_fixture(client)
+            try:
+                print_header()
+                for name, call, before in read_cases(client, args):
+                    if not selected(name):
+                        continue
+                    # Без кэша одновременные запросы объединялись бы в один расчет
+                    for concurrency in args.concurrency if before is None else [1]:
+                        results.append(await run_case(
+                            f"{name} c={concurrency}", call, args.iterations,
+                            concurrency=concurrency, warmup=args.warmup, before=before
+                        ))
+                results.extend(await crud_cases(client, fixture, args, selected))
+                results.extend(await bulk_cases(client, fixture, args, selected))
+            finally:
+                await drop_fixture(fixture)
+    finally:
+        await engine.dispose()
+
+    meta = {**environment(), "arguments": {key: str(value) for key, value in vars(args).items()}}
+    save_results(args.output, meta, results)
+    if args.compare:
+        compare_results(args.compare, results)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк сборки ответа динамики добычи: построчный цикл против матрицы NumPy
+
+Проверяет, что результаты совпадают побайтно, и печатает время обеих реализаций:
+    python benchmarks/bench_dynamics_pivot.py
+    python benchmarks/bench_dynamics_pivot.py --fields 500 --years 20 --step month
+"""
+
+import argparse
+import random
+import sys
+import os
+import time
+from collections import namedtuple
+from decimal import Decimal
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.entities.analytics.pivot import pivot_production
+from backend.entities.analytics.schema import FieldProductionData, TotalProductionData
+from backend.shared.enums import AggregationStepEnum
+
+SUB_PERIODS = {
+    AggregationStepEnum.YEARLY: [None],
+    AggregationStepEnum.QUARTERLY: [1, 2, 3, 4],
+    AggregationStepEnum.MONTHLY: list(range(1, 13)),
+}
+
+
+def generate_rows(fields: int, years: int, step: AggregationStepEnum, fill: float, seed: int):
+    """
+    Синтетический результат GROUP BY в порядке, который возвращает PostgreSQL
+
+    Возвращает две версии строк: с Decimal (прежний запрос без приведения типов)
+    и с int/float (текущий запрос с приведением в SQL).
+    """
+    rng = random.Random(seed)
+    columns = ["field_id", "field_name", "year", "total_amount"]
+    if step == AggregationStepEnum.MONTHLY:
+        columns.append("month")
+    elif step == AggregationStepEnum.QUARTERLY:
+        columns.append("quarter")
+    Row = namedtuple("Row", columns)
+
+    rows = []
+    for year in range(2025 - years, 2025):
+        for sub_period in SUB_PERIODS[step]:
+            for field_id in rng.sample(range(1, fields + 1), fields):
+                if rng.random() > fill:
+                    continue
+                amount = Decimal(rng.randint(0, 10 ** 12)) / 1000
+                values = [field_id, f"Месторождение {field_id}", Decimal(year), amount]
+                if sub_period is not None:
+                    values.append(Decimal(sub_period))
+                rows.append(Row(*values))
+
+    typed_rows = [
+        Row(row[0], row[1], int(row[2]), float(row[3]), *(int(value) for value in row[4:]))
+        for row in rows
+    ]
+    return rows, typed_rows
+
+
+def legacy_assemble(raw_data, aggregation_step):
+    """Прежняя реализация: словари, строковые ключи и циклы по периодам"""
+    fields_data = {}
+    reporting_dates = set()
+
+    for row in raw_data:
+        year = int(row.year)
+        amount = float(row.total_amount)
+        if aggregation_step == AggregationStepEnum.MONTHLY:
+            period_key = f"{year}-{int(row.month):02d}"
+        elif aggregation_step == AggregationStepEnum.QUARTERLY:
+            period_key = f"{year}-Q{int(row.quarter)}"
+        else:
+            period_key = str(year)
+        reporting_dates.add(period_key)
+        if row.field_id not in fields_data:
+            fields_data[row.field_id] = {"field_name": row.field_name, "periods": {}}
+        fields_data[row.field_id]["periods"][period_key] = amount
+
+    sorted_periods = sorted(list(reporting_dates))
+    fields_response = []
+    total_by_period = {}
+    for field_id, field_info in fields_data.items():
+        production_by_period = []
+        for period in sorted_periods:
+            amount = field_info["periods"].get(period, 0.0)
+            production_by_period.append(amount)
+            if period not in total_by_period:
+                total_by_period[period] = 0.0
+            total_by_period[period] += amount
+        fields_response.append(FieldProductionData(
+            field_id=field_id,
+            field_name=field_info["field_name"],
+            production_by_period=production_by_period
+        ))
+
+    total = [total_by_period.get(period, 0.0) for period in sorted_periods]
+    return sorted_periods, fields_response, TotalProductionData(production_by_period=total)
+
+
+def vectorized_assemble(raw_data, aggregation_step):
+    """Текущая реализация сервиса аналитики"""
+    pivot = pivot_production(raw_data, aggregation_step)
+    fields_response = [
+        FieldProductionData.model_construct(
+            field_id=field_id,
+            field_name=field_name,
+            production_by_period=production_by_period
+        )
+        for field_id, field_name, production_by_period in zip(
+            pivot.field_ids, pivot.field_names, pivot.matrix.tolist()
+        )
+    ]
+    return pivot.reporting_dates, fields_response, TotalProductionData(production_by_period=pivot.totals.tolist())
+
+
+def serialize(result) -> bytes:
+    """JSON-представление частей ответа для побайтного сравнения"""
+    periods, fields, total = result
+    return b"|".join(
+        [repr(periods).encode()] + [field.model_dump_json().encode() for field in fields] + [total.model_dump_json().encode()]
+    )
+
+
+def measure(function, rows, step, repeat: int) -> float:
+    """Лучшее время из нескольких запусков, в миллисекундах"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(rows, step)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def parse_args():
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Бенчмарк сборки ответа динамики добычи")
+    parser.add_argument("--fields", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--step", choices=AggregationStepEnum.get_values(), default=AggregationStepEnum.MONTHLY.value)
+    parser.add_argument("--fill", type=float, default=0.9, help="Доля заполненных ячеек матрицы")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    step = AggregationStepEnum(args.step)
+
+    print(f"{'fields':>8} {'rows':>9} {'legacy, ms':>12} {'numpy, ms':>12} {'speedup':>8}")
+    for fields in args.fields:
+        rows, typed_rows = generate_rows(fields, args.years, step, args.fill, args.seed)
+
+        if serialize(legacy_assemble(rows, step)) != serialize(vectorized_assemble(typed_rows, step)):
+            print(f"❌ Результаты различаются для {fields} месторождений")
+            sys.exit(1)
+
+        legacy_ms = measure(legacy_assemble, rows, step, args.repeat)
+        numpy_ms = measure(vectorized_assemble, typed_rows, step, args.repeat)
+        print(f"{fields:>8} {len(rows):>9} {legacy_ms:>12.1f} {numpy_ms:>12.1f} {legacy_ms / numpy_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк сериализации страницы записей добычи: стандартный путь FastAPI
+против однократной сериализации модели (backend/core/responses.py)
+
+    python benchmarks/bench_json_responses.py
+    python benchmarks/bench_json_responses.py --rows 1000 5000 --repeat 20
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from backend.core.responses import FastJSONResponse
+from backend.entities.production.schema import ProductionResponseSchema
+from backend.shared.base_schema import PaginatedResponse
+from backend.shared.enums import FluidTypeEnum, UnitEnum
+
+
+def make_records(rows: int):
+    """Объекты, имитирующие ORM-записи добычи"""
+    created = datetime(2024, 1, 1, 12, 30, 15, 123456)
+    return [
+        SimpleNamespace(
+            id=i, created_at=created, updated_at=created,
+            well_id=i % 50 + 1, fluid_id=i % 3 + 1, date=date(2015, 1, 1) + timedelta(days=i),
+            amount=Decimal(i * 1234567) / 1000, unit=UnitEnum.CUBIC_METERS, fluid_type=FluidTypeEnum.GAS,
+            field_id=i % 10 + 1, development_object_id=i % 30 + 1
+        )
+        for i in range(rows)
+    ]
+
+
+def build_page(records) -> PaginatedResponse:
+    """Страница так, как ее собирают роутеры"""
+    return PaginatedResponse(
+        data=[ProductionResponseSchema.model_validate(record) for record in records],
+        total=len(records), limit=len(records), offset=0, has_more=False
+    )
+
+
+async def fastapi_path(route: APIRoute, page: PaginatedResponse) -> bytes:
+    """model_dump + валидация по response_model + jsonable + json.dumps"""
+    content = await serialize_response(field=route.response_field, response_content=page, is_coroutine=True)
+    return JSONResponse(content).body
+
+
+async def fast_path(route: APIRoute, page: PaginatedResponse) -> bytes:
+    """Однократная сериализация модели через model_dump_json"""
+    return FastJSONResponse(page).body
+
+
+async def measure(function, route, records, repeat: int, page=None) -> float:
+    """
+    Медианное время в миллисекундах: сборка страницы из записей и сериализация,
+    либо только сериализация, если передана готовая страница
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await function(route, page if page is not None else build_page(records))
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+
+def parse_args():
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Бенчмарк сериализации JSON-ответов")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=15)
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+
+    async def endpoint():
+        pass
+
+    route = APIRoute("/production", endpoint, response_model=PaginatedResponse[ProductionResponseSchema])
+
+    print(f"{'':>6} {'страница + сериализация':^32} {'только сериализация':^32}")
+    print(f"{'rows':>6}" + f" {'fastapi, ms':>12} {'fast, ms':>10} {'speedup':>8}" * 2)
+    for rows in args.rows:
+        records = make_records(rows)
+        page = build_page(records)
+        if await fastapi_path(route, page) != await fast_path(route, page):
+            print(f"❌ Ответы различаются для {rows} записей")
+            sys.exit(1)
+
+        line = f"{rows:>6}"
+        for prepared in (None, page):
+            legacy_ms = await measure(fastapi_path, route, records, args.repeat, prepared)
+            fast_ms = await measure(fast_path, route, records, args.repeat, prepared)
+            line += f" {legacy_ms:>12.1f} {fast_ms:>10.1f} {legacy_ms / fast_ms:>7.1f}x"
+        print(line)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
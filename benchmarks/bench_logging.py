@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк логирования данных массовой вставки: f-строка и синхронный вывод
+против очереди с отложенным форматированием (backend/core/logging.py)
+
+Измеряется время вызова логгера в потоке запроса; вывод идет в /dev/null.
+
+    python benchmarks/bench_logging.py
+    python benchmarks/bench_logging.py --rows 100 10000 --repeat 50
+"""
+
+import argparse
+import logging
+import logging.handlers
+import queue
+import sys
+import os
+import time
+from datetime import date
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.core.logging import JSONFormatter, LogPayload, NonBlockingQueueHandler
+
+
+def make_rows(rows: int):
+    """Данные, как их передают в bulk_create"""
+    return [
+        {"well_id": i % 50 + 1, "fluid_id": i % 3 + 1, "date": date(2015, 1, 1), "amount": i * 1.5, "unit": "CUBIC_METERS"}
+        for i in range(rows)
+    ]
+
+
+def measure(call, repeat: int) -> float:
+    """Медианное время вызова в миллисекундах"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+
+def make_logger(name: str, handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    return logger
+
+
+def parse_args():
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Бенчмарк логирования данных запроса")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=30)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    output = open(os.devnull, "w")
+
+    sync_handler = logging.StreamHandler(output)
+    sync_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+    sync_logger = make_logger("bench.sync", sync_handler)
+
+    stream_handler = logging.StreamHandler(output)
+    stream_handler.setFormatter(JSONFormatter())
+    log_queue = queue.Queue(maxsize=100000)
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    queue_logger = make_logger("bench.queue", NonBlockingQueueHandler(log_queue))
+    listener.start()
+
+    print(f"{'rows':>6} {'sync f-string, ms':>18} {'queue + LogPayload, ms':>24} {'speedup':>8}")
+    try:
+        for rows in args.rows:
+            data = make_rows(rows)
+            sync_ms = measure(lambda: sync_logger.info(f"Creating new record with data: {data}"), args.repeat)
+            queue_ms = measure(lambda: queue_logger.info("Creating new record with data: %s", LogPayload(data)), args.repeat)
+            print(f"{rows:>6} {sync_ms:>18.3f} {queue_ms:>24.3f} {sync_ms / queue_ms:>7.0f}x")
+    finally:
+        listener.stop()
+        output.close()
+
+
+if __name__ == "__main__":
+    main()
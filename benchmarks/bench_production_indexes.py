@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк индексов таблицы добычи: прежний набор одиночных индексов
+против набора, описанного в модели Production
+
+Генерирует синтетическую историю добычи в отдельной схеме (по умолчанию
+50 млн строк, в хронологическом порядке), затем для каждого набора индексов
+строит индексы, выполняет VACUUM ANALYZE и печатает план и время запросов
+аналитики и списков. Данные приложения не затрагиваются.
+
+    python benchmarks/bench_production_indexes.py
+    python benchmarks/bench_production_indexes.py --rows 5000000 --repeat 3 --keep
+    python benchmarks/bench_production_indexes.py --reuse --output results.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import os
+import time
+from datetime import date
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import Column, Index, MetaData, Table, text
+from sqlalchemy.schema import CreateIndex
+
+from backend.core import models  # noqa: F401 - регистрация всех моделей (типы внешних ключей)
+from backend.core.database import engine
+from backend.entities.production.model import Production
+
+SCHEMA = "bench_indexes"
+TABLE = f"{SCHEMA}.production"
+
+START_DATE = date(2000, 1, 1)
+DAYS = 25 * 365
+WELLS = 3000
+FIELDS = 50
+OBJECTS = 150
+
+# Прежний набор: одиночные индексы по колонкам + keyset (date, id)
+BASELINE_INDEXES = [
+    ("well_id",), ("fluid_id",), ("date",), ("fluid_type",),
+    ("field_id",), ("development_object_id",), ("date", "id"),
+]
+
+QUERIES = {
+    # Ветка динамики по исходной таблице (крайние месяцы / пересчет агрегатов)
+    "dynamics_raw_year": """
+        SELECT field_id, date_trunc('month', date)::date AS month, sum(amount)
+        FROM {table}
+        WHERE fluid_type = 'GAS' AND date >= DATE '2020-01-01' AND date <= DATE '2020-12-31'
+        GROUP BY 1, 2
+    """,
+    "dynamics_raw_edge_month_fields": """
+        SELECT field_id, sum(amount)
+        FROM {table}
+        WHERE fluid_type = 'OIL' AND date >= DATE '2020-03-15' AND date < DATE '2020-04-01'
+          AND field_id IN (1, 5, 9, 13)
+        GROUP BY 1
+    """,
+    # Пересчет помесячных агрегатов за год
+    "rollup_rebuild_year": """
+        SELECT field_id, development_object_id, fluid_type, date_trunc('month', date)::date, sum(amount), count(*)
+        FROM {table}
+        WHERE date >= DATE '2015-01-01' AND date < DATE '2016-01-01'
+        GROUP BY 1, 2, 3, 4
+    """,
+    # Страница списка с фильтром по периоду (keyset)
+    "list_date_range_page": """
+        SELECT * FROM {table}
+        WHERE date >= DATE '2018-06-01' AND date <= DATE '2018-06-30'
+        ORDER BY date, id LIMIT 100
+    """,
+}
+
+
+def bench_table() -> Table:
+    """Таблица с колонками Production без внешних ключей"""
+    table = Table("production", MetaData(schema=SCHEMA))
+    for column in Production.__table__.columns:
+        table.append_column(Column(column.name, column.type, nullable=column.nullable))
+    return table
+
+
+def model_indexes(table: Table):
+    """Индексы модели Production, перенесенные на таблицу бенчмарка"""
+    return [
+        Index(
+            f"bench_{index.name}",
+            *[table.c[column.name] for column in index.columns],
+            **index.dialect_kwargs
+        )
+        for index in Production.__table__.indexes
+    ]
+
+
+def baseline_indexes(table: Table):
+    """Прежний набор индексов"""
+    return [
+        Index(f"bench_ix_{'_'.join(columns)}", *[table.c[name] for name in columns])
+        for columns in BASELINE_INDEXES
+    ]
+
+
+async def generate(conn, rows: int, batch: int) -> None:
+    """Генерация истории добычи на стороне сервера, в порядке дат"""
+    await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    # Типы перечислений общие с приложением (public): создаются, только если их еще нет
+    await conn.run_sync(lambda sync_conn: bench_table().create(sync_conn, checkfirst=True))
+
+    rows_per_day = max(rows // DAYS, 1)
+    for offset in range(0, rows, batch):
+        started = time.perf_counter()
+        count = min(batch, rows - offset)
+        await conn.execute(
+            text(f"""
+                INSERT INTO {TABLE} (id, well_id, fluid_id, date, amount, unit, fluid_type,
+                                     field_id, development_object_id, created_at, updated_at)
+                SELECT g,
+                       w,
+                       w * 3 + f,
+                       DATE '{START_DATE}' + (g / {rows_per_day})::int,
+                       round((random() * 1000)::numeric, 3),
+                       (CASE WHEN f = 0 THEN 'CUBIC_METERS' ELSE 'TONS' END)::unitenum,
+                       (ARRAY['GAS', 'OIL', 'CONDENSATE'])[f + 1]::fluidtypeenum,
+                       w % {FIELDS} + 1,
+                       w % {OBJECTS} + 1,
+                       now(), now()
+                FROM (
+                    SELECT g, (g * 7919) % {WELLS} + 1 AS w, (g / {WELLS}) % 3 AS f
+                    FROM generate_series(CAST(:first AS bigint), CAST(:last AS bigint)) AS g
+                ) s
+            """),
+            {"first": offset + 1, "last": offset + count}
+        )
+        print(f"  {offset + count:>12,} строк ({time.perf_counter() - started:.1f} с)")
+
+
+async def build_indexes(conn, indexes) -> dict:
+    """Удаление индексов бенчмарка и построение заданного набора"""
+    existing = await conn.execute(text(
+        f"SELECT indexname FROM pg_indexes WHERE schemaname = '{SCHEMA}' AND tablename = 'production'"
+    ))
+    for (name,) in existing.all():
+        await conn.execute(text(f'DROP INDEX {SCHEMA}."{name}"'))
+
+    sizes = {}
+    for index in indexes:
+        started = time.perf_counter()
+        await conn.execute(CreateIndex(index))
+        size = (await conn.execute(text(f"SELECT pg_relation_size('{SCHEMA}.\"{index.name}\"')"))).scalar()
+        sizes[index.name] = {"build_s": round(time.perf_counter() - started, 1), "size_mb": round(size / 2 ** 20, 1)}
+        print(f"  {index.name:<55} {sizes[index.name]['size_mb']:>9.1f} MB {sizes[index.name]['build_s']:>7.1f} с")
+
+    await conn.execute(text(f"VACUUM ANALYZE {TABLE}"))
+    return sizes
+
+
+async def run_queries(conn, repeat: int) -> dict:
+    """План (EXPLAIN ANALYZE, BUFFERS) и медианное время запросов"""
+    results = {}
+    for name, query in QUERIES.items():
+        sql = query.format(table=TABLE)
+        plan = (await conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT TEXT) {sql}"))).scalars().all()
+
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await conn.execute(text(sql))
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+
+        results[name] = {"median_ms": round(timings[len(timings) // 2], 1), "plan": plan}
+        print(f"\n  ▶ {name}: {results[name]['median_ms']} мс")
+        for line in plan:
+            print(f"    {line}")
+    return results
+
+
+def parse_args():
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Бенчмарк индексов таблицы добычи")
+    parser.add_argument("--rows", type=int, default=50_000_000)
+    parser.add_argument("--batch", type=int, default=5_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--reuse", action="store_true", help="Использовать ранее сгенерированные данные")
+    parser.add_argument("--keep", action="store_true", help="Не удалять схему бенчмарка после запуска")
+    parser.add_argument("--output", help="Файл для результатов в JSON")
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    table = bench_table()
+    report = {"rows": args.rows, "configs": {}}
+
+    try:
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+
+            if not args.reuse:
+                print(f"🔄 Генерация {args.rows:,} строк в {TABLE}...")
+                await generate(conn, args.rows, args.batch)
+
+            for config, indexes in (("before", baseline_indexes(table)), ("after", model_indexes(table))):
+                print(f"\n📊 Набор индексов: {config}")
+                sizes = await build_indexes(conn, indexes)
+                report["configs"][config] = {"indexes": sizes, "queries": await run_queries(conn, args.repeat)}
+
+            print("\n📈 Сводка (медиана, мс):")
+            print(f"  {'query':<34} {'before':>10} {'after':>10} {'speedup':>8}")
+            for name in QUERIES:
+                before = report["configs"]["before"]["queries"][name]["median_ms"]
+                after = report["configs"]["after"]["queries"][name]["median_ms"]
+                print(f"  {name:<34} {before:>10.1f} {after:>10.1f} {before / max(after, 0.001):>7.1f}x")
+
+            if not args.keep:
+                await conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+    finally:
+        await engine.dispose()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Результаты сохранены в {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,150 @@
+"""
+Общие средства бенчмарков: замер сценариев, перцентили, сохранение
+результатов в JSON и сравнение с предыдущим запуском
+"""
+
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Перцентиль отсортированного списка с линейной интерполяцией"""
+    if not values:
+        return 0.0
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+async def run_case(
+    name: str,
+    call: Callable[[], Awaitable[Any]],
+    iterations: int,
+    concurrency: int = 1,
+    warmup: int = 0,
+    before: Optional[Callable[[], Any]] = None,
+    rows: int = 0
+) -> Dict[str, Any]:
+    """
+    Замер сценария: iterations вызовов call, не более concurrency одновременно
+
+    before вызывается перед каждым вызовом вне замера (например, сброс кэша).
+    rows - число строк, обрабатываемых одним вызовом (для строк в секунду).
+    Исключения считаются ошибками, их время в перцентили не входит.
+    """
+    for _ in range(warmup):
+        if before is not None:
+            before()
+        await call()
+
+    latencies: List[float] = []
+    errors: List[str] = []
+    remaining = iter(range(iterations))
+
+    async def worker():
+        for _ in remaining:
+            if before is not None:
+                before()
+            started = time.perf_counter()
+            try:
+                await call()
+            except Exception as e:
+                errors.append(str(e))
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(concurrency, 1))))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    result = {
+        "name": name,
+        "iterations": iterations,
+        "concurrency": concurrency,
+        "errors": len(errors),
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        "min_ms": round(latencies[0] * 1000, 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+    }
+    if rows:
+        result["rows"] = rows
+        result["rows_per_s"] = round(rows * len(latencies) / wall, 1) if wall else 0.0
+    if errors:
+        result["first_error"] = errors[0][:500]
+    print_result(result)
+    return result
+
+
+def print_header() -> None:
+    print(f"{'сценарий':<48} {'n':>5} {'conc':>4} {'req/s':>9} {'p50, ms':>10} {'p95, ms':>10} {'p99, ms':>10} {'err':>4}")
+
+
+def print_result(result: Dict[str, Any]) -> None:
+    line = (
+        f"{result['name']:<48} {result['iterations']:>5} {result['concurrency']:>4} "
+        f"{result['throughput_rps']:>9.1f} {result['p50_ms']:>10.2f} {result['p95_ms']:>10.2f} "
+        f"{result['p99_ms']:>10.2f} {result['errors']:>4}"
+    )
+    if "rows_per_s" in result:
+        line += f"  {result['rows_per_s']:,.0f} rows/s"
+    print(line, flush=True)
+
+
+def environment() -> Dict[str, Any]:
+    """Сведения о запуске для сопоставления результатов"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+    }
+
+
+def save_results(path: str, meta: Dict[str, Any], results: List[Dict[str, Any]]) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"meta": meta, "results": results}, file, ensure_ascii=False, indent=2)
+    print(f"\n📄 Результаты сохранены: {path}")
+
+
+def compare_results(baseline_path: str, results: List[Dict[str, Any]]) -> None:
+    """Изменение p50/p95/p99 и пропускной способности относительно сохраненного запуска"""
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = {item["name"]: item for item in json.load(file)["results"]}
+
+    print(f"\nСравнение с {baseline_path} (отрицательное изменение задержки - улучшение)")
+    print(f"{'сценарий':<48} {'p50':>8} {'p95':>8} {'p99':>8} {'req/s':>8}")
+    for result in results:
+        previous = baseline.get(result["name"])
+        if previous is None:
+            print(f"{result['name']:<48} {'новый':>8}")
+            continue
+        line = f"{result['name']:<48}"
+        for key in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps"):
+            if previous[key]:
+                line += f" {(result[key] / previous[key] - 1) * 100:>+7.1f}%"
+            else:
+                line += f" {'-':>8}"
+        print(line)
@@ -5,6 +5,10 @@ import {
   ProductionDynamicsRequest,
   ProductionDynamicsResponse
 } from '../types/api';
+import {
+  DYNAMICS_BINARY_MEDIA_TYPE,
+  decodeProductionDynamics
+} from '../utils/dynamicsBinary';
 
 // Конфигурация API
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000/api/v1';
@@ -17,6 +21,8 @@ console.log('  API_BASE_URL:', API_BASE_URL);
 const apiClient = axios.create({
   baseURL: API_BASE_URL,
   timeout: 30000,
+  // Cookie привязки к основному серверу БД после записи (API на другом origin)
+  withCredentials: true,
   headers: {
     'Content-Type': 'application/json',
   },
@@ -80,8 +86,27 @@ export class ApiService {
       );
     }
 
-    const response = await apiClient.get(`/analytics/production/dynamics?${queryParams.toString()}`);
-    return response.data;
+    // Запрашиваем компактный бинарный формат, JSON остается запасным вариантом
+    const response = await apiClient.get(`/analytics/production/dynamics?${queryParams.toString()}`, {
+      headers: { Accept: `${DYNAMICS_BINARY_MEDIA_TYPE}, application/json;q=0.5` },
+      responseType: 'arraybuffer',
+    }).catch((error) => {
+      // Тело ошибки тоже приходит как ArrayBuffer - разбираем JSON для обработчиков
+      if (error.response?.data instanceof ArrayBuffer) {
+        try {
+          error.response.data = JSON.parse(new TextDecoder('utf-8').decode(error.response.data));
+        } catch {
+          // оставляем тело как есть
+        }
+      }
+      throw error;
+    });
+
+    const contentType: string = response.headers['content-type'] || '';
+    if (contentType.startsWith(DYNAMICS_BINARY_MEDIA_TYPE)) {
+      return decodeProductionDynamics(response.data);
+    }
+    return JSON.parse(new TextDecoder('utf-8').decode(response.data));
   }
 }
 
@@ -8,9 +8,11 @@ export interface Field {
 
 export interface PaginatedResponse<T> {
   data: T[];
-  total: number;
+  total: number | null;
   limit: number;
   offset: number;
+  has_more?: boolean | null;
+  next_cursor?: string | null;
 }
 
 // Enums
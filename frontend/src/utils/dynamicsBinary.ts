@@ -0,0 +1,55 @@
+// Декодирование бинарного формата динамики добычи
+// (application/vnd.production-dynamics.f64, см. backend/entities/analytics/encoding.py)
+
+import {
+  ProductionDynamicsMetadata,
+  ProductionDynamicsResponse
+} from '../types/api';
+
+export const DYNAMICS_BINARY_MEDIA_TYPE = 'application/vnd.production-dynamics.f64';
+
+const MAGIC = 'PDYN';
+const FORMAT_VERSION = 1;
+const PREFIX_SIZE = 12;
+
+interface DynamicsBinaryHeader {
+  metadata: ProductionDynamicsMetadata;
+  reporting_dates: string[];
+  fields: { field_id: number; field_name: string }[];
+}
+
+export function decodeProductionDynamics(buffer: ArrayBuffer): ProductionDynamicsResponse {
+  const view = new DataView(buffer);
+  const magic = String.fromCharCode(
+    view.getUint8(0), view.getUint8(1), view.getUint8(2), view.getUint8(3)
+  );
+  const version = view.getUint16(4, true);
+  if (magic !== MAGIC || version !== FORMAT_VERSION) {
+    throw new Error(`Unsupported dynamics payload (magic=${magic}, version=${version})`);
+  }
+
+  const headerLength = view.getUint32(8, true);
+  const header: DynamicsBinaryHeader = JSON.parse(
+    new TextDecoder('utf-8').decode(new Uint8Array(buffer, PREFIX_SIZE, headerLength))
+  );
+
+  // Данные выровнены по 8 байтам - читаем без копирования
+  // (Float64Array использует порядок байтов платформы, на практике little-endian)
+  const periods = header.reporting_dates.length;
+  const values = new Float64Array(buffer, PREFIX_SIZE + headerLength);
+  if (values.length !== (header.fields.length + 1) * periods) {
+    throw new Error('Dynamics payload size does not match header');
+  }
+
+  return {
+    metadata: header.metadata,
+    reporting_dates: header.reporting_dates,
+    fields: header.fields.map((field, index) => ({
+      ...field,
+      production_by_period: Array.from(values.subarray(index * periods, (index + 1) * periods))
+    })),
+    total: {
+      production_by_period: Array.from(values.subarray(header.fields.length * periods))
+    }
+  };
+}
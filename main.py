@@ -5,16 +5,25 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from backend.core.config import settings
-from backend.core.logging import setup_logging, get_logger
+from backend.core.logging import setup_logging, shutdown_logging, get_logger
 from backend.api.main_router import api_router
-from backend.core.database import init_db
+from backend.core.database import init_db, engine, read_engine, has_replica
+from backend.core.metrics import metrics_registry
+from backend.core.middleware import ReadYourWritesMiddleware, TimingMiddleware
+from backend.core.pool import prewarm_pool
+from backend.core.responses import FastJSONResponse, configure_responses
+from backend.entities.analytics.cache import dynamics_cache_reset_listener
 
 # Настройка логирования
 setup_logging()
 logger = get_logger(__name__)
 
+# Настройка сериализации ответов
+configure_responses(enabled=settings.FAST_JSON_RESPONSES)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -22,13 +31,22 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info(f"Starting {settings.APP_NAME} version {settings.APP_VERSION}")
     await init_db()  # Раскомментировать когда будут готовы все модели
+    await prewarm_pool(engine, settings.DB_POOL_PREWARM)
+    if has_replica():
+        await prewarm_pool(read_engine, settings.DB_POOL_PREWARM)
+    await dynamics_cache_reset_listener.start(engine)
     logger.info("Application startup completed")
     
     yield
     
     # Shutdown
     logger.info(f"Shutting down {settings.APP_NAME}")
+    await dynamics_cache_reset_listener.stop()
+    await engine.dispose()
+    if has_replica():
+        await read_engine.dispose()
     logger.info("Application shutdown completed")
+    shutdown_logging()
 
 
 # Создание приложения FastAPI
@@ -37,18 +55,25 @@ app = FastAPI(
     version=settings.APP_VERSION,
     description="API для анализа добычи с месторождений",
     debug=settings.DEBUG,
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse if settings.FAST_JSON_RESPONSES else JSONResponse
 )
 
 # Настройка CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Чтение собственных записей при использовании реплики
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Учет времени запросов (внешний слой: учитывает и остальные middleware)
+app.add_middleware(TimingMiddleware)
+
 # Подключение роутеров
 app.include_router(api_router, prefix="/api/v1")
 
@@ -69,6 +94,15 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Метрики приложения в текстовом формате Prometheus"""
+    return PlainTextResponse(
+        metrics_registry.render(),
+        media_type="text/plain; version=0.0.4"
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -1,56 +1,176 @@
 #!/usr/bin/env python3
 """
-Скрипт для очистки всех данных из базы данных
+Скрипт для очистки данных из базы данных
+
+По умолчанию все таблицы моделей очищаются одной командой TRUNCATE
+с RESTART IDENTITY: без построчного удаления, WAL по строкам и мертвых
+версий строк, которые потом пришлось бы убирать VACUUM.
+
+    python scripts/clear_database.py
+    python scripts/clear_database.py --only production
+    python scripts/clear_database.py --only wells --cascade
+    python scripts/clear_database.py --partitions drop
+    python scripts/clear_database.py --mode delete
+
+Помесячная агрегация (production_monthly) очищается вместе с добычей.
+
+Работающий API останавливать не нужно: вместе с очисткой (в той же
+транзакции) отправляется NOTIFY в канал analytics_cache_reset, и каждый
+процесс API сбрасывает закэшированную динамику добычи. Кэша секций в API
+нет - наличие секций проверяется по каталогу при каждой записи, поэтому
+удаленные или отсоединенные здесь секции создаются заново при вставке.
 """
 
+import argparse
 import asyncio
 import sys
 import os
+from datetime import date
+from typing import List
 
 # Добавляем корневую директорию в путь для импорта модулей
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from backend.core.database import AsyncSessionLocal
-from backend.entities.production.model import Production
+from sqlalchemy import Table, delete, text
+
+from backend.core.base import Base
+from backend.core.config import settings
+from backend.core.database import AsyncSessionLocal, engine
+from backend.entities.analytics.cache import CACHE_RESET_CHANNEL
+from backend.entities.analytics.model import ProductionMonthly
+from backend.entities.production.model import Production, production_partitions
 from backend.entities.well.model import Well
 from backend.entities.development_object.model import DevelopmentObject
 from backend.entities.field.model import Field
 from backend.entities.fluid.model import Fluid
-from sqlalchemy import delete
+
+# Сущности, которые можно очистить выборочно
+ENTITIES = {
+    "production": Production.__table__,
+    "wells": Well.__table__,
+    "fluids": Fluid.__table__,
+    "development_objects": DevelopmentObject.__table__,
+    "fields": Field.__table__,
+}
+
+
+def resolve_tables(entities: List[str], cascade: bool) -> List[Table]:
+    """
+    Таблицы для очистки в порядке зависимостей (зависимые - первыми)
+
+    Таблицы, ссылающиеся на выбранные, добавляются только с cascade;
+    иначе очистка невозможна и выполнение прерывается.
+    """
+    tables = {ENTITIES[name] for name in entities}
+    dependents = set()
+    changed = True
+    while changed:
+        changed = False
+        for table in Base.metadata.sorted_tables:
+            if table in tables | dependents:
+                continue
+            if any(key.column.table in tables | dependents for key in table.foreign_keys):
+                dependents.add(table)
+                changed = True
+
+    missing = sorted(table.name for table in dependents - tables)
+    if missing and not cascade:
+        raise SystemExit(
+            f"❌ На выбранные таблицы ссылаются: {', '.join(missing)}. "
+            "Добавьте их в --only или используйте --cascade"
+        )
+    tables |= dependents
+    # Агрегация производна от добычи и без нее теряет смысл
+    if Production.__table__ in tables:
+        tables.add(ProductionMonthly.__table__)
+    return [table for table in reversed(Base.metadata.sorted_tables) if table in tables]
+
+
+def reset_api_cache_statement():
+    """NOTIFY для сброса кэша аналитики работающего API (доставляется при COMMIT)"""
+    return text("SELECT pg_notify(:channel, 'clear_database')").bindparams(channel=CACHE_RESET_CHANNEL)
 
 
-async def clear_database():
-    """Очищает все данные из базы данных"""
+async def reset_partitions(mode: str, archive_schema: str) -> None:
+    """Удаление или отсоединение всех секций таблицы добычи"""
+    if mode == "keep" or not production_partitions.enabled:
+        return
+    detached = await production_partitions.detach_before(
+        engine, date.max, archive_schema=archive_schema, drop=mode == "drop"
+    )
+    action = "Удалено" if mode == "drop" else f"Перенесено в схему {archive_schema}"
+    print(f"  - {action} секций добычи: {len(detached)}")
+
+
+async def truncate_tables(tables: List[Table], cascade: bool, lock_timeout: str) -> None:
+    """Очистка таблиц одной командой TRUNCATE"""
+    names = ", ".join(f'"{table.name}"' for table in tables)
+    statement = f"TRUNCATE TABLE {names} RESTART IDENTITY{' CASCADE' if cascade else ''}"
+    async with engine.begin() as conn:
+        # TRUNCATE ждет ACCESS EXCLUSIVE: не висим за транзакциями приложения
+        await conn.execute(text(f"SET LOCAL lock_timeout = '{lock_timeout}'"))
+        print(f"  - {statement}")
+        await conn.execute(text(statement))
+        await conn.execute(reset_api_cache_statement())
+
+
+async def delete_tables(tables: List[Table]) -> None:
+    """Построчное удаление (если нет прав на TRUNCATE)"""
     async with AsyncSessionLocal() as session:
         try:
-            print("🗑️  Начинаем очистку базы данных...")
-            
-            # Удаляем данные в правильном порядке (с учетом внешних ключей)
-            print("  - Удаляем данные о добыче...")
-            await session.execute(delete(Production))
-            
-            print("  - Удаляем данные о скважинах...")
-            await session.execute(delete(Well))
-            
-            print("  - Удаляем данные о флюидах...")
-            await session.execute(delete(Fluid))
-            
-            print("  - Удаляем данные об объектах разработки...")
-            await session.execute(delete(DevelopmentObject))
-            
-            print("  - Удаляем данные о месторождениях...")
-            await session.execute(delete(Field))
-            
-            # Подтверждаем изменения
+            for table in tables:
+                print(f"  - Удаляем данные из {table.name}...")
+                await session.execute(delete(table))
+            await session.execute(reset_api_cache_statement())
             await session.commit()
-            
-            print("✅ База данных успешно очищена!")
-            
-        except Exception as e:
-            print(f"❌ Ошибка при очистке базы данных: {e}")
+        except Exception:
             await session.rollback()
             raise
 
 
+async def clear_database(args):
+    """Очищает данные выбранных сущностей"""
+    tables = resolve_tables(args.only or list(ENTITIES), args.cascade)
+    try:
+        print("🗑️  Начинаем очистку базы данных...")
+        print(f"  Таблицы: {', '.join(table.name for table in tables)}")
+
+        if args.mode == "truncate":
+            if Production.__table__ in tables:
+                await reset_partitions(args.partitions, args.archive_schema)
+            await truncate_tables(tables, args.cascade, args.lock_timeout)
+            if Production.__table__ in tables and args.partitions != "keep":
+                # Секции текущего и следующих периодов, как при старте приложения
+                await production_partitions.ensure_startup(engine)
+        else:
+            await delete_tables(tables)
+
+        print("✅ База данных успешно очищена!")
+        print("ℹ️  Работающему API отправлен сброс кэша аналитики (NOTIFY analytics_cache_reset)")
+
+    except Exception as e:
+        print(f"❌ Ошибка при очистке базы данных: {e}")
+        raise
+    finally:
+        await engine.dispose()
+
+
+def parse_args():
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Очистка данных из базы данных")
+    parser.add_argument("--mode", choices=["truncate", "delete"], default="truncate",
+                        help="truncate - одной командой TRUNCATE, delete - построчно (DELETE)")
+    parser.add_argument("--only", nargs="+", choices=list(ENTITIES), default=None,
+                        help="Очистить только эти сущности (по умолчанию - все)")
+    parser.add_argument("--cascade", action="store_true",
+                        help="Очистить и таблицы, ссылающиеся на выбранные")
+    parser.add_argument("--partitions", choices=["keep", "drop", "detach"], default="keep",
+                        help="Секции добычи: очистить (keep), удалить (drop) или перенести в архивную схему (detach)")
+    parser.add_argument("--archive-schema", default=settings.PRODUCTION_ARCHIVE_SCHEMA,
+                        help="Схема для отсоединенных секций (--partitions detach)")
+    parser.add_argument("--lock-timeout", default="10s", help="Максимальное ожидание блокировки таблиц")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    asyncio.run(clear_database())
+    asyncio.run(clear_database(parse_args()))
@@ -0,0 +1,36 @@
+"""
+Справочные данные для генерации тестового набора
+
+Общие для populate_database.py (через API) и generate_dataset.py (напрямую
+в БД). Модуль без зависимостей: генератор не должен требовать aiohttp.
+"""
+
+# Данные для генерации
+OPERATORS = [
+    "НефтеГазПром", 
+    "СевернаяЭнерго", 
+    "АрктикОйл", 
+    "СибирьГаз", 
+    "УралНефть"
+]
+
+FIELDS_DATA = [
+    {"name": "Северное Сияние", "operator": "НефтеГазПром", "complexes": 4},
+    {"name": "Белый Медведь", "operator": "НефтеГазПром", "complexes": 4},
+    {"name": "Полярная Звезда", "operator": "СевернаяЭнерго", "complexes": 4},
+    {"name": "Золотая Тундра", "operator": "АрктикОйл", "complexes": 3},
+    {"name": "Синий Кит", "operator": "СевернаяЭнерго", "complexes": 3},
+    {"name": "Морозное Утро", "operator": "СибирьГаз", "complexes": 2},
+    {"name": "Снежный Барс", "operator": "УралНефть", "complexes": 2},
+    {"name": "Ледяной Дракон", "operator": "АрктикОйл", "complexes": 2},
+    {"name": "Северный Ветер", "operator": "СибирьГаз", "complexes": 1},
+    {"name": "Кристальное", "operator": "УралНефть", "complexes": 1}
+]
+
+COMPLEXES = ["турон", "сеноман", "неоком", "ачимовка"]
+FLUID_TYPES = ["газ", "нефть", "конденсат"]
+
+# Дебиты скважин (в сутки)
+GAS_DEBIT_RANGE = (50000, 800000)  # м3/сут
+OIL_DEBIT_RANGE = (20, 100)  # т/сут
+CONDENSATE_RATIO_RANGE = (50, 150)  # г/м3
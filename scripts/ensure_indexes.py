@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Скрипт для создания недостающих индексов моделей на существующих таблицах
+
+Индексы строятся без блокировки записи (CREATE INDEX CONCURRENTLY, для
+секционированной таблицы добычи - по секциям с присоединением к индексу
+родителя), поэтому скрипт можно запускать при работающем API. Прерванную
+сборку можно повторить: невалидные индексы пересоздаются или достраиваются.
+
+    python scripts/ensure_indexes.py
+"""
+
+import asyncio
+import sys
+import os
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.core.database import engine, ensure_indexes, init_db
+from backend.core.logging import setup_logging, shutdown_logging
+
+
+async def main():
+    """Создает таблицы (если их нет) и недостающие индексы"""
+    # Создаваемые индексы и их сборка по секциям выводятся в лог
+    setup_logging()
+    try:
+        await init_db()
+        print("🔄 Создание недостающих индексов...")
+        await ensure_indexes()
+        print("✅ Индексы соответствуют моделям (подробности - в логе)")
+    except Exception as e:
+        print(f"❌ Ошибка при создании индексов: {e}")
+        raise
+    finally:
+        await engine.dispose()
+        shutdown_logging()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Скрипт для управления секциями таблицы добычи (PRODUCTION_PARTITIONING=yearly|monthly)
+
+    python scripts/manage_partitions.py list
+    python scripts/manage_partitions.py ensure --date-from 2015-01-01 --date-to 2025-12-31
+    python scripts/manage_partitions.py detach --before 2016-01-01
+    python scripts/manage_partitions.py detach --before 2016-01-01 --drop
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+from datetime import date
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.core.config import settings
+from backend.core.database import engine, init_db
+from backend.entities.production.model import production_partitions
+
+
+async def manage_partitions(args):
+    """Выполнение команды над секциями"""
+    if not production_partitions.enabled:
+        print("❌ Секционирование выключено (PRODUCTION_PARTITIONING=none)")
+        return
+
+    # Создаем секционированную таблицу, если ее еще нет
+    await init_db()
+
+    try:
+        if args.command == "list":
+            partitions = await production_partitions.list_partitions(engine)
+            print(f"📋 Секции таблицы {production_partitions.parent} ({len(partitions)}):")
+            for partition in partitions:
+                rows = partition["rows_estimate"]
+                print(f"  {partition['name']:<24} {partition['bounds']:<60} ~{max(rows, 0)} строк")
+
+        elif args.command == "ensure":
+            print(f"🔄 Создание секций за период {args.date_from} - {args.date_to}...")
+            created = await production_partitions.ensure_range(engine, args.date_from, args.date_to)
+            print(f"✅ Создано секций: {created}")
+
+        elif args.command == "detach":
+            target = "удаление" if args.drop else f"перенос в схему {args.archive_schema}"
+            print(f"🔄 Отсоединение секций ранее {args.before} ({target})...")
+            detached = await production_partitions.detach_before(
+                engine, args.before, archive_schema=args.archive_schema, drop=args.drop
+            )
+            print(f"✅ Отсоединено секций: {len(detached)} {', '.join(detached)}")
+            if detached:
+                print("ℹ️  Помесячные агрегаты за эти периоды сохранены в production_monthly")
+
+    except Exception as e:
+        print(f"❌ Ошибка при работе с секциями: {e}")
+        raise
+    finally:
+        await engine.dispose()
+
+
+def parse_args():
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Управление секциями таблицы добычи")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("list", help="Список секций")
+
+    ensure = subparsers.add_parser("ensure", help="Создание секций за период")
+    ensure.add_argument("--date-from", type=date.fromisoformat, required=True)
+    ensure.add_argument("--date-to", type=date.fromisoformat, required=True)
+
+    detach = subparsers.add_parser("detach", help="Отсоединение (архивация) старых секций")
+    detach.add_argument("--before", type=date.fromisoformat, required=True,
+                        help="Отсоединить секции, целиком лежащие раньше даты (YYYY-MM-DD)")
+    detach.add_argument("--archive-schema", default=settings.PRODUCTION_ARCHIVE_SCHEMA,
+                        help="Схема для отсоединенных секций")
+    detach.add_argument("--drop", action="store_true", help="Удалить секции вместо архивации")
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(manage_partitions(parse_args()))
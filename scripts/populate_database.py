@@ -1,53 +1,51 @@
 #!/usr/bin/env python3
 """
 Скрипт для наполнения базы данных тестовыми данными через API
+
+    python scripts/populate_database.py
+    python scripts/populate_database.py --mode bulk --batch-size 1000 --concurrency 8
+    python scripts/populate_database.py --mode bulk --method copy --api-url http://api:8000/api/v1
+
+В режиме bulk записи отправляются пачками в эндпоинты /bulk; в обоих режимах
+не более --concurrency запросов выполняются одновременно по общим keep-alive
+соединениям. В конце печатается пропускная способность по типам сущностей,
+поэтому скрипт служит и нагрузочным тестом загрузки через API.
 """
 
+import argparse
 import asyncio
 import aiohttp
 import json
 import random
+import time
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Any
 import calendar
 
+from dataset_constants import (
+    OPERATORS,
+    FIELDS_DATA,
+    COMPLEXES,
+    FLUID_TYPES,
+    GAS_DEBIT_RANGE,
+    OIL_DEBIT_RANGE,
+    CONDENSATE_RATIO_RANGE
+)
+
 # Конфигурация API
 API_BASE_URL = "http://localhost:8000/api/v1"
 
-# Данные для генерации
-OPERATORS = [
-    "НефтеГазПром", 
-    "СевернаяЭнерго", 
-    "АрктикОйл", 
-    "СибирьГаз", 
-    "УралНефть"
-]
-
-FIELDS_DATA = [
-    {"name": "Северное Сияние", "operator": "НефтеГазПром", "complexes": 4},
-    {"name": "Белый Медведь", "operator": "НефтеГазПром", "complexes": 4},
-    {"name": "Полярная Звезда", "operator": "СевернаяЭнерго", "complexes": 4},
-    {"name": "Золотая Тундра", "operator": "АрктикОйл", "complexes": 3},
-    {"name": "Синий Кит", "operator": "СевернаяЭнерго", "complexes": 3},
-    {"name": "Морозное Утро", "operator": "СибирьГаз", "complexes": 2},
-    {"name": "Снежный Барс", "operator": "УралНефть", "complexes": 2},
-    {"name": "Ледяной Дракон", "operator": "АрктикОйл", "complexes": 2},
-    {"name": "Северный Ветер", "operator": "СибирьГаз", "complexes": 1},
-    {"name": "Кристальное", "operator": "УралНефть", "complexes": 1}
-]
-
-COMPLEXES = ["турон", "сеноман", "неоком", "ачимовка"]
-FLUID_TYPES = ["газ", "нефть", "конденсат"]
-
-# Дебиты скважин (в сутки)
-GAS_DEBIT_RANGE = (50000, 800000)  # м3/сут
-OIL_DEBIT_RANGE = (20, 100)  # т/сут
-CONDENSATE_RATIO_RANGE = (50, 150)  # г/м3
-
 
 class DatabasePopulator:
-    def __init__(self):
+    def __init__(self, mode: str = "single", batch_size: int = 1000, concurrency: int = 1, method: str = "insert"):
         self.session = None
+        self.mode = mode
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.method = method  # Способ вставки для /production/bulk
+        self.semaphore = asyncio.Semaphore(concurrency)
+        # Пропускная способность по типам сущностей
+        self.stats: Dict[str, Dict[str, float]] = {}
         self.created_data = {
             'fields': [],
             'development_objects': [],
@@ -57,15 +55,29 @@ class DatabasePopulator:
         }
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        # Пул соединений по числу одновременных запросов; соединения переиспользуются
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            limit_per_host=self.concurrency,
+            keepalive_timeout=60,
+            ttl_dns_cache=300
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=600)
+        )
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.session:
             await self.session.close()
     
-    async def make_request(self, method: str, endpoint: str, data: Any = None) -> Dict:
-        """Выполнение HTTP запроса к API"""
+    async def make_request(self, method: str, endpoint: str, data: Any = None, params: Dict = None) -> Dict:
+        """Выполнение HTTP запроса к API (не более concurrency одновременно)"""
+        async with self.semaphore:
+            return await self._send_request(method, endpoint, data, params)
+    
+    async def _send_request(self, method: str, endpoint: str, data: Any = None, params: Dict = None) -> Dict:
         url = f"{API_BASE_URL}{endpoint}"
         
         try:
@@ -79,7 +91,7 @@ class DatabasePopulator:
             
             elif method.upper() == 'POST':
                 headers = {'Content-Type': 'application/json'}
-                async with self.session.post(url, json=data, headers=headers) as response:
+                async with self.session.post(url, json=data, params=params, headers=headers) as response:
                     result = await response.json()
                     if response.status >= 400:
                         print(f"❌ Ошибка POST {url}: {response.status} - {result}")
@@ -90,20 +102,67 @@ class DatabasePopulator:
             print(f"❌ Исключение при запросе {method} {url}: {e}")
             return {}
     
+    async def create_many(self, entity: str, endpoint: str, records: List[Dict]) -> List[Dict]:
+        """
+        Создание записей одного типа: по одной (POST endpoint) или пачками
+        (POST endpoint/bulk) - запросы выполняются параллельно
+        
+        Возвращает созданные записи в порядке входных; записи из неудачных
+        запросов пропускаются.
+        """
+        started = time.perf_counter()
+        
+        if self.mode == "bulk":
+            batches = [records[i:i + self.batch_size] for i in range(0, len(records), self.batch_size)]
+            params = {"method": self.method} if endpoint == "/production" else None
+            responses = await asyncio.gather(*(
+                self.make_request('POST', f"{endpoint}/bulk", batch, params) for batch in batches
+            ))
+            # Эндпоинты /bulk возвращают ID в порядке входных записей
+            created = [
+                {**record, "id": record_id}
+                for batch, response in zip(batches, responses) if response
+                for record, record_id in zip(batch, response["ids"])
+            ]
+            requests = len(batches)
+        else:
+            responses = await asyncio.gather(*(
+                self.make_request('POST', endpoint, record) for record in records
+            ))
+            created = [response for response in responses if response]
+            requests = len(records)
+        
+        stats = self.stats.setdefault(entity, {"records": 0, "requests": 0, "errors": 0, "seconds": 0.0})
+        stats["records"] += len(created)
+        stats["requests"] += requests
+        stats["errors"] += sum(1 for response in responses if not response)
+        stats["seconds"] += time.perf_counter() - started
+        return created
+    
+    def print_throughput(self):
+        """Отчет о пропускной способности по типам сущностей"""
+        print(f"⏱️  Пропускная способность (режим {self.mode}, параллельность {self.concurrency}):")
+        for entity, stats in self.stats.items():
+            seconds = stats["seconds"] or 1e-9
+            print(
+                f"  {entity:<20} {int(stats['records']):>9} записей за {stats['seconds']:7.2f} с: "
+                f"{stats['records'] / seconds:>10.1f} записей/с, {stats['requests'] / seconds:>8.1f} запросов/с, "
+                f"ошибок {int(stats['errors'])}"
+            )
+    
     async def create_fields(self) -> List[Dict]:
         """Создание месторождений"""
         print("🏭 Создание месторождений...")
         
-        fields = []
-        for field_data in FIELDS_DATA:
-            field = {
-                "name": field_data["name"],
-                "operator": field_data["operator"]
-            }
-            
-            result = await self.make_request('POST', '/fields', field)
-            if result:
-                fields.append(result)
+        fields_data = [
+            {"name": field_data["name"], "operator": field_data["operator"]}
+            for field_data in FIELDS_DATA
+        ]
+        fields = await self.create_many('fields', '/fields', fields_data)
+        
+        created_names = {field["name"] for field in fields}
+        for field in fields_data:
+            if field["name"] in created_names:
                 print(f"  ✅ Создано месторождение: {field['name']}")
             else:
                 print(f"  ❌ Ошибка создания месторождения: {field['name']}")
@@ -115,26 +174,26 @@ class DatabasePopulator:
         """Создание объектов разработки (комплексы отложений)"""
         print("🗻 Создание объектов разработки...")
         
-        dev_objects = []
+        fields_config = {field_data["name"]: field_data for field_data in FIELDS_DATA}
+        dev_objects_data = []
         
-        for i, field in enumerate(fields):
-            field_config = FIELDS_DATA[i]
+        for field in fields:
+            field_config = fields_config[field["name"]]
             complexes_count = field_config["complexes"]
             
             # Выбираем комплексы для этого месторождения
             field_complexes = COMPLEXES[:complexes_count]
             
             for complex_name in field_complexes:
-                dev_obj = {
+                dev_objects_data.append({
                     "name": f"{field['name']} - {complex_name.capitalize()}",
                     "field_id": field["id"],
                     "sediment_complex": complex_name
-                }
-                
-                result = await self.make_request('POST', '/development-objects', dev_obj)
-                if result:
-                    dev_objects.append(result)
-                    print(f"  ✅ Создан объект: {dev_obj['name']}")
+                })
+        
+        dev_objects = await self.create_many('development_objects', '/development-objects', dev_objects_data)
+        for dev_obj in dev_objects:
+            print(f"  ✅ Создан объект: {dev_obj['name']}")
         
         self.created_data['development_objects'] = dev_objects
         return dev_objects
@@ -143,7 +202,7 @@ class DatabasePopulator:
         """Создание скважин"""
         print("🔧 Создание скважин...")
         
-        wells = []
+        wells_data = []
         
         for field in fields:
             wells_count = random.randint(10, 50)
@@ -152,17 +211,16 @@ class DatabasePopulator:
                 # Определяем тип флюида для скважины
                 fluid_type = random.choice(FLUID_TYPES)
                 
-                well = {
+                wells_data.append({
                     "name": f"{field['name']}-{i+1:03d}",
                     "field_id": field["id"],
                     "fluid_type": fluid_type
-                }
-                
-                result = await self.make_request('POST', '/wells', well)
-                if result:
-                    wells.append(result)
+                })
             
-            print(f"  ✅ Создано {wells_count} скважин для {field['name']}")
+            print(f"  🔧 {wells_count} скважин для {field['name']}")
+        
+        wells = await self.create_many('wells', '/wells', wells_data)
+        print(f"  ✅ Создано {len(wells)} скважин")
         
         self.created_data['wells'] = wells
         return wells
@@ -171,7 +229,7 @@ class DatabasePopulator:
         """Создание флюидов для объектов разработки"""
         print("⛽ Создание флюидов...")
         
-        fluids = []
+        fluids_data = []
         
         for dev_obj in dev_objects:
             complex_name = dev_obj["sediment_complex"]
@@ -185,14 +243,12 @@ class DatabasePopulator:
                 fluid_types = ["газ"]
             
             for fluid_type in fluid_types:
-                fluid = {
+                fluids_data.append({
                     "fluid_type": fluid_type,
                     "development_object_id": dev_obj["id"]
-                }
-                
-                result = await self.make_request('POST', '/fluids', fluid)
-                if result:
-                    fluids.append(result)
+                })
+        
+        fluids = await self.create_many('fluids', '/fluids', fluids_data)
         
         print(f"  ✅ Создано {len(fluids)} флюидов")
         self.created_data['fluids'] = fluids
@@ -233,6 +289,9 @@ class DatabasePopulator:
         print("📊 Создание данных о добыче...")
         
         production_records = []
+        # Записи копятся, пока их не хватит на все параллельные запросы
+        pending_records = []
+        flush_size = self.batch_size * self.concurrency if self.mode == "bulk" else self.concurrency
         
         # Создаем данные за 10 лет (с января 2015 по декабрь 2024)
         start_date = date(2015, 1, 1)
@@ -312,16 +371,14 @@ class DatabasePopulator:
                                     
                                     batch_records.append(production)
             
-            # Отправляем данные пачками по 100 записей
-            for i in range(0, len(batch_records), 100):
-                batch = batch_records[i:i+100]
-                
-                for record in batch:
-                    result = await self.make_request('POST', '/production', record)
-                    if result:
-                        production_records.append(result)
+            print(f"    📝 Подготовлено {len(batch_records)} записей за {current_date.strftime('%B %Y')}")
             
-            print(f"    ✅ Создано {len(batch_records)} записей за {current_date.strftime('%B %Y')}")
+            pending_records.extend(batch_records)
+            if len(pending_records) >= flush_size or month == 119:
+                created = await self.create_many('production', '/production', pending_records)
+                production_records.extend(created)
+                print(f"    ✅ Создано {len(created)} из {len(pending_records)} записей")
+                pending_records = []
         
         self.created_data['production'] = production_records
         print(f"📊 Всего создано {len(production_records)} записей добычи")
@@ -368,16 +425,35 @@ class DatabasePopulator:
             print(f"  🔧 Скважин: {len(wells)}")
             print(f"  ⛽ Флюидов: {len(fluids)}")
             print(f"  📈 Записей добычи: {len(production)}")
+            print()
+            self.print_throughput()
             
         except Exception as e:
             print(f"❌ Критическая ошибка: {e}")
             raise
 
 
+def parse_args():
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Наполнение базы данных тестовыми данными через API")
+    parser.add_argument("--api-url", default=API_BASE_URL, help="Базовый URL API")
+    parser.add_argument("--mode", choices=["single", "bulk"], default="single",
+                        help="single - по одной записи на запрос, bulk - пачками через эндпоинты /bulk")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Записей в одном запросе в режиме bulk")
+    parser.add_argument("--concurrency", type=int, default=1, help="Одновременных запросов")
+    parser.add_argument("--method", choices=["orm", "insert", "copy"], default="insert",
+                        help="Способ вставки для /production/bulk")
+    return parser.parse_args()
+
+
 async def main():
     """Главная функция"""
+    global API_BASE_URL
+    args = parse_args()
+    API_BASE_URL = args.api_url.rstrip("/")
+    
     print("🔧 Скрипт наполнения базы данных")
-    print("Убедитесь, что backend API запущен на http://localhost:8000")
+    print(f"Убедитесь, что backend API запущен ({API_BASE_URL})")
     print()
     
     # Проверяем доступность API
@@ -391,11 +467,16 @@ async def main():
                 print("✅ Backend API доступен")
     except Exception as e:
         print(f"❌ Не удается подключиться к API: {e}")
-        print("   Убедитесь, что backend запущен на http://localhost:8000")
+        print(f"   Убедитесь, что backend запущен ({API_BASE_URL})")
         return
     
     # Запускаем наполнение
-    async with DatabasePopulator() as populator:
+    async with DatabasePopulator(
+        mode=args.mode,
+        batch_size=args.batch_size,
+        concurrency=max(args.concurrency, 1),
+        method=args.method
+    ) as populator:
         await populator.populate_database()
 
 
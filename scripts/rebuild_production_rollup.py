@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Скрипт для пересчета помесячной агрегации добычи (production_monthly)
+
+Используется после бэкфиллов и загрузок в обход API:
+    python scripts/rebuild_production_rollup.py
+    python scripts/rebuild_production_rollup.py --date-from 2020-01-01 --date-to 2020-12-31
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+from datetime import date
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.core.database import AsyncSessionLocal, init_db
+from backend.entities.analytics.rollup_service import production_rollup_service
+
+
+async def rebuild_rollup(date_from: date = None, date_to: date = None):
+    """Пересчитывает агрегаты за период (по умолчанию - за все время)"""
+    # Создаем таблицу агрегации, если ее еще нет
+    await init_db()
+
+    async with AsyncSessionLocal() as session:
+        try:
+            period = f"{date_from or '...'} - {date_to or '...'}"
+            print(f"🔄 Пересчет помесячной агрегации добычи за период {period}...")
+
+            rows = await production_rollup_service.rebuild(session, date_from, date_to)
+
+            print(f"✅ Агрегация пересчитана: {rows} строк")
+
+        except Exception as e:
+            print(f"❌ Ошибка при пересчете агрегации: {e}")
+            await session.rollback()
+            raise
+
+
+def parse_args():
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Пересчет помесячной агрегации добычи")
+    parser.add_argument("--date-from", type=date.fromisoformat, default=None,
+                        help="Начальная дата (YYYY-MM-DD), округляется до начала месяца")
+    parser.add_argument("--date-to", type=date.fromisoformat, default=None,
+                        help="Конечная дата (YYYY-MM-DD), округляется до конца месяца")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    asyncio.run(rebuild_rollup(args.date_from, args.date_to))
@@ -0,0 +1,214 @@
+"""
+Тесты кэша динамики добычи
+
+Не требуют запущенного API и базы данных
+"""
+import asyncio
+import sys
+import os
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.core.cache import InMemoryCacheBackend
+from backend.core.singleflight import SingleFlight
+from backend.entities.analytics.cache import CacheResetListener, DynamicsCache, normalize_params
+from backend.shared.enums import FluidTypeEnum, AggregationStepEnum, SedimentComplexEnum
+
+
+def make_params(field_ids=None, date_from=date(2020, 1, 1), date_to=date(2020, 12, 31)):
+    """Параметры запроса динамики газа по годам"""
+    return normalize_params(
+        date_from, date_to, FluidTypeEnum.GAS, field_ids, None, AggregationStepEnum.YEARLY
+    )
+
+
+def write(field_id, record_date, fluid_type=FluidTypeEnum.GAS):
+    """Запись добычи для инвалидации"""
+    return {"field_id": field_id, "date": record_date, "fluid_type": fluid_type}
+
+
+class TestDynamicsCache:
+    """Тесты ключей и инвалидации кэша"""
+
+    def test_params_are_normalized(self):
+        first = normalize_params(
+            date(2020, 1, 1), date(2020, 12, 31), "газ", [3, 1, 3],
+            [SedimentComplexEnum.NEOKOM, SedimentComplexEnum.ACH], "год"
+        )
+        second = normalize_params(
+            date(2020, 1, 1), date(2020, 12, 31), FluidTypeEnum.GAS, [1, 3],
+            [SedimentComplexEnum.ACH, SedimentComplexEnum.NEOKOM], AggregationStepEnum.YEARLY
+        )
+
+        assert first == second
+
+    def test_only_overlapping_entries_are_invalidated(self):
+        cache = DynamicsCache(InMemoryCacheBackend())
+        selected, everything = make_params([1, 2]), make_params()
+        cache.set(selected, "selected", cache.generation)
+        cache.set(everything, "everything", cache.generation)
+
+        # Другое месторождение - затрагивает только запрос по всем месторождениям
+        cache.invalidate_records([write(3, date(2020, 6, 1))])
+        assert cache.get(selected) == "selected"
+        assert cache.get(everything) is None
+
+        # Вне периода и другой флюид - ничего не затрагивают
+        cache.invalidate_records([write(1, date(2021, 1, 1)), write(1, date(2020, 6, 1), FluidTypeEnum.OIL)])
+        assert cache.get(selected) == "selected"
+
+        cache.invalidate_records([write(2, date(2020, 12, 31))])
+        assert cache.get(selected) is None
+
+    def test_result_computed_before_invalidation_is_not_stored(self):
+        cache = DynamicsCache(InMemoryCacheBackend())
+        params = make_params()
+        generation = cache.generation
+
+        cache.invalidate_records([write(1, date(2020, 6, 1))])
+        cache.set(params, "stale", generation)
+
+        assert cache.get(params) is None
+
+    def test_memory_budget_evicts_least_recently_used(self):
+        backend = InMemoryCacheBackend(max_bytes=100)
+        backend.set("a", 1, size=60)
+        backend.set("b", 2, size=30)
+        backend.get("a")
+        backend.set("c", 3, size=30)
+
+        assert backend.get("b") is None
+        assert backend.get("a") == 1
+        assert backend.stats()["evictions"] == 1
+
+
+class TestSingleFlight:
+    """Тесты объединения одновременных вычислений"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_computation(self):
+        flights = SingleFlight()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flights.do(make_params(), compute) for _ in range(5)))
+
+        assert calls == 1
+        assert [value for value, _ in results] == ["result"] * 5
+        assert sorted(coalesced for _, coalesced in results) == [False] + [True] * 4
+        assert flights.stats() == {"in_flight": 0, "leaders": 1, "coalesced": 4}
+
+    @pytest.mark.asyncio
+    async def test_error_is_shared_and_not_remembered(self):
+        flights = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("db is down")
+
+        results = await asyncio.gather(
+            flights.do("key", fail), flights.do("key", fail), return_exceptions=True
+        )
+        assert all(isinstance(item, RuntimeError) for item in results)
+
+        async def succeed():
+            return "ok"
+
+        assert await flights.do("key", succeed) == ("ok", False)
+
+    @pytest.mark.asyncio
+    async def test_request_after_write_does_not_join_earlier_computation(self, monkeypatch):
+        from backend.entities.analytics.cache import dynamics_cache
+        from backend.entities.analytics.service import analytics_service
+
+        calls = 0
+
+        async def compute(db, **kwargs):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return SimpleNamespace(fields=[], reporting_dates=[])
+
+        monkeypatch.setattr(analytics_service, "get_production_dynamics", compute)
+        monkeypatch.setattr(dynamics_cache, "enabled", False)
+
+        async def request():
+            return await analytics_service.get_production_dynamics_cached(
+                date(2020, 1, 1), date(2020, 12, 31), FluidTypeEnum.GAS
+            )
+
+        before = asyncio.ensure_future(request())
+        await asyncio.sleep(0)
+        dynamics_cache.invalidate_all()
+        after = await request()
+
+        assert calls == 2
+        assert after[1] == "MISS"
+        assert (await before)[1] == "MISS"
+
+
+class FakeDriverConnection:
+    """Соединение драйвера с LISTEN (как asyncpg)"""
+
+    def __init__(self):
+        self.listeners = {}
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    async def remove_listener(self, channel, callback):
+        assert self.listeners.pop(channel) == callback
+
+    def notify(self, channel):
+        self.listeners[channel](self, 4242, channel, "")
+
+
+class FakeEngine:
+    """Движок, выдающий одно соединение"""
+
+    def __init__(self):
+        self.driver_connection = FakeDriverConnection()
+        self.closed = False
+
+    async def connect(self):
+        engine = self
+
+        class Connection:
+            async def get_raw_connection(self):
+                return SimpleNamespace(driver_connection=engine.driver_connection)
+
+            async def close(self):
+                engine.closed = True
+
+        return Connection()
+
+
+class TestCacheResetListener:
+    """Тесты сброса кэша по NOTIFY из скриптов"""
+
+    @pytest.mark.asyncio
+    async def test_notify_clears_cache_and_stop_unsubscribes(self):
+        cache = DynamicsCache(InMemoryCacheBackend(max_entries=10))
+        cache.set(make_params(), "cached", cache.generation)
+        engine = FakeEngine()
+        listener = CacheResetListener(cache, channel="reset")
+
+        await listener.start(engine)
+        engine.driver_connection.notify("reset")
+
+        assert cache.get(make_params()) is None
+        assert cache.generation == 1
+
+        await listener.stop()
+        assert engine.driver_connection.listeners == {}
+        assert engine.closed
@@ -0,0 +1,87 @@
+"""
+Тесты бинарного формата динамики добычи и выбора формата ответа
+
+Не требуют запущенного API и базы данных
+"""
+import sys
+import os
+from datetime import date, datetime
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.entities.analytics.encoding import DYNAMICS_BINARY_MEDIA_TYPE, encode_dynamics, decode_dynamics
+from backend.entities.analytics.schema import (
+    ProductionDynamicsResponseSchema,
+    ProductionDynamicsMetadata,
+    ProductionDynamicsMetadataRequest,
+    ProductionDynamicsMetadataResponse,
+    FieldProductionData,
+    TotalProductionData
+)
+from backend.shared.content_negotiation import negotiate_media_type
+from backend.shared.enums import FluidTypeEnum, AggregationStepEnum, UnitEnum
+
+
+def make_response(fields):
+    """Ответ динамики с заданными рядами по месторождениям"""
+    periods = len(fields[0][2]) if fields else 0
+    return ProductionDynamicsResponseSchema(
+        metadata=ProductionDynamicsMetadata(
+            request=ProductionDynamicsMetadataRequest(
+                date_from=date(2020, 1, 1), date_to=date(2020, 12, 31), fluid_type=FluidTypeEnum.GAS,
+                field_ids=None, sediment_complexes=None, aggregation_step=AggregationStepEnum.QUARTERLY
+            ),
+            response=ProductionDynamicsMetadataResponse(
+                total_fields=len(fields), total_periods=periods, unit=UnitEnum.CUBIC_METERS,
+                generated_at=datetime(2024, 1, 1, 12, 0)
+            )
+        ),
+        reporting_dates=[f"2020-Q{quarter}" for quarter in range(1, periods + 1)],
+        fields=[FieldProductionData(field_id=i, field_name=n, production_by_period=p) for i, n, p in fields],
+        total=TotalProductionData(production_by_period=[sum(column) for column in zip(*(p for _, _, p in fields))])
+    )
+
+
+class TestDynamicsEncoding:
+    """Тесты кодирования ответа динамики"""
+
+    def test_round_trip_matches_json(self):
+        result = make_response([(1, "Северное", [0.1, 2.5, 1e12]), (2, "Южное «Б»", [0.0, -0.0, 3.25])])
+
+        payload = encode_dynamics(result)
+
+        assert payload[:4] == b"PDYN"
+        assert decode_dynamics(payload).model_dump_json() == result.model_dump_json()
+
+    def test_numeric_data_is_aligned(self):
+        payload = encode_dynamics(make_response([(1, "А", [1.0, 2.0])]))
+        header_length = int.from_bytes(payload[8:12], "little")
+
+        assert (12 + header_length) % 8 == 0
+        assert len(payload) == 12 + header_length + (1 + 1) * 2 * 8
+
+    def test_empty_result(self):
+        result = make_response([])
+
+        assert decode_dynamics(encode_dynamics(result)).model_dump_json() == result.model_dump_json()
+
+
+class TestContentNegotiation:
+    """Тесты выбора формата по заголовку Accept"""
+
+    offered = ["application/json", DYNAMICS_BINARY_MEDIA_TYPE]
+
+    def test_json_is_default(self):
+        assert negotiate_media_type(None, self.offered) == "application/json"
+        assert negotiate_media_type("*/*", self.offered) == "application/json"
+        assert negotiate_media_type("text/html", self.offered) == "application/json"
+
+    def test_binary_by_explicit_accept(self):
+        assert negotiate_media_type(DYNAMICS_BINARY_MEDIA_TYPE, self.offered) == DYNAMICS_BINARY_MEDIA_TYPE
+        assert negotiate_media_type(
+            f"application/json;q=0.5, {DYNAMICS_BINARY_MEDIA_TYPE}", self.offered
+        ) == DYNAMICS_BINARY_MEDIA_TYPE
+        assert negotiate_media_type(
+            f"{DYNAMICS_BINARY_MEDIA_TYPE};q=0, */*", self.offered
+        ) == "application/json"
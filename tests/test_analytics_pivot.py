@@ -0,0 +1,52 @@
+"""
+Тесты сведения динамики добычи в матрицу месторождение × период
+
+Не требуют запущенного API и базы данных
+"""
+import sys
+import os
+from decimal import Decimal
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.entities.analytics.pivot import pivot_production
+from backend.shared.enums import AggregationStepEnum
+
+
+class TestProductionPivot:
+    """Тесты построения матрицы добычи"""
+
+    def test_fields_keep_query_order_and_periods_are_sorted(self):
+        rows = [
+            (7, "Южное", 2021, 1.5, 2),
+            (3, "Северное", 2020, 2.0, 11),
+            (7, "Южное", 2020, 0.25, 11),
+        ]
+
+        pivot = pivot_production(rows, AggregationStepEnum.MONTHLY)
+
+        assert pivot.reporting_dates == ["2020-11", "2021-02"]
+        assert pivot.field_ids == [7, 3]
+        assert pivot.field_names == ["Южное", "Северное"]
+        assert pivot.matrix.tolist() == [[0.25, 1.5], [2.0, 0.0]]
+        assert pivot.totals.tolist() == [2.25, 1.5]
+
+    def test_totals_match_sequential_summation(self):
+        amounts = [0.1, 0.2, 0.3, 1e16, -1e16, 0.7]
+        rows = [(field_id, f"Поле {field_id}", Decimal(2020), Decimal(str(amount)), Decimal(3))
+                for field_id, amount in enumerate(amounts, start=1)]
+
+        pivot = pivot_production(rows, AggregationStepEnum.QUARTERLY)
+
+        expected = 0.0
+        for amount in amounts:
+            expected += amount
+        assert pivot.reporting_dates == ["2020-Q3"]
+        assert pivot.totals.tolist() == [expected]
+
+    def test_empty_result(self):
+        pivot = pivot_production([], AggregationStepEnum.YEARLY)
+
+        assert pivot.reporting_dates == [] and pivot.field_ids == []
+        assert pivot.totals.tolist() == []
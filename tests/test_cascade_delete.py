@@ -0,0 +1,263 @@
+"""
+Тесты каскадного удаления сущностей без загрузки зависимых строк
+
+Не требуют запущенного API и базы данных
+"""
+import sys
+import os
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import inspect
+from sqlalchemy.dialects import postgresql
+
+from backend.core import models  # noqa: F401 - регистрация всех моделей
+from backend.core.exceptions import NotFoundError
+from backend.entities.analytics.model import ProductionMonthly
+from backend.entities.analytics.rollup_service import production_rollup_service
+from backend.entities.development_object.model import DevelopmentObject
+from backend.entities.field import router as field_router
+from backend.entities.field.model import Field
+from backend.entities.jobs.service import job_service
+from backend.entities.production import cascade
+from backend.entities.production.cascade import cascade_delete_service
+from backend.entities.production.model import Production
+from backend.entities.production.service import production_service
+from backend.shared.dependencies import get_db
+from backend.shared.enums import FluidTypeEnum, JobStatusEnum
+
+
+class FakeDB:
+    """Сессия, запоминающая выражения и возвращающая заданные результаты"""
+
+    def __init__(self, rows=(), scalars=()):
+        self.rows = list(rows)
+        self.scalars = list(scalars)
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return iter(self.rows)
+
+    async def scalar(self, statement):
+        self.statements.append(statement)
+        return self.scalars.pop(0)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+    async def close(self):
+        pass
+
+
+def compile_sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.fixture
+def applied_deltas(monkeypatch):
+    """Приращения, переданные в помесячную агрегацию"""
+    calls = []
+
+    async def apply_deltas(db, deltas):
+        calls.append(deltas)
+
+    monkeypatch.setattr(production_rollup_service, "apply_deltas", apply_deltas)
+    return calls
+
+
+class TestCascadeDeletePlan:
+    """Тесты порядка set-based удаления"""
+
+    def test_field_is_deleted_after_dependents(self):
+        conditions, statements = cascade_delete_service._plan(Field, 7)
+
+        tables = [statement.table.name for statement in statements]
+        assert str(conditions[0].left) == "production.field_id"
+        assert tables == ["fluids", "wells", "production_monthly", "development_objects", "fields"]
+
+    def test_development_object_removes_its_fluids_and_rollup(self):
+        _, statements = cascade_delete_service._plan(DevelopmentObject, 3)
+
+        assert [statement.table.name for statement in statements] == [
+            "fluids", "production_monthly", "development_objects"
+        ]
+
+    def test_unsupported_model_is_rejected(self):
+        with pytest.raises(ValueError):
+            cascade_delete_service._plan(Production, 1)
+
+
+class TestCascadeSchema:
+    """Тесты каскада на уровне БД и ORM"""
+
+    def test_foreign_keys_cascade_on_delete(self):
+        for table in (Production.__table__, ProductionMonthly.__table__):
+            for key in table.foreign_keys:
+                assert key.ondelete == "CASCADE", key
+
+    def test_orm_does_not_load_children_on_delete(self):
+        for relationship in inspect(Field).relationships:
+            if relationship.direction.name == "ONETOMANY":
+                assert relationship.passive_deletes, relationship
+
+
+class TestDeleteWhere:
+    """Тесты set-based удаления записей добычи с корректировкой агрегатов"""
+
+    @pytest.mark.asyncio
+    async def test_delete_returning_is_grouped_into_negative_deltas(self, applied_deltas):
+        db = FakeDB(rows=[
+            (1, 2, FluidTypeEnum.GAS, date(2020, 1, 1), Decimal("-30.5"), 3, date(2020, 1, 5), date(2020, 1, 20)),
+            (1, 4, FluidTypeEnum.OIL, date(2020, 3, 1), Decimal("-7"), 1, date(2020, 3, 9), date(2020, 3, 9)),
+        ])
+
+        deleted, bounds = await production_service.delete_where(db, [Production.field_id == 1])
+
+        sql = compile_sql(db.statements[0])
+        assert sql.startswith("WITH removed AS \n(DELETE FROM production WHERE production.field_id = ")
+        assert "RETURNING production.field_id, production.development_object_id" in sql
+        assert "-removed.amount" in sql
+        assert "GROUP BY removed.field_id, removed.development_object_id, removed.fluid_type" in sql
+        assert "LIMIT" not in sql
+
+        assert deleted == 4
+        assert applied_deltas == [{
+            (1, 2, FluidTypeEnum.GAS, date(2020, 1, 1)): [Decimal("-30.5"), -3],
+            (1, 4, FluidTypeEnum.OIL, date(2020, 3, 1)): [Decimal("-7"), -1],
+        }]
+        assert bounds == [
+            {"fluid_type": FluidTypeEnum.GAS, "field_id": 1, "date": date(2020, 1, 5)},
+            {"fluid_type": FluidTypeEnum.GAS, "field_id": 1, "date": date(2020, 1, 20)},
+            {"fluid_type": FluidTypeEnum.OIL, "field_id": 1, "date": date(2020, 3, 9)},
+            {"fluid_type": FluidTypeEnum.OIL, "field_id": 1, "date": date(2020, 3, 9)},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_limit_deletes_one_batch_by_primary_key(self, applied_deltas):
+        db = FakeDB()
+
+        deleted, bounds = await production_service.delete_where(db, [Production.well_id == 5], limit=1000)
+
+        sql = compile_sql(db.statements[0])
+        assert "WHERE (production.id, production.date) IN (SELECT production.id, production.date" in sql
+        assert "WHERE production.well_id = " in sql
+        assert "LIMIT " in sql
+        assert (deleted, bounds) == (0, [])
+        assert applied_deltas == [{}]
+
+
+class TestCascadeDeleteService:
+    """Тесты удаления сущности с зависимыми данными"""
+
+    @pytest.mark.asyncio
+    async def test_missing_entity_raises_not_found(self):
+        db = FakeDB(scalars=[None])
+
+        with pytest.raises(NotFoundError):
+            await cascade_delete_service.delete(db, Field, 7)
+        assert db.commits == 0
+
+    @pytest.mark.asyncio
+    async def test_batches_commit_separately_and_report_progress(self, monkeypatch):
+        batches = [(2, [{"fluid_type": "газ", "field_id": 7, "date": date(2020, 1, 1)}]), (1, []), (0, [])]
+        limits = []
+
+        async def delete_where(db, conditions, limit=None):
+            limits.append(limit)
+            return batches.pop(0)
+
+        invalidated = []
+        monkeypatch.setattr(production_service, "delete_where", delete_where)
+        monkeypatch.setattr(cascade.dynamics_cache, "invalidate_records", invalidated.append)
+
+        db = FakeDB(scalars=[7])
+        job = job_service.create("field_delete")
+        deleted = await cascade_delete_service.delete(db, Field, 7, batch_size=2, job=job)
+
+        # Пачка меньше batch_size - последняя
+        assert deleted == 3
+        assert limits == [2, 2]
+        assert job.processed == 3
+        # Две пачки добычи и завершающая транзакция со справочниками
+        assert db.commits == 3
+        assert [statement.table.name for statement in db.statements[1:]] == [
+            "fluids", "wells", "production_monthly", "development_objects", "fields"
+        ]
+        assert invalidated[0] == [{"fluid_type": "газ", "field_id": 7, "date": date(2020, 1, 1)}]
+
+    @pytest.mark.asyncio
+    async def test_failure_rolls_back_and_fails_job(self, monkeypatch):
+        db = FakeDB(scalars=[10, 7])
+
+        async def delete_where(db, conditions, limit=None):
+            raise RuntimeError("lock timeout")
+
+        class Session:
+            async def __aenter__(self):
+                return db
+
+            async def __aexit__(self, *args):
+                return False
+
+        monkeypatch.setattr(production_service, "delete_where", delete_where)
+        monkeypatch.setattr(cascade, "AsyncSessionLocal", Session)
+
+        job = job_service.create("field_delete")
+        await cascade_delete_service.run_job(Field, 7, job, batch_size=100)
+
+        assert job.total == 10
+        assert job.status == JobStatusEnum.FAILED
+        assert job.error == "lock timeout"
+        assert db.rollbacks == 1
+
+
+class TestFieldDeleteEndpoint:
+    """Тесты фонового удаления месторождения через API"""
+
+    def make_client(self, monkeypatch, exists=True):
+        async def get_by_id_or_404(db, id):
+            if not exists:
+                raise NotFoundError(f"Field with id {id} not found")
+
+        started = []
+
+        async def run_job(model, id, job, batch_size):
+            started.append((model, id, job.id, batch_size))
+
+        monkeypatch.setattr(field_router.field_service, "get_by_id_or_404", get_by_id_or_404)
+        monkeypatch.setattr(cascade_delete_service, "run_job", run_job)
+
+        app = FastAPI()
+        app.include_router(field_router.router)
+        app.dependency_overrides[get_db] = lambda: FakeDB()
+        return TestClient(app), started
+
+    def test_background_delete_returns_job(self, monkeypatch):
+        client, started = self.make_client(monkeypatch)
+
+        response = client.delete("/fields/7", params={"background": "true", "batch_size": 500, "job_id": "del-7"})
+
+        assert response.status_code == 202
+        assert response.json()["id"] == "del-7"
+        assert response.json()["details"] == {"field_id": 7}
+        assert started == [(Field, 7, "del-7", 500)]
+        assert job_service.get("del-7").kind == "field_delete"
+
+    def test_background_delete_of_missing_field_is_404(self, monkeypatch):
+        client, started = self.make_client(monkeypatch, exists=False)
+
+        assert client.delete("/fields/7", params={"background": "true"}).status_code == 404
+        assert started == []
@@ -0,0 +1,46 @@
+"""
+Тесты ленивых сессий: соединение из пула берется только при обращении к базе
+
+Используют SQLite (aiosqlite) во временном файле, PostgreSQL не требуется
+"""
+import sys
+import os
+
+import pytest
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from backend.core.database import LazySession, session_stats
+from backend.core.pool import InstrumentedPool, pool_stats
+
+
+class TestLazySession:
+    """Тесты LazySession"""
+
+    @pytest.mark.asyncio
+    async def test_unused_session_does_not_touch_pool(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'lazy.db'}", poolclass=InstrumentedPool)
+        factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        before = session_stats()
+        try:
+            session = LazySession(factory)
+            await session.rollback()
+            await session.close()
+
+            assert not session.started
+            assert pool_stats(engine)["checkouts"] == 0
+            assert session_stats()["unused"] == before["unused"] + 1
+
+            session = LazySession(factory)
+            assert (await session.execute(text("SELECT 1"))).scalar() == 1
+            await session.close()
+
+            assert session.started
+            assert pool_stats(engine)["checkouts"] == 1
+            assert session_stats()["opened"] == before["opened"] + 1
+        finally:
+            await engine.dispose()
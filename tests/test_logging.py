@@ -0,0 +1,86 @@
+"""
+Тесты конвейера логирования: очередь, форматирование и усечение данных
+
+Не требуют запущенного API и базы данных
+"""
+import json
+import logging
+import queue
+import sys
+import os
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.core.logging import JSONFormatter, LogPayload, NonBlockingQueueHandler, _parse_levels
+
+
+class _Formatted:
+    """Объект, отмечающий построение своего строкового представления"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self):
+        self.calls += 1
+        return "formatted"
+
+
+def _record(message, *args, **extra):
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, message, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestQueueHandler:
+    """Тесты передачи записей в очередь"""
+
+    def test_record_is_enqueued_unformatted(self):
+        log_queue = queue.Queue()
+        handler = NonBlockingQueueHandler(log_queue)
+        payload = _Formatted()
+
+        handler.handle(_record("data: %s", payload))
+
+        record = log_queue.get_nowait()
+        assert payload.calls == 0
+        assert record.args == (payload,)
+        assert record.getMessage() == "data: formatted"
+
+    def test_full_queue_drops_records(self):
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+
+        handler.handle(_record("first"))
+        handler.handle(_record("second"))
+
+        assert handler.dropped == 1
+
+
+class TestLogPayload:
+    """Тесты представления данных в логах"""
+
+    def test_long_list_is_summarized(self):
+        rows = [{"id": i} for i in range(10000)]
+        assert str(LogPayload(rows)) == "[10000 items, first: {'id': 0}]"
+
+    def test_payload_is_truncated(self):
+        text = str(LogPayload({"comment": "x" * 1000}, limit=50))
+        assert text.startswith("{'comment': 'xxx")
+        assert text.endswith("[truncated, 1015 chars]")
+        assert len(text) < 100
+
+
+class TestFormatting:
+    """Тесты формата записей и настройки уровней"""
+
+    def test_json_formatter_includes_extra(self):
+        line = JSONFormatter().format(_record("rows: %s", 5, request_id="abc"))
+        data = json.loads(line)
+        assert data["message"] == "rows: 5"
+        assert data["level"] == "INFO"
+        assert data["logger"] == "test"
+        assert data["request_id"] == "abc"
+
+    def test_parse_levels(self):
+        levels = _parse_levels("sqlalchemy.engine=warning, uvicorn.access=ERROR,broken,x=NOPE")
+        assert levels == {"sqlalchemy.engine": logging.WARNING, "uvicorn.access": logging.ERROR}
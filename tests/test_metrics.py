@@ -0,0 +1,49 @@
+"""
+Тесты реестра метрик и текстового формата Prometheus
+
+Не требуют запущенного API и базы данных
+"""
+import sys
+import os
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.core.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry:
+    """Тесты рендеринга метрик"""
+
+    def test_counter_with_labels(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("rows_total", "Rows written", ("method",))
+        counter.labels("copy").inc(10)
+        counter.labels("copy").inc(5)
+        counter.labels('in"sert').inc()
+
+        lines = registry.render().splitlines()
+        assert lines[:2] == ["# HELP rows_total Rows written", "# TYPE rows_total counter"]
+        assert 'rows_total{method="copy"} 15.0' in lines
+        assert 'rows_total{method="in\\"sert"} 1.0' in lines
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        lines = registry.render().splitlines()
+        assert 'latency_seconds_bucket{le="0.1"} 2' in lines
+        assert 'latency_seconds_bucket{le="1.0"} 3' in lines
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in lines
+        assert "latency_seconds_sum 3.65" in lines
+        assert "latency_seconds_count 4" in lines
+
+    def test_collector_values_are_read_on_render(self):
+        registry = MetricsRegistry()
+        state = {"size": 1}
+        registry.register_collector(lambda: [("pool_size", "gauge", "Pool size", [({"engine": "primary"}, state["size"])])])
+
+        state["size"] = 7
+        assert 'pool_size{engine="primary"} 7' in registry.render().splitlines()
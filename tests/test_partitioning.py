@@ -0,0 +1,104 @@
+"""
+Тесты расчета периодов и имен секций
+
+Не требуют запущенного API и базы данных
+"""
+import sys
+import os
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import Column, Date, Integer, MetaData, Table
+
+from backend.core.database import _partition_index_name
+from backend.core.partitioning import RangePartitionManager
+from backend.shared.enums import PartitionIntervalEnum
+
+table = Table("readings", MetaData(), Column("id", Integer), Column("date", Date))
+
+
+class TestRangePartitionManager:
+    """Тесты границ секций"""
+
+    def test_monthly_partitions(self):
+        manager = RangePartitionManager(table, "date", PartitionIntervalEnum.MONTHLY)
+        start = manager.period_start(date(2020, 12, 31))
+
+        assert start == date(2020, 12, 1)
+        assert manager.next_period_start(start) == date(2021, 1, 1)
+        assert manager.partition_name(start) == "readings_m202012"
+        assert manager._parse_start("readings_m202012") == start
+
+    def test_yearly_partitions(self):
+        manager = RangePartitionManager(table, "date", PartitionIntervalEnum.YEARLY)
+        start = manager.period_start(date(2020, 6, 15))
+
+        assert start == date(2020, 1, 1)
+        assert manager.next_period_start(start) == date(2021, 1, 1)
+        assert manager._parse_start(manager.partition_name(start)) == start
+        assert manager._parse_start("readings_default") is None
+
+
+class FakeConnection:
+    """Соединение, отвечающее на запрос существующих секций"""
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def execute(self, statement, params):
+        names = [name for name in params["names"] if name in self.catalog]
+        return SimpleNamespace(scalars=lambda: names)
+
+
+class FakeEngine:
+    def __init__(self, catalog):
+        self.catalog = catalog
+
+    def connect(self):
+        return FakeConnection(self.catalog)
+
+
+class TestEnsurePartitions:
+    """Тесты проверки секций перед записью"""
+
+    @pytest.mark.asyncio
+    async def test_partition_dropped_by_another_process_is_recreated(self):
+        manager = RangePartitionManager(table, "date", PartitionIntervalEnum.YEARLY)
+        catalog = {"readings_y2020"}
+        created = []
+
+        async def create(engine, start):
+            created.append(start)
+            catalog.add(manager.partition_name(start))
+
+        manager._create_partition = create
+        engine = FakeEngine(catalog)
+
+        assert await manager.ensure_for_dates(engine, [date(2020, 5, 1)]) == 0
+        catalog.clear()  # секцию удалил scripts/clear_database.py
+        assert await manager.ensure_for_dates(engine, [date(2020, 5, 1)]) == 1
+        assert created == [date(2020, 1, 1)]
+
+
+class TestPartitionIndexNames:
+    """Тесты имен индексов секций"""
+
+    def test_names_fit_identifier_limit_and_stay_distinct(self):
+        assert _partition_index_name("production_y2020", "ix_production_well_id") == (
+            "production_y2020_ix_production_well_id"
+        )
+        first = _partition_index_name("production_m2020_01", "ix_production_fluid_type_date_field_covering")
+        second = _partition_index_name("production_m2020_01", "ix_production_fluid_type_date_field_covering2")
+        assert len(first) <= 63 and len(second) <= 63
+        assert first != second
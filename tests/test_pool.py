@@ -0,0 +1,66 @@
+"""
+Тесты пула соединений: прогрев, учет выдачи и таймаутов
+
+Используют SQLite (aiosqlite) во временном файле, PostgreSQL не требуется
+"""
+import sys
+import os
+
+import pytest
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.core.pool import InstrumentedPool, pool_stats, prewarm_pool
+
+
+def make_engine(tmp_path, **kwargs):
+    return create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedPool,
+        **kwargs
+    )
+
+
+class TestInstrumentedPool:
+    """Тесты статистики пула"""
+
+    @pytest.mark.asyncio
+    async def test_prewarm_fills_pool(self, tmp_path):
+        engine = make_engine(tmp_path, pool_size=3, max_overflow=2)
+        try:
+            # Прогрев ограничен постоянным размером пула
+            assert await prewarm_pool(engine, 10) == 3
+
+            stats = pool_stats(engine)
+            assert stats["checked_in"] == 3
+            assert stats["checked_out"] == 0
+            assert stats["connects"] == 3
+
+            # Последующие запросы используют готовые соединения
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                assert pool_stats(engine)["checked_out"] == 1
+            assert pool_stats(engine)["connects"] == 3
+            assert pool_stats(engine)["checkouts"] == 4
+        finally:
+            await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_timeout_is_counted(self, tmp_path):
+        engine = make_engine(tmp_path, pool_size=1, max_overflow=0, pool_timeout=0.05)
+        try:
+            async with engine.connect():
+                with pytest.raises(exc.TimeoutError):
+                    async with engine.connect():
+                        pass
+
+                stats = pool_stats(engine)
+                assert stats["timeouts"] == 1
+                assert stats["overflow"] == 0
+                assert stats["wait_ms_max"] >= 50
+        finally:
+            await engine.dispose()
@@ -0,0 +1,85 @@
+"""
+Тесты проверок массового исправления и удаления записей добычи
+
+Не требуют запущенного API и базы данных: проверки выполняются до запросов
+"""
+import sys
+import os
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from pydantic import ValidationError as PydanticValidationError
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.core import models  # noqa: F401 - регистрация всех моделей
+from backend.core.exceptions import ValidationError, ValueOutOfRangeError
+from backend.entities.production.schema import ProductionBulkUpdateSchema
+from backend.entities.production.service import production_service
+
+
+class FakeDB:
+    """Сессия, возвращающая наибольшее значение отобранных записей"""
+
+    def __init__(self, largest):
+        self.largest = largest
+
+    async def scalar(self, statement):
+        return self.largest
+
+
+class TestProductionBulkChecks:
+    """Тесты отказа в небезопасных массовых изменениях"""
+
+    @pytest.mark.asyncio
+    async def test_delete_without_filters_is_rejected(self):
+        with pytest.raises(ValidationError):
+            await production_service.bulk_delete(None, {})
+
+    @pytest.mark.asyncio
+    async def test_unknown_filters_do_not_count(self):
+        with pytest.raises(ValidationError):
+            await production_service.bulk_update(None, {"limit": 10}, {"amount": Decimal("1")})
+
+    @pytest.mark.asyncio
+    async def test_amount_and_factor_are_mutually_exclusive(self):
+        with pytest.raises(ValidationError):
+            await production_service.bulk_update(
+                None,
+                {"field_id": 1, "date_from": date(2024, 1, 1)},
+                {"amount": Decimal("1"), "amount_factor": Decimal("1.02")}
+            )
+
+    @pytest.mark.asyncio
+    async def test_empty_update_is_rejected(self):
+        with pytest.raises(ValidationError):
+            await production_service.bulk_update(None, {"field_id": 1}, {})
+
+    @pytest.mark.asyncio
+    async def test_factor_overflowing_column_is_rejected(self):
+        # amount - Numeric(15, 3): не больше 12 знаков до запятой
+        with pytest.raises(ValueOutOfRangeError):
+            await production_service.bulk_update(
+                FakeDB(Decimal("600000000000")), {"field_id": 1}, {"amount_factor": Decimal("2")}
+            )
+        with pytest.raises(ValueOutOfRangeError):
+            await production_service._check_amount_factor(
+                FakeDB(Decimal("999999999999.999")), [], Decimal("1.000000000000001")
+            )
+        await production_service._check_amount_factor(FakeDB(Decimal("499999999999.999")), [], Decimal("2"))
+        await production_service._check_amount_factor(FakeDB(None), [], Decimal("1000"))
+
+
+class TestProductionBulkUpdateSchema:
+    """Тесты схемы массового исправления"""
+
+    @pytest.mark.parametrize("factor", ["0", "-1.5"])
+    def test_factor_must_be_positive(self, factor):
+        with pytest.raises(PydanticValidationError):
+            ProductionBulkUpdateSchema(amount_factor=Decimal(factor))
+
+    def test_unit_is_rejected(self):
+        with pytest.raises(PydanticValidationError):
+            ProductionBulkUpdateSchema.model_validate({"amount_factor": "1.02", "unit": "т"})
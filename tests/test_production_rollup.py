@@ -0,0 +1,62 @@
+"""
+Тесты свертки изменений добычи в помесячные агрегаты
+
+Не требуют запущенного API и базы данных
+"""
+import sys
+import os
+from datetime import date
+from decimal import Decimal
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.entities.analytics.rollup_service import production_rollup_service, next_month_start
+from backend.shared.enums import FluidTypeEnum
+
+
+def make_record(amount, record_date=date(2020, 1, 1), fluid_type="газ"):
+    """Запись добычи для тестов"""
+    return {
+        "field_id": 1,
+        "development_object_id": 10,
+        "fluid_type": fluid_type,
+        "date": record_date,
+        "amount": amount,
+    }
+
+
+class TestProductionRollupDeltas:
+    """Тесты расчета приращений агрегатов"""
+
+    def test_records_of_one_month_are_summed(self):
+        deltas = production_rollup_service.collect_deltas(
+            [make_record(Decimal("1.5"), date(2020, 1, 1)), make_record(Decimal("2"), date(2020, 1, 20))],
+            []
+        )
+
+        assert deltas == {
+            (1, 10, FluidTypeEnum.GAS, date(2020, 1, 1)): [Decimal("3.5"), 2]
+        }
+
+    def test_update_is_applied_as_difference(self):
+        deltas = production_rollup_service.collect_deltas(
+            [make_record(Decimal("5"))],
+            [make_record(Decimal("2"), fluid_type=FluidTypeEnum.GAS)]
+        )
+
+        assert deltas == {
+            (1, 10, FluidTypeEnum.GAS, date(2020, 1, 1)): [Decimal("3"), 0]
+        }
+
+    def test_unchanged_update_produces_no_deltas(self):
+        deltas = production_rollup_service.collect_deltas(
+            [make_record(Decimal("5"))],
+            [make_record(Decimal("5"))]
+        )
+
+        assert deltas == {}
+
+    def test_next_month_start_crosses_year(self):
+        assert next_month_start(date(2020, 12, 31)) == date(2021, 1, 1)
+        assert next_month_start(date(2020, 2, 29)) == date(2020, 3, 1)
@@ -0,0 +1,110 @@
+"""
+Тесты разбора потоковой загрузки записей добычи
+
+Не требуют запущенного API и базы данных
+"""
+import sys
+import os
+
+import pytest
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.exc import IntegrityError
+
+from backend.core.exceptions import ValidationError
+from backend.entities.jobs.service import job_service
+from backend.entities.production.service import production_service
+from backend.entities.production.upload import MAX_LINE_BYTES, ProductionUploader, iter_raw_rows
+from backend.shared.enums import UploadFormatEnum
+
+
+async def stream_of(data: bytes, chunk_size: int = 7):
+    """Поток байтов, нарезанный на мелкие куски (в т.ч. посреди UTF-8 символа)"""
+    for i in range(0, len(data), chunk_size):
+        yield data[i:i + chunk_size]
+
+
+async def collect(data: bytes, upload_format: UploadFormatEnum):
+    """Все разобранные строки потока"""
+    return [row async for row in iter_raw_rows(stream_of(data), upload_format)]
+
+
+class TestUploadParsing:
+    """Тесты разбора CSV и NDJSON потоков"""
+
+    @pytest.mark.asyncio
+    async def test_csv_with_bom_and_empty_cells(self):
+        data = (
+            "﻿well_id,date,amount,unit,fluid_type\r\n"
+            "1,2020-01-01,5.5,,газ\r\n"
+        ).encode()
+
+        rows = await collect(data, UploadFormatEnum.CSV)
+
+        assert rows == [
+            (1, {"well_id": "1", "date": "2020-01-01", "amount": "5.5", "unit": None, "fluid_type": "газ"}, None)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_csv_row_with_wrong_column_count_is_rejected(self):
+        rows = await collect(b"a,b\n1,2\n3\n", UploadFormatEnum.CSV)
+
+        assert rows[1] == (2, None, "Expected 2 columns, got 1")
+
+    @pytest.mark.asyncio
+    async def test_ndjson_errors_do_not_stop_parsing(self):
+        data = '{"a": 1}\n{bad\n[1]\n\n{"b": "неоком"}'.encode()
+
+        rows = await collect(data, UploadFormatEnum.NDJSON)
+
+        assert [row for row, _, _ in rows] == [1, 2, 3, 4]
+        assert rows[0][1] == {"a": 1}
+        assert rows[1][2].startswith("Invalid JSON")
+        assert rows[2][2] == "Row must be a JSON object"
+        assert rows[3][1] == {"b": "неоком"}
+
+    @pytest.mark.asyncio
+    async def test_csv_quoted_field_may_contain_newline(self):
+        data = b'a,b\n1,"line one\nline two"\n2,"x"\n'
+
+        rows = await collect(data, UploadFormatEnum.CSV)
+
+        assert rows == [
+            (1, {"a": "1", "b": "line one\nline two"}, None),
+            (2, {"a": "2", "b": "x"}, None),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_line_limit_counts_bytes(self):
+        # Кириллица - два байта на символ: символов меньше лимита, байтов больше
+        data = ("a\n" + "ж" * (MAX_LINE_BYTES // 2 + 1) + "\n").encode()
+
+        with pytest.raises(ValidationError):
+            await collect(data, UploadFormatEnum.CSV)
+
+
+class TestUploadRejects:
+    """Тесты отклонения отдельных строк при ошибке записи пачки"""
+
+    @pytest.mark.asyncio
+    async def test_only_rows_rejected_by_database_are_reported(self, monkeypatch):
+        written = []
+
+        async def bulk_insert(db, records, method=None, commit=True):
+            if any(record["well_id"] == 999 for record in records):
+                raise IntegrityError("INSERT", {}, Exception("foreign key violation"))
+            written.extend(record["well_id"] for record in records)
+            return list(range(len(records)))
+
+        monkeypatch.setattr(production_service, "bulk_insert", bulk_insert)
+        lines = ["well_id,fluid_id,date,amount,fluid_type,field_id,development_object_id"]
+        lines += [f"{well_id},1,2020-01-01,1.5,газ,1,1" for well_id in (1, 2, 999, 4, 5, 999, 7)]
+
+        uploader = ProductionUploader(None, job_service.create("test_upload"), chunk_size=100)
+        await uploader.run(stream_of("\n".join(lines).encode()), UploadFormatEnum.CSV)
+
+        assert sorted(written) == [1, 2, 4, 5, 7]
+        assert uploader.inserted == 5
+        assert [reject.row for reject in uploader.rejects] == [3, 6]
@@ -0,0 +1,102 @@
+"""
+Тесты маршрутизации чтения: привязка клиента к основному серверу после записи
+
+Не требуют запущенного API и базы данных
+"""
+import sys
+import os
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.testclient import TestClient
+
+from backend.core import database, middleware
+from backend.core.config import settings
+from backend.core.middleware import PRIMARY_PIN_COOKIE, ReadYourWritesMiddleware
+
+FRONTEND_ORIGIN = "http://localhost:3000"
+
+
+def make_client(monkeypatch) -> TestClient:
+    monkeypatch.setattr(middleware, "has_replica", lambda: True)
+    monkeypatch.setattr(middleware.settings, "DB_READ_YOUR_WRITES_SECONDS", 5.0)
+
+    # Middleware в том же порядке и с теми же настройками CORS, что в main.py
+    app = FastAPI()
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    @app.get("/items")
+    async def read_items():
+        return {"primary": database._primary_pinned.get()}
+
+    @app.post("/items")
+    async def create_item():
+        return {"primary": database._primary_pinned.get()}
+
+    @app.post("/fail", status_code=422)
+    async def failed_write():
+        return {}
+
+    return TestClient(app)
+
+
+class TestReadYourWrites:
+    """Тесты middleware read-your-writes"""
+
+    def test_reads_go_to_replica_without_writes(self, monkeypatch):
+        client = make_client(monkeypatch)
+        response = client.get("/items")
+
+        assert response.json() == {"primary": False}
+        assert PRIMARY_PIN_COOKIE not in response.cookies
+
+    def test_write_pins_following_reads_to_primary(self, monkeypatch):
+        client = make_client(monkeypatch)
+        response = client.post("/items")
+
+        assert PRIMARY_PIN_COOKIE in response.cookies
+        assert "Max-Age=5" in response.headers["set-cookie"]
+        assert client.get("/items").json() == {"primary": True}
+
+    def test_expired_or_failed_write_does_not_pin(self, monkeypatch):
+        client = make_client(monkeypatch)
+
+        assert PRIMARY_PIN_COOKIE not in client.post("/fail").cookies
+        client.cookies.set(PRIMARY_PIN_COOKIE, "1.0")
+        assert client.get("/items").json() == {"primary": False}
+
+    def test_pin_cookie_round_trips_for_cross_origin_frontend(self, monkeypatch):
+        client = make_client(monkeypatch)
+        origin = {"Origin": FRONTEND_ORIGIN}
+
+        preflight = client.options(
+            "/items", headers={**origin, "Access-Control-Request-Method": "POST"}
+        )
+        assert preflight.headers["access-control-allow-origin"] == FRONTEND_ORIGIN
+        assert preflight.headers["access-control-allow-credentials"] == "true"
+
+        # Браузер сохраняет cookie ответа на запрос с credentials, только если
+        # origin указан явно и разрешена передача учетных данных
+        response = client.post("/items", headers=origin)
+        assert response.headers["access-control-allow-origin"] == FRONTEND_ORIGIN
+        assert response.headers["access-control-allow-credentials"] == "true"
+        assert PRIMARY_PIN_COOKIE in response.cookies
+
+        assert client.get("/items", headers=origin).json() == {"primary": True}
+
+    def test_forged_pin_beyond_window_is_ignored(self, monkeypatch):
+        client = make_client(monkeypatch)
+
+        for value in ("1e18", "inf", "nan"):
+            client.cookies.set(PRIMARY_PIN_COOKIE, value)
+            assert client.get("/items").json() == {"primary": False}, value
@@ -0,0 +1,47 @@
+"""
+Тесты быстрой сериализации JSON-ответов
+
+Не требуют запущенного API и базы данных
+"""
+import sys
+import os
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from backend.core.responses import FastJSONResponse
+from backend.entities.production.schema import ProductionResponseSchema
+from backend.shared.base_schema import PaginatedResponse
+from backend.shared.enums import FluidTypeEnum, UnitEnum
+
+
+class TestFastJSONResponse:
+    """Тесты совпадения с ответами стандартного пути FastAPI"""
+
+    def test_model_matches_standard_serialization(self):
+        record = ProductionResponseSchema(
+            id=1, created_at=datetime(2024, 1, 1, 12, 0, 0, 500), updated_at=datetime(2024, 1, 2),
+            well_id=1, fluid_id=2, date=date(2020, 5, 1), amount=Decimal("12.500"),
+            unit=UnitEnum.CUBIC_METERS, fluid_type=FluidTypeEnum.GAS, field_id=3, development_object_id=4
+        )
+        page = PaginatedResponse(data=[record], total=None, limit=10, offset=0)
+
+        expected = JSONResponse(jsonable_encoder(page)).body
+        assert FastJSONResponse(page).body == expected
+        assert '"fluid_type":"газ"'.encode() in expected
+
+    def test_plain_content_matches_standard_serialization(self):
+        content = {
+            "amount": Decimal("1.25"),
+            "date": date(2020, 1, 1),
+            "generated_at": datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc),
+            "unit": UnitEnum.TONS,
+            "items": [1, 2.5, None, "конденсат"],
+        }
+
+        assert FastJSONResponse(content).body == JSONResponse(jsonable_encoder(content)).body
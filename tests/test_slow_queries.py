@@ -0,0 +1,76 @@
+"""
+Тесты журнала медленных запросов: нормализация SQL и описание параметров
+
+Используют SQLite (aiosqlite) во временном файле, PostgreSQL не требуется
+"""
+import sys
+import os
+from datetime import date
+
+import pytest
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import backend.core.timing  # noqa: F401 - обработчики событий SQLAlchemy
+from backend.core.slow_queries import explain_command, normalize_sql, parameter_shape, slow_query_log
+
+
+class TestSlowQueryLog:
+    """Тесты журнала медленных запросов"""
+
+    def test_normalize_sql_collapses_parameter_lists(self):
+        statement = (
+            "SELECT field_id, sum(amount)\n  FROM production WHERE fluid_type = $1::fluidtypeenum "
+            "AND field_id IN ($2::INTEGER, $3::INTEGER, $4::INTEGER) AND amount > 10 AND unit = 'т'"
+        )
+        assert normalize_sql(statement) == (
+            "SELECT field_id, sum(amount) FROM production WHERE fluid_type = ? "
+            "AND field_id IN (?, ...) AND amount > ? AND unit = ?"
+        )
+        assert normalize_sql("SELECT date_trunc('month', date)::date FROM t") == (
+            "SELECT date_trunc(?, date)::date FROM t"
+        )
+        assert normalize_sql("INSERT INTO t (a, b) VALUES ($1, $2), ($3, $4) RETURNING id") == (
+            "INSERT INTO t (a, b) VALUES (?, ?), ... RETURNING id"
+        )
+        assert normalize_sql("UPDATE t SET ts = $1::TIMESTAMP WITHOUT TIME ZONE WHERE id = $2::INTEGER") == (
+            "UPDATE t SET ts = ? WHERE id = ?"
+        )
+
+    def test_parameter_shape(self):
+        parameters = ("GAS", date(2020, 1, 1), date(2020, 12, 31), *range(250))
+        assert parameter_shape(parameters) == "str, date×2, int×250"
+        assert parameter_shape([(1, "a"), (2, "b")], executemany=True) == "2 rows × (int, str)"
+
+    def test_statements_with_side_effects_are_not_analyzed(self):
+        assert explain_command("SELECT id FROM production WHERE field_id = $1") == "EXPLAIN (ANALYZE, BUFFERS)"
+        # Значения последовательности не возвращаются откатом транзакции
+        assert explain_command(
+            "SELECT nextval(pg_get_serial_sequence('production', 'id')) FROM generate_series(1, $1::INTEGER)"
+        ) == "EXPLAIN"
+        assert explain_command("SELECT setval('production_id_seq', 10)") == "EXPLAIN"
+        assert explain_command("SELECT * FROM production WHERE id = $1 FOR UPDATE") == "EXPLAIN"
+        assert explain_command("SELECT * FROM wells FOR KEY SHARE") == "EXPLAIN"
+        assert explain_command("WITH removed AS (DELETE FROM production RETURNING *) SELECT 1") == "EXPLAIN"
+        assert explain_command("UPDATE production SET amount = $1") is None
+
+    @pytest.mark.asyncio
+    async def test_slow_statement_is_recorded(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(slow_query_log, "threshold_ms", 0.000001)
+        slow_query_log.reset()
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'slow.db'}")
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT :value"), {"value": 42})
+        finally:
+            await engine.dispose()
+            monkeypatch.undo()
+
+        entries = {entry["sql"]: entry for entry in slow_query_log.summary()}
+        assert entries["SELECT ?"]["count"] == 1
+        assert entries["SELECT ?"]["last_params"] == "int"
+        slow_query_log.reset()
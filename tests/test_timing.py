@@ -0,0 +1,61 @@
+"""
+Тесты учета времени запросов: заголовок Server-Timing и статистика маршрутов
+
+Используют SQLite (aiosqlite) во временном файле, PostgreSQL не требуется
+"""
+import sys
+import os
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.core.middleware import TimingMiddleware
+from backend.core.responses import FastJSONResponse
+from backend.core.timing import route_timings
+
+
+def make_client(tmp_path) -> TestClient:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'timing.db'}")
+
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(TimingMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            value = (await conn.execute(text("SELECT :value"), {"value": item_id})).scalar()
+        await engine.dispose()
+        return {"id": value}
+
+    return TestClient(app)
+
+
+class TestTimingMiddleware:
+    """Тесты TimingMiddleware"""
+
+    def test_server_timing_header(self, tmp_path):
+        response = make_client(tmp_path).get("/items/7")
+
+        assert response.json() == {"id": 7}
+        timing = response.headers["server-timing"]
+        assert timing.startswith("app;dur=")
+        assert 'db;dur=' in timing and '2 queries' in timing
+        assert "serialize;dur=" in timing
+
+    def test_route_aggregation(self, tmp_path):
+        route_timings.reset()
+        client = make_client(tmp_path)
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/missing")
+
+        summary = {item["route"]: item for item in route_timings.summary()}
+        assert summary["GET /items/{item_id}"]["count"] == 2
+        assert summary["GET /items/{item_id}"]["avg_statements"] == 2
+        assert summary["GET <unmatched>"]["count"] == 1